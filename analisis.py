@@ -0,0 +1,397 @@
+"""Análisis de las preguntas a partir de los eventos de juego (``eventos.py``).
+
+Uso::
+
+    python analisis.py eventos_juego*.jsonl
+    python analisis.py registros/*.jsonl --procesos 8 --json > informe.json
+    python analisis.py eventos_juego.jsonl --minimo 50 --todas
+
+Por cada pregunta (grupo e índice, como en ``banco.grupos_de_fuente``) informa:
+
+- la proporción de aciertos entre los intentos (respuestas y preguntas
+  perdidas por tiempo o por salir de la ventana);
+- qué parte de las respuestas incorrectas se lleva cada opción, para
+  encontrar el distractor que atrae la mayoría de los errores;
+- el tiempo medio de respuesta y qué fracción es del tiempo de la pregunta;
+- la discriminación: la correlación entre acertar la pregunta y acertar el
+  resto de la ronda (punto-biserial ítem-resto). Cerca de cero o negativa
+  indica que la pregunta no separa a quien sabe de quien no.
+
+y marca las demasiado fáciles, las demasiado difíciles, las que tienen un
+distractor dominante y las que discriminan poco, con su enunciado y opciones
+del banco para corregirlas.
+
+Los archivos se leen una sola vez, en trozos de ``TAMANO_TROZO`` bytes
+repartidos entre procesos. Cada proceso lee su trozo por bloques de líneas y
+suma por pregunta (con ``numpy.bincount`` si NumPy está instalado), así la
+memoria depende de la cantidad de preguntas y no del tamaño de los registros.
+Las rondas que cruzan el borde de un trozo se completan al juntar los
+resultados.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from banco import fuentes_del_banco, grupos_de_fuente, leer_json
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional.
+    np = None
+
+TAMANO_TROZO = 64 * 1024 * 1024
+TAMANO_LECTURA = 4 * 1024 * 1024
+MINIMO = 20
+MAXIMO_OPCIONES = 8
+FACIL = 0.9
+DIFICIL = 0.3
+DISTRACTOR = 0.5
+DISCRIMINACION_BAJA = 0.2
+TIPOS = {"respuesta", "pregunta_perdida", "partida_perdida"}
+
+# Columnas de la tabla por pregunta; después de ellas, cuántas veces se eligió
+# cada opción al responder mal. Las cinco últimas son las sumas de la
+# correlación entre acertar (x) y la proporción de aciertos en el resto de la ronda (r).
+COLUMNAS = ["intentos", "aciertos", "perdidas", "con_tiempo", "ms", "fraccion_tiempo", "n", "x", "r", "xr", "rr"]
+INTENTOS, ACIERTOS, PERDIDAS, CON_TIEMPO, MS, FRACCION, N, X, R, XR, RR = range(len(COLUMNAS))
+ANCHO = len(COLUMNAS) + MAXIMO_OPCIONES
+
+Clave = tuple[str, int]
+
+
+@dataclass
+class _Bloque:
+    """Sumas pendientes como tres columnas: fila, columna y valor."""
+
+    filas: list[int] = field(default_factory=list)
+    columnas: list[int] = field(default_factory=list)
+    valores: list[float] = field(default_factory=list)
+
+    def agregar(self, fila: int, columna: int, valor: float) -> None:
+        self.filas.append(fila)
+        self.columnas.append(columna)
+        self.valores.append(valor)
+
+
+class Tabla:
+    """Sumas por pregunta: una fila de ``ANCHO`` números por clave (grupo, índice)."""
+
+    def __init__(self) -> None:
+        self.claves: dict[Clave, int] = {}
+        self.valores = np.zeros((0, ANCHO)) if np is not None else []
+
+    def fila(self, clave: Clave) -> int:
+        numero = self.claves.get(clave)
+        if numero is None:
+            numero = self.claves[clave] = len(self.claves)
+        return numero
+
+    def _crecer(self) -> None:
+        faltan = len(self.claves) - len(self.valores)
+        if faltan <= 0:
+            return
+        if np is not None:
+            # Crece al doble para que agregar preguntas cueste O(1) amortizado.
+            extra = max(faltan, len(self.valores))
+            self.valores = np.concatenate([self.valores, np.zeros((extra, ANCHO))])
+        else:
+            self.valores.extend([0.0] * ANCHO for _ in range(faltan))
+
+    def sumar(self, bloque: _Bloque) -> None:
+        """Suma el bloque a la tabla y lo vacía."""
+        self._crecer()
+        if np is not None and bloque.filas:
+            posiciones = np.asarray(bloque.filas, dtype=np.int64) * ANCHO + np.asarray(bloque.columnas, dtype=np.int64)
+            sumas = np.bincount(posiciones, weights=np.asarray(bloque.valores), minlength=self.valores.size)
+            self.valores += sumas.reshape(self.valores.shape)
+        elif bloque.filas:
+            for fila, columna, valor in zip(bloque.filas, bloque.columnas, bloque.valores):
+                self.valores[fila][columna] += valor
+        bloque.filas.clear()
+        bloque.columnas.clear()
+        bloque.valores.clear()
+
+    def unir(self, otra: Tabla) -> None:
+        destinos = [self.fila(clave) for clave in otra.claves]
+        self._crecer()
+        if np is not None:
+            # Cada clave aparece una vez en ``otra``: los destinos no se repiten.
+            self.valores[destinos] += otra.valores[: len(destinos)]
+        else:
+            for destino, fila in zip(destinos, otra.valores):
+                self.valores[destino] = [propio + ajeno for propio, ajeno in zip(self.valores[destino], fila)]
+
+    def filas(self) -> Iterator[tuple[Clave, list[float]]]:
+        for clave, numero in self.claves.items():
+            fila = self.valores[numero]
+            yield clave, fila.tolist() if np is not None else fila
+
+
+@dataclass
+class Parcial:
+    """Resultado de un trozo: sus sumas y las rondas que no se vieron completas."""
+
+    tabla: Tabla
+    fragmentos: dict[tuple, list[tuple[Clave, int]]]
+    eventos: int
+
+
+def _sumar_ronda(tabla: Tabla, respuestas: list[tuple[Clave, int]], bloque: _Bloque) -> None:
+    """Agrega a la correlación ítem-resto las respuestas de una ronda terminada."""
+    if len(respuestas) < 2:
+        return
+    aciertos = sum(acierto for _, acierto in respuestas)
+    resto = len(respuestas) - 1
+    for clave, acierto in respuestas:
+        fila = tabla.fila(clave)
+        proporcion = (aciertos - acierto) / resto
+        bloque.agregar(fila, N, 1)
+        bloque.agregar(fila, X, acierto)
+        bloque.agregar(fila, R, proporcion)
+        bloque.agregar(fila, XR, acierto * proporcion)
+        bloque.agregar(fila, RR, proporcion * proporcion)
+
+
+def _lineas(ruta: str, inicio: int, fin: int) -> Iterator[list[bytes]]:
+    """Bloques de las líneas que empiezan en ``[inicio, fin)``."""
+    with open(ruta, "rb") as archivo:
+        if inicio:
+            # La línea que empieza antes de ``inicio`` es del trozo anterior.
+            archivo.seek(inicio - 1)
+            archivo.readline()
+        posicion = archivo.tell()
+        while posicion < fin:
+            lineas = archivo.readlines(TAMANO_LECTURA)
+            if not lineas:
+                return
+            propias = []
+            for linea in lineas:
+                if posicion >= fin:
+                    break
+                posicion += len(linea)
+                propias.append(linea)
+            yield propias
+
+
+def procesar_trozo(trozo: tuple[str, int, int]) -> Parcial:
+    tabla = Tabla()
+    bloque = _Bloque()
+    # Sesión -> [ronda, respuestas (clave, acierto), si la ronda empezó en este trozo].
+    abiertas: dict[str | None, list] = {}
+    # Sesiones cuya ronda anterior terminó en este trozo: la siguiente empieza aquí.
+    seguidas: set[str | None] = set()
+    fragmentos: dict[tuple, list[tuple[Clave, int]]] = {}
+    eventos = 0
+
+    def cerrar(sesion: str | None, terminada: bool) -> None:
+        ronda, respuestas, completa = abiertas.pop(sesion)
+        if completa and terminada:
+            _sumar_ronda(tabla, respuestas, bloque)
+        else:
+            fragmentos.setdefault((sesion, ronda), []).extend(respuestas)
+        if terminada:
+            seguidas.add(sesion)
+
+    for lineas in _lineas(*trozo):
+        for linea in lineas:
+            try:
+                evento = json.loads(linea)
+            except ValueError:
+                # Línea cortada por un cierre inesperado.
+                continue
+            tipo = evento.get("tipo")
+            if tipo not in TIPOS:
+                continue
+            eventos += 1
+            sesion = evento.get("sesion")
+            actual = abiertas.get(sesion)
+            if actual is not None and actual[0] != evento.get("ronda"):
+                cerrar(sesion, terminada=True)
+                actual = None
+            if actual is None:
+                actual = abiertas[sesion] = [evento.get("ronda"), [], sesion in seguidas]
+            if tipo == "partida_perdida":
+                cerrar(sesion, terminada=True)
+                continue
+            clave = (evento.get("grupo"), evento.get("indice", -1))
+            if clave[0] is None or clave[1] < 0:
+                continue
+            fila = tabla.fila(clave)
+            acierto = 1 if tipo == "respuesta" and evento.get("correcta") else 0
+            bloque.agregar(fila, INTENTOS, 1)
+            if acierto:
+                bloque.agregar(fila, ACIERTOS, 1)
+            elif tipo == "pregunta_perdida":
+                bloque.agregar(fila, PERDIDAS, 1)
+            elif 0 <= evento.get("opcion", -1) < MAXIMO_OPCIONES:
+                bloque.agregar(fila, len(COLUMNAS) + evento["opcion"], 1)
+            limite = evento.get("limite") or 0
+            if tipo == "respuesta" and limite > 0 and "ms" in evento:
+                bloque.agregar(fila, CON_TIEMPO, 1)
+                bloque.agregar(fila, MS, evento["ms"])
+                bloque.agregar(fila, FRACCION, evento["ms"] / (limite * 1000))
+            actual[1].append((clave, acierto))
+        tabla.sumar(bloque)
+    for sesion in list(abiertas):
+        cerrar(sesion, terminada=False)
+    tabla.sumar(bloque)
+    return Parcial(tabla, fragmentos, eventos)
+
+
+def trozos(rutas: Iterable[Path], tamano: int = TAMANO_TROZO) -> list[tuple[str, int, int]]:
+    """Divide los archivos en rangos de bytes de a lo sumo ``tamano``."""
+    resultado = []
+    for ruta in rutas:
+        total = ruta.stat().st_size
+        resultado.extend((str(ruta), inicio, min(inicio + tamano, total)) for inicio in range(0, total, tamano))
+    return resultado
+
+
+def analizar(rutas: Iterable[Path], procesos: int = 1, tamano: int = TAMANO_TROZO) -> tuple[Tabla, int]:
+    """Lee todos los eventos y devuelve las sumas por pregunta y la cantidad de eventos usados."""
+    partes = trozos(rutas, tamano)
+    tabla = Tabla()
+    fragmentos: dict[tuple, list[tuple[Clave, int]]] = {}
+    eventos = 0
+
+    def juntar(parciales: Iterable[Parcial]) -> None:
+        nonlocal eventos
+        for parcial in parciales:
+            tabla.unir(parcial.tabla)
+            for ronda, respuestas in parcial.fragmentos.items():
+                fragmentos.setdefault(ronda, []).extend(respuestas)
+            eventos += parcial.eventos
+
+    if procesos > 1 and len(partes) > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            juntar(ejecutor.map(procesar_trozo, partes))
+    else:
+        juntar(map(procesar_trozo, partes))
+    bloque = _Bloque()
+    for respuestas in fragmentos.values():
+        _sumar_ronda(tabla, respuestas, bloque)
+    tabla.sumar(bloque)
+    return tabla, eventos
+
+
+def _discriminacion(fila: list[float]) -> float | None:
+    n = fila[N]
+    if n < 2:
+        return None
+    media_x, media_r = fila[X] / n, fila[R] / n
+    varianza = (media_x - media_x * media_x) * (fila[RR] / n - media_r * media_r)
+    if varianza <= 0:
+        return None
+    return (fila[XR] / n - media_x * media_r) / math.sqrt(varianza)
+
+
+def estadisticas(clave: Clave, fila: list[float]) -> dict:
+    intentos = int(fila[INTENTOS])
+    aciertos = int(fila[ACIERTOS])
+    perdidas = int(fila[PERDIDAS])
+    errores = intentos - aciertos - perdidas
+    elecciones = fila[len(COLUMNAS) :]
+    distractores = {opcion: round(cantidad / errores, 3) for opcion, cantidad in enumerate(elecciones) if cantidad and errores}
+    discriminacion = _discriminacion(fila)
+    return {
+        "grupo": clave[0],
+        "indice": clave[1],
+        "intentos": intentos,
+        "aciertos": aciertos,
+        "perdidas": perdidas,
+        "precision": round(aciertos / intentos, 3) if intentos else 0.0,
+        "distractores": distractores,
+        "ms_medio": round(fila[MS] / fila[CON_TIEMPO]) if fila[CON_TIEMPO] else None,
+        "fraccion_tiempo": round(fila[FRACCION] / fila[CON_TIEMPO], 3) if fila[CON_TIEMPO] else None,
+        "discriminacion": round(discriminacion, 3) if discriminacion is not None else None,
+    }
+
+
+def marcas(pregunta: dict) -> list[str]:
+    resultado = []
+    if pregunta["precision"] >= FACIL:
+        resultado.append("fácil")
+    elif pregunta["precision"] <= DIFICIL:
+        resultado.append("difícil")
+    if pregunta["distractores"] and max(pregunta["distractores"].values()) >= DISTRACTOR:
+        resultado.append("distractor dominante")
+    if pregunta["discriminacion"] is not None and pregunta["discriminacion"] < DISCRIMINACION_BAJA:
+        resultado.append("discrimina poco")
+    return resultado
+
+
+def textos_del_banco(claves: set[Clave]) -> dict[Clave, dict]:
+    """Enunciado, opciones y respuesta de las preguntas pedidas, leídos de ``datos/``."""
+    grupos = {grupo for grupo, _ in claves}
+    textos = {}
+    for ruta, nombre in fuentes_del_banco():
+        for grupo, preguntas in grupos_de_fuente(nombre, leer_json(ruta)):
+            if grupo not in grupos:
+                continue
+            for indice, pregunta in enumerate(preguntas):
+                if (grupo, indice) in claves:
+                    textos[(grupo, indice)] = {
+                        "enunciado": pregunta["enunciado"],
+                        "opciones": pregunta["opciones"],
+                        "respuesta": pregunta["respuesta"],
+                    }
+    return textos
+
+
+def informe(tabla: Tabla, minimo: int = MINIMO) -> list[dict]:
+    """Preguntas con al menos ``minimo`` intentos, las más marcadas primero."""
+    preguntas = [estadisticas(clave, fila) for clave, fila in tabla.filas() if fila[INTENTOS] >= minimo]
+    textos = textos_del_banco({(pregunta["grupo"], pregunta["indice"]) for pregunta in preguntas})
+    for pregunta in preguntas:
+        pregunta["marcas"] = marcas(pregunta)
+        pregunta.update(textos.get((pregunta["grupo"], pregunta["indice"]), {}))
+    preguntas.sort(key=lambda pregunta: (-len(pregunta["marcas"]), -pregunta["intentos"]))
+    return preguntas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estadísticas por pregunta a partir de los eventos de juego.")
+    parser.add_argument("archivos", nargs="+", type=Path, help="archivos de eventos (eventos_juego*.jsonl)")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--trozo", type=int, default=TAMANO_TROZO // (1024 * 1024), help="megabytes por trozo")
+    parser.add_argument("--minimo", type=int, default=MINIMO, help="intentos mínimos para informar una pregunta")
+    parser.add_argument("--todas", action="store_true", help="muestra también las preguntas sin marcas")
+    parser.add_argument("--json", action="store_true", help="escribe el informe en JSON")
+    argumentos = parser.parse_args()
+
+    tabla, eventos = analizar(argumentos.archivos, argumentos.procesos, argumentos.trozo * 1024 * 1024)
+    preguntas = informe(tabla, argumentos.minimo)
+    if argumentos.json:
+        print(json.dumps({"eventos": eventos, "minimo": argumentos.minimo, "preguntas": preguntas}, indent=2, ensure_ascii=False))
+        return
+    marcadas = sum(1 for pregunta in preguntas if pregunta["marcas"])
+    print(f"{eventos} eventos, {len(preguntas)} preguntas con al menos {argumentos.minimo} intentos, {marcadas} marcadas.")
+    for pregunta in preguntas:
+        if not pregunta["marcas"] and not argumentos.todas:
+            continue
+        print(f"\n[{pregunta['grupo']} #{pregunta['indice'] + 1}] {pregunta.get('enunciado', '(no está en el banco)')}")
+        detalle = f"  {pregunta['intentos']} intentos, {pregunta['precision']:.0%} aciertos"
+        if pregunta["ms_medio"] is not None:
+            detalle += f", {pregunta['ms_medio'] / 1000:.1f} s ({pregunta['fraccion_tiempo']:.0%} del tiempo)"
+        if pregunta["discriminacion"] is not None:
+            detalle += f", discriminación {pregunta['discriminacion']:.2f}"
+        print(detalle)
+        if pregunta["distractores"]:
+            opcion, parte = max(pregunta["distractores"].items(), key=lambda par: par[1])
+            opciones = pregunta.get("opciones", [])
+            texto = opciones[opcion] if opcion < len(opciones) else f"opción {opcion + 1}"
+            print(f"  distractor más elegido: \"{texto}\" ({parte:.0%} de los errores)")
+        if pregunta["marcas"]:
+            print(f"  → {', '.join(pregunta['marcas'])}")
+
+
+if __name__ == "__main__":
+    main()
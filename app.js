@@ -1,67 +1,165 @@
 const SAVE_KEY = "historia-save";
 
-const state = {
-  periods: [
-    {
-      name: "Antigüedad",
-      description: "Civilizaciones iniciales y aportes culturales.",
-      level: {
-        name: "Civilizaciones Iniciales",
-        questions: [
-          {
-            prompt: "¿Cuál de estas civilizaciones se desarrolló junto al río Nilo?",
-            options: ["Mesopotamia", "Egipto", "China", "Grecia"],
-            answer: "Egipto",
-            feedback: "Egipto se consolidó gracias a las crecidas del Nilo.",
-          },
-          {
-            prompt: "¿Qué invento permitió registrar leyes y comercio?",
-            options: ["La escritura", "La brújula", "La pólvora", "La rueda"],
-            answer: "La escritura",
-            feedback: "La escritura impulsó la organización social.",
-          },
-          {
-            prompt: "¿En qué región surgió la civilización mesopotámica?",
-            options: [
-              "Entre los ríos Tigris y Éufrates",
-              "En los Andes",
-              "En el Sahara",
-              "En la península Ibérica",
-            ],
-            answer: "Entre los ríos Tigris y Éufrates",
-            feedback: "Mesopotamia significa literalmente ""entre ríos"".",
-          },
-        ],
-      },
+// <banco-generado> exportar.py escribe este bloque desde datos/periodos; no editar a mano.
+const PERIODOS = [
+  {
+    name: "Antigüedad",
+    description: "Civilizaciones iniciales y aportes culturales.",
+    level: {
+      name: "Civilizaciones Iniciales",
+      questions: [
+        {
+          prompt: "¿Cuál de estas civilizaciones se desarrolló junto al río Nilo?",
+          options: ["Mesopotamia", "Egipto", "China", "Grecia"],
+          answer: "Egipto",
+          feedback: "Egipto se consolidó gracias a las crecidas del río Nilo.",
+        },
+        {
+          prompt: "¿Qué invento es clave en el surgimiento de las ciudades antiguas?",
+          options: ["La pólvora", "La escritura", "El motor a vapor", "Internet"],
+          answer: "La escritura",
+          feedback: "La escritura permitió registrar leyes y transacciones.",
+        },
+        {
+          prompt: "¿En qué región surgió la civilización mesopotámica?",
+          options: [
+            "Entre los ríos Tigris y Éufrates",
+            "En los Andes",
+            "En la península Ibérica",
+            "En el Sahara",
+          ],
+          answer: "Entre los ríos Tigris y Éufrates",
+          feedback: "Mesopotamia significa entre ríos.",
+        },
+        {
+          prompt: "¿Qué cultura aportó el concepto de democracia directa?",
+          options: ["Roma", "Grecia", "Fenicia", "Persia"],
+          answer: "Grecia",
+          feedback: "Atenas es recordada por su democracia directa.",
+        },
+        {
+          prompt: "¿Qué pueblo destacó por el comercio marítimo en el Mediterráneo?",
+          options: ["Fenicios", "Mayas", "Aztecas", "Incas"],
+          answer: "Fenicios",
+          feedback: "Los fenicios fueron grandes navegantes y comerciantes.",
+        },
+        {
+          prompt: "¿Qué imperio construyó la Vía Apia y otras calzadas famosas?",
+          options: ["Imperio Romano", "Imperio Persa", "Imperio Chino", "Imperio Otomano"],
+          answer: "Imperio Romano",
+          feedback: "Roma expandió su red de calzadas para unir el imperio.",
+        },
+        {
+          prompt: "¿Cuál fue un aporte científico de los griegos antiguos?",
+          options: ["Geometría", "Imprenta", "Electricidad", "Motor de combustión"],
+          answer: "Geometría",
+          feedback: "Euclides y otros griegos sistematizaron la geometría.",
+        },
+        {
+          prompt: "¿Qué estructura monumental se construyó en Egipto como tumbas reales?",
+          options: ["Pirámides", "Zigurats", "Anfiteatros", "Catedrales"],
+          answer: "Pirámides",
+          feedback: "Las pirámides eran tumbas para los faraones.",
+        },
+        {
+          prompt: "¿Qué código legal es uno de los más antiguos de la historia?",
+          options: ["Código de Hammurabi", "Código Napoleónico", "Leyes de Indias", "Fuero Juzgo"],
+          answer: "Código de Hammurabi",
+          feedback: "El código de Hammurabi pertenece a Babilonia.",
+        },
+        {
+          prompt: "¿Qué invento chino revolucionó la navegación en la antigüedad?",
+          options: ["Brújula", "Telescopio", "Imprenta", "Motor a vapor"],
+          answer: "Brújula",
+          feedback: "La brújula permitió viajes marítimos más precisos.",
+        },
+      ],
     },
-    {
-      name: "Independencia y Venezuela",
-      description: "Campañas libertadoras y liderazgos clave.",
-      level: {
-        name: "Campañas Libertadoras",
-        questions: [
-          {
-            prompt: "¿Quién lideró la Campaña Admirable en 1813?",
-            options: ["Simón Bolívar", "Francisco Miranda", "José de San Martín", "Antonio José de Sucre"],
-            answer: "Simón Bolívar",
-            feedback: "La Campaña Admirable consolidó el liderazgo de Bolívar.",
-          },
-          {
-            prompt: "¿Qué batalla aseguró la independencia de Venezuela en 1821?",
-            options: ["Carabobo", "Boyacá", "Junín", "Pichincha"],
-            answer: "Carabobo",
-            feedback: "Carabobo fue decisiva para la independencia venezolana.",
-          },
-          {
-            prompt: "¿Qué figura es conocida como la Libertadora del Libertador?",
-            options: ["Manuela Sáenz", "Luisa Cáceres", "Juana Ramírez", "Josefa Camejo"],
-            answer: "Manuela Sáenz",
-            feedback: "Manuela Sáenz apoyó a Bolívar en momentos clave.",
-          },
-        ],
-      },
+  },
+  {
+    name: "Independencia y Venezuela",
+    description: "Campañas libertadoras y liderazgos clave.",
+    level: {
+      name: "Campañas Libertadoras",
+      questions: [
+        {
+          prompt: "¿Quién lideró la Campaña Admirable en 1813?",
+          options: ["Simón Bolívar", "José de San Martín", "Francisco Miranda", "Antonio José de Sucre"],
+          answer: "Simón Bolívar",
+          feedback: "La Campaña Admirable consolidó el liderazgo de Bolívar.",
+        },
+        {
+          prompt: "¿Qué batalla aseguró la independencia de Venezuela en 1821?",
+          options: ["Carabobo", "Boyacá", "Junín", "Pichincha"],
+          answer: "Carabobo",
+          feedback: "Carabobo fue decisiva para la independencia venezolana.",
+        },
+        {
+          prompt: "¿Cuál era el objetivo principal del Congreso de Angostura?",
+          options: [
+            "Crear un gobierno central para la Gran Colombia",
+            "Restaurar la monarquía española",
+            "Dividir el territorio en virreinatos",
+            "Declarar la guerra a Portugal",
+          ],
+          answer: "Crear un gobierno central para la Gran Colombia",
+          feedback: "El Congreso de Angostura sentó bases institucionales.",
+        },
+        {
+          prompt: "¿Qué figura es conocida como la Libertadora del Libertador?",
+          options: ["Manuela Sáenz", "Luisa Cáceres", "Juana Ramírez", "Josefa Camejo"],
+          answer: "Manuela Sáenz",
+          feedback: "Manuela Sáenz apoyó a Bolívar en momentos clave.",
+        },
+        {
+          prompt: "¿En qué ciudad se firmó el Acta de Independencia de Venezuela en 1811?",
+          options: ["Caracas", "Valencia", "Maracaibo", "Cumaná"],
+          answer: "Caracas",
+          feedback: "El Acta se firmó en Caracas el 5 de julio de 1811.",
+        },
+        {
+          prompt: "¿Qué batalla aseguró la independencia de Ecuador en 1822?",
+          options: ["Pichincha", "Junín", "Ayacucho", "Boyacá"],
+          answer: "Pichincha",
+          feedback: "La victoria de Pichincha fue clave para Ecuador.",
+        },
+        {
+          prompt: "¿Qué documento proclamó los derechos del hombre y del ciudadano en 1789?",
+          options: [
+            "Declaración de los Derechos del Hombre y del Ciudadano",
+            "Carta Magna",
+            "Constitución de Cádiz",
+            "Edicto de Nantes",
+          ],
+          answer: "Declaración de los Derechos del Hombre y del Ciudadano",
+          feedback: "Fue un texto fundamental de la Revolución Francesa.",
+        },
+        {
+          prompt: "¿Quién encabezó el proceso de independencia de Haití?",
+          options: ["Toussaint Louverture", "Simón Bolívar", "Napoleón Bonaparte", "Bernardo O'Higgins"],
+          answer: "Toussaint Louverture",
+          feedback: "Louverture fue líder de la revolución haitiana.",
+        },
+        {
+          prompt: "¿Qué país lideró la Revolución Industrial?",
+          options: ["Inglaterra", "España", "Portugal", "Rusia"],
+          answer: "Inglaterra",
+          feedback: "La Revolución Industrial inició en Inglaterra.",
+        },
+        {
+          prompt: "¿Qué organización internacional surgió tras la Segunda Guerra Mundial?",
+          options: ["ONU", "OTAN", "Unión Europea", "Liga Hanseática"],
+          answer: "ONU",
+          feedback: "La ONU se fundó en 1945 para promover la paz.",
+        },
+      ],
     },
-  ],
+  },
+];
+// </banco-generado>
+
+const state = {
+  periods: PERIODOS,
   currentPeriodIndex: 0,
   currentQuestionIndex: 0,
   lives: 3,
@@ -2,714 +2,92 @@
 
 Esta versión ofrece una interfaz moderna con Tkinter, gestor de partidas,
 confeti al acertar y categorías completas.
+
+``python app_gui.py --perfil perfil.jsonl`` mide los puntos críticos de la
+interfaz (``PUNTOS_CRITICOS``) y ``--cprofile sesion.pstats`` guarda el perfil
+completo de la sesión; ver ``perfil.py``.
+
+Las respuestas, preguntas perdidas, comodines y partidas perdidas se anotan
+en ``eventos_juego.jsonl`` (``--eventos`` o ``JUEGO_EVENTOS`` para otro
+archivo, ``--sin-eventos`` para no anotarlos); ver ``eventos.py``.
 """
 
 from __future__ import annotations
 
-import json
-import random
+import argparse
+import os
+import threading
+import time
 import tkinter as tk
-from dataclasses import dataclass
-from datetime import datetime
+from collections import deque
+from collections.abc import Sequence
 from pathlib import Path
 from tkinter import messagebox, ttk
 
+from banco import MANIFIESTO_CATEGORIAS, Categoria, leer_manifiesto_categorias
+from busqueda import IndiceBusqueda
+from confeti import MotorConfeti
+from eventos import VARIABLE_EVENTOS, RegistroEventos, crear_registro_eventos
+from guardados import EscrituraDiferida, crear_almacen, crear_registro
+from motor import DIFICULTADES, MotorJuego
+from perfil import VARIABLE_CPROFILE, VARIABLE_PERFIL, Perfil
+from planificador import Planificador
+
 ARCHIVO_GUARDADO = Path("partidas_guardadas.json")
+ARCHIVO_EVENTOS = Path("eventos_juego.jsonl")
+GUARDADOS_POR_PAGINA = 10
+PREGUNTAS_POR_TEMA = 20
+# Un cuadro a 60 Hz: pasar a la pregunta siguiente no debería tardar más.
+PRESUPUESTO_RESPUESTA_MS = 16.0
+# Métodos de ``AplicacionJuego`` que mide ``--perfil``.
+PUNTOS_CRITICOS = ["_actualizar_panel", "responder", "_guardar_con_nombre", "_renderizar_guardados", "_animar_confeti"]
+# Métodos de la copia en memoria de las partidas que mide ``--perfil``.
+PUNTOS_CRITICOS_GUARDADOS = ["obtener", "listar", "guardar"]
 
 
-@dataclass
-class Pregunta:
-    enunciado: str
-    opciones: list[str]
-    respuesta: str
-    retroalimentacion: str
+def cargar_categorias() -> list[Categoria]:
+    """Lee el manifiesto del banco; cada categoría carga sus preguntas al usarse."""
+    return leer_manifiesto_categorias(MANIFIESTO_CATEGORIAS)
 
 
-@dataclass
-class Categoria:
-    nombre: str
-    descripcion: str
-    preguntas: list[Pregunta]
+_almacen: EscrituraDiferida | None = None
 
 
-def cargar_categorias() -> list[Categoria]:
-    return [
-        Categoria(
-            nombre="Antigüedad",
-            descripcion="Civilizaciones iniciales, ciencia y cultura.",
-            preguntas=[
-                Pregunta(
-                    "¿Cuál de estas civilizaciones se desarrolló junto al río Nilo?",
-                    ["Mesopotamia", "Egipto", "China", "Grecia"],
-                    "Egipto",
-                    "Egipto creció gracias a las crecidas del Nilo.",
-                ),
-                Pregunta(
-                    "¿Qué invento permitió registrar leyes y comercio?",
-                    ["La escritura", "La brújula", "La pólvora", "La rueda"],
-                    "La escritura",
-                    "La escritura organizó la vida urbana.",
-                ),
-                Pregunta(
-                    "¿En qué región surgió Mesopotamia?",
-                    [
-                        "Entre los ríos Tigris y Éufrates",
-                        "En los Andes",
-                        "En el Sahara",
-                        "En la península Ibérica",
-                    ],
-                    "Entre los ríos Tigris y Éufrates",
-                    "Mesopotamia significa 'entre ríos'.",
-                ),
-                Pregunta(
-                    "¿Qué pueblo destacó por su comercio marítimo?",
-                    ["Fenicios", "Mayas", "Aztecas", "Incas"],
-                    "Fenicios",
-                    "Los fenicios dominaron rutas comerciales.",
-                ),
-                Pregunta(
-                    "¿Qué sistema político se consolidó en Atenas?",
-                    ["Democracia", "Feudalismo", "Teocracia", "Monarquía absoluta"],
-                    "Democracia",
-                    "Atenas impulsó la democracia directa.",
-                ),
-                Pregunta(
-                    "¿Qué imperio construyó la Vía Apia?",
-                    ["Imperio Romano", "Imperio Persa", "Imperio Chino", "Imperio Otomano"],
-                    "Imperio Romano",
-                    "Roma expandió su red de calzadas.",
-                ),
-                Pregunta(
-                    "¿Cuál fue un aporte científico de los griegos?",
-                    ["Geometría", "Imprenta", "Electricidad", "Motor de combustión"],
-                    "Geometría",
-                    "Euclides destacó en geometría.",
-                ),
-                Pregunta(
-                    "¿Qué río fue clave para la civilización del Indo?",
-                    ["Indo", "Amazonas", "Danubio", "Nilo"],
-                    "Indo",
-                    "El Indo dio origen a esa civilización.",
-                ),
-                Pregunta(
-                    "¿Qué imperio inició la Gran Muralla?",
-                    ["China", "Roma", "Persia", "Egipto"],
-                    "China",
-                    "La Gran Muralla fue obra china.",
-                ),
-                Pregunta(
-                    "¿Cuál fue la capital del Imperio Bizantino?",
-                    ["Constantinopla", "Roma", "Atenas", "Alejandría"],
-                    "Constantinopla",
-                    "Constantinopla fue su centro político.",
-                ),
-                Pregunta(
-                    "¿Qué estructura monumental eran tumbas reales en Egipto?",
-                    ["Pirámides", "Zigurats", "Anfiteatros", "Catedrales"],
-                    "Pirámides",
-                    "Las pirámides guardaban a los faraones.",
-                ),
-                Pregunta(
-                    "¿Qué código legal es uno de los más antiguos?",
-                    ["Código de Hammurabi", "Código Napoleónico", "Leyes de Indias", "Fuero Juzgo"],
-                    "Código de Hammurabi",
-                    "Hammurabi dejó un código famoso.",
-                ),
-                Pregunta(
-                    "¿Qué invento chino revolucionó la navegación?",
-                    ["Brújula", "Telescopio", "Imprenta", "Motor a vapor"],
-                    "Brújula",
-                    "La brújula facilitó los viajes marítimos.",
-                ),
-                Pregunta(
-                    "¿Qué civilización construyó Machu Picchu?",
-                    ["Inca", "Maya", "Azteca", "Olmeca"],
-                    "Inca",
-                    "Machu Picchu es un legado inca.",
-                ),
-                Pregunta(
-                    "¿Qué río permitió el desarrollo de la India antigua?",
-                    ["Ganges", "Nilo", "Tigris", "Éufrates"],
-                    "Ganges",
-                    "El Ganges es sagrado y vital en India.",
-                ),
-                Pregunta(
-                    "¿Qué ciudad fue enterrada por el Vesubio?",
-                    ["Pompeya", "Roma", "Cartago", "Atenas"],
-                    "Pompeya",
-                    "Pompeya quedó sepultada en el año 79.",
-                ),
-                Pregunta(
-                    "¿Cuál era el lenguaje de la antigua Roma?",
-                    ["Latín", "Griego", "Hebreo", "Árabe"],
-                    "Latín",
-                    "El latín fue la lengua del Imperio Romano.",
-                ),
-                Pregunta(
-                    "¿Qué dios era principal en la mitología egipcia?",
-                    ["Ra", "Zeus", "Odín", "Anubis"],
-                    "Ra",
-                    "Ra era el dios del sol.",
-                ),
-                Pregunta(
-                    "¿Qué civilización levantó Stonehenge?",
-                    ["Britanos antiguos", "Mayas", "Persas", "Chinos"],
-                    "Britanos antiguos",
-                    "Stonehenge es una construcción megalítica.",
-                ),
-                Pregunta(
-                    "¿Cuál fue uno de los primeros alfabetos?",
-                    ["Fenicio", "Latino", "Cirílico", "Hebreo"],
-                    "Fenicio",
-                    "El alfabeto fenicio inspiró otros alfabetos.",
-                ),
-            ],
-        ),
-        Categoria(
-            nombre="Edad Media",
-            descripcion="Feudos, religiones y expansión cultural.",
-            preguntas=[
-                Pregunta(
-                    "¿Qué sistema social dominó Europa medieval?",
-                    ["Feudalismo", "Capitalismo", "Socialismo", "Democracia"],
-                    "Feudalismo",
-                    "El feudalismo estructuró la sociedad medieval.",
-                ),
-                Pregunta(
-                    "¿Qué ruta comercial conectaba Europa con Asia?",
-                    ["Ruta de la Seda", "Ruta del Ámbar", "Ruta del Inca", "Ruta del Oro"],
-                    "Ruta de la Seda",
-                    "La Ruta de la Seda unía Oriente y Occidente.",
-                ),
-                Pregunta(
-                    "¿Qué ciudad fue capital del Imperio Carolingio?",
-                    ["Aquisgrán", "París", "Roma", "Londres"],
-                    "Aquisgrán",
-                    "Carlomagno gobernó desde Aquisgrán.",
-                ),
-                Pregunta(
-                    "¿Qué institución religiosa tuvo gran poder en la Edad Media?",
-                    ["Iglesia", "Senado", "Parlamento", "Gremios"],
-                    "Iglesia",
-                    "La Iglesia fue central en la vida medieval.",
-                ),
-                Pregunta(
-                    "¿Cómo se llamaban las comunidades de artesanos?",
-                    ["Gremios", "Tribus", "Senados", "Ligas"],
-                    "Gremios",
-                    "Los gremios organizaban oficios urbanos.",
-                ),
-                Pregunta(
-                    "¿Qué conflicto enfrentó a cristianos y musulmanes en Tierra Santa?",
-                    ["Cruzadas", "Reconquista", "Guerra de los Cien Años", "Guerra Fría"],
-                    "Cruzadas",
-                    "Las cruzadas buscaron controlar Jerusalén.",
-                ),
-                Pregunta(
-                    "¿Qué imperio se expandió desde Constantinopla?",
-                    ["Bizantino", "Mongol", "Inca", "Azteca"],
-                    "Bizantino",
-                    "El Imperio Bizantino continuó a Roma.",
-                ),
-                Pregunta(
-                    "¿Qué civilización construyó la Alhambra?",
-                    ["Musulmanes", "Visigodos", "Francos", "Vikingos"],
-                    "Musulmanes",
-                    "La Alhambra es una joya andalusí.",
-                ),
-                Pregunta(
-                    "¿Qué pandemia asoló Europa en el siglo XIV?",
-                    ["Peste Negra", "Gripe Española", "Viruela", "Cólera"],
-                    "Peste Negra",
-                    "La Peste Negra redujo la población europea.",
-                ),
-                Pregunta(
-                    "¿Quién fue un líder vikingo famoso?",
-                    ["Erik el Rojo", "Julio César", "Napoleón", "Alejandro"],
-                    "Erik el Rojo",
-                    "Erik el Rojo exploró Groenlandia.",
-                ),
-                Pregunta(
-                    "¿Qué ciudad italiana fue un centro comercial medieval?",
-                    ["Venecia", "Madrid", "Berlín", "Lisboa"],
-                    "Venecia",
-                    "Venecia dominó rutas marítimas.",
-                ),
-                Pregunta(
-                    "¿Qué imperio se originó en la península arábiga?",
-                    ["Islámico", "Inca", "Romano", "Chino"],
-                    "Islámico",
-                    "El Islam se expandió rápidamente.",
-                ),
-                Pregunta(
-                    "¿Qué rey inglés firmó la Carta Magna?",
-                    ["Juan Sin Tierra", "Enrique VIII", "Ricardo III", "Eduardo I"],
-                    "Juan Sin Tierra",
-                    "La Carta Magna limitó al rey.",
-                ),
-                Pregunta(
-                    "¿Qué estilo arquitectónico se usó en catedrales medievales?",
-                    ["Gótico", "Barroco", "Neoclásico", "Moderno"],
-                    "Gótico",
-                    "El gótico destaca por sus vitrales.",
-                ),
-                Pregunta(
-                    "¿Qué territorio recuperaron los reinos cristianos en España?",
-                    ["Al-Ándalus", "Borgoña", "Sicilia", "Baviera"],
-                    "Al-Ándalus",
-                    "La Reconquista buscó recuperar Al-Ándalus.",
-                ),
-                Pregunta(
-                    "¿Qué documento definió leyes en el reino visigodo?",
-                    ["Fuero Juzgo", "Código Napoleónico", "Doce Tablas", "Código Hammurabi"],
-                    "Fuero Juzgo",
-                    "El Fuero Juzgo fue un código visigodo.",
-                ),
-                Pregunta(
-                    "¿Qué orden militar protegía peregrinos?",
-                    ["Templarios", "Espartanos", "Samuráis", "Legionarios"],
-                    "Templarios",
-                    "Los templarios fueron una orden militar.",
-                ),
-                Pregunta(
-                    "¿Qué ciudad fue arrasada por los mongoles en 1258?",
-                    ["Bagdad", "Roma", "París", "El Cairo"],
-                    "Bagdad",
-                    "Bagdad cayó ante los mongoles.",
-                ),
-                Pregunta(
-                    "¿Qué país vivió la Guerra de los Cien Años?",
-                    ["Francia e Inglaterra", "España y Portugal", "Rusia y Suecia", "Alemania y Italia"],
-                    "Francia e Inglaterra",
-                    "La guerra duró más de un siglo.",
-                ),
-                Pregunta(
-                    "¿Qué universidad medieval es una de las más antiguas?",
-                    ["Bolonia", "Harvard", "Oxford", "Salamanca"],
-                    "Bolonia",
-                    "Bolonia se fundó en el siglo XI.",
-                ),
-            ],
-        ),
-        Categoria(
-            nombre="Renacimiento",
-            descripcion="Arte, ciencia y exploraciones globales.",
-            preguntas=[
-                Pregunta(
-                    "¿Qué artista pintó la Mona Lisa?",
-                    ["Leonardo da Vinci", "Miguel Ángel", "Rafael", "Donatello"],
-                    "Leonardo da Vinci",
-                    "Da Vinci creó la Mona Lisa.",
-                ),
-                Pregunta(
-                    "¿Qué invento permitió difundir libros masivamente?",
-                    ["Imprenta", "Telescopio", "Brújula", "Motor"],
-                    "Imprenta",
-                    "Gutenberg impulsó la imprenta.",
-                ),
-                Pregunta(
-                    "¿Qué ciudad italiana fue cuna del Renacimiento?",
-                    ["Florencia", "Roma", "Venecia", "Milán"],
-                    "Florencia",
-                    "Florencia fue epicentro cultural.",
-                ),
-                Pregunta(
-                    "¿Quién esculpió el David?",
-                    ["Miguel Ángel", "Leonardo", "Botticelli", "Bernini"],
-                    "Miguel Ángel",
-                    "El David es una obra de Miguel Ángel.",
-                ),
-                Pregunta(
-                    "¿Qué monarquía financió el viaje de Colón?",
-                    ["España", "Portugal", "Francia", "Inglaterra"],
-                    "España",
-                    "Los Reyes Católicos apoyaron a Colón.",
-                ),
-                Pregunta(
-                    "¿Qué océano cruzó Colón en 1492?",
-                    ["Atlántico", "Índico", "Pacífico", "Ártico"],
-                    "Atlántico",
-                    "Colón cruzó el Atlántico.",
-                ),
-                Pregunta(
-                    "¿Qué científico defendió el heliocentrismo?",
-                    ["Copérnico", "Ptolomeo", "Galeno", "Aristóteles"],
-                    "Copérnico",
-                    "Copérnico propuso el Sol al centro.",
-                ),
-                Pregunta(
-                    "¿Qué navegante dio la primera vuelta al mundo?",
-                    ["Magallanes-Elcano", "Marco Polo", "Vespucci", "Da Gama"],
-                    "Magallanes-Elcano",
-                    "La expedición completó la circunnavegación.",
-                ),
-                Pregunta(
-                    "¿Qué obra escribió Maquiavelo?",
-                    ["El Príncipe", "Utopía", "La República", "Hamlet"],
-                    "El Príncipe",
-                    "Maquiavelo analizó el poder político.",
-                ),
-                Pregunta(
-                    "¿Qué explorador llegó a la India rodeando África?",
-                    ["Vasco da Gama", "Colón", "Caboto", "Pizarro"],
-                    "Vasco da Gama",
-                    "Da Gama abrió la ruta a Asia.",
-                ),
-                Pregunta(
-                    "¿Qué civilización conquistó Hernán Cortés?",
-                    ["Azteca", "Inca", "Maya", "Olmeca"],
-                    "Azteca",
-                    "Cortés conquistó Tenochtitlán.",
-                ),
-                Pregunta(
-                    "¿Quién conquistó el Imperio Inca?",
-                    ["Francisco Pizarro", "Colón", "Balboa", "Almagro"],
-                    "Francisco Pizarro",
-                    "Pizarro capturó a Atahualpa.",
-                ),
-                Pregunta(
-                    "¿Qué pintor creó la Capilla Sixtina?",
-                    ["Miguel Ángel", "Rafael", "Botticelli", "Tiziano"],
-                    "Miguel Ángel",
-                    "Miguel Ángel pintó la bóveda.",
-                ),
-                Pregunta(
-                    "¿Qué movimiento religioso inició Lutero?",
-                    ["Reforma", "Contrarreforma", "Humanismo", "Ilustración"],
-                    "Reforma",
-                    "Lutero inició la Reforma protestante.",
-                ),
-                Pregunta(
-                    "¿Qué obra literaria escribió Dante?",
-                    ["Divina Comedia", "Quijote", "Fausto", "Beowulf"],
-                    "Divina Comedia",
-                    "Dante escribió la Divina Comedia.",
-                ),
-                Pregunta(
-                    "¿Qué artista pintó El nacimiento de Venus?",
-                    ["Botticelli", "Caravaggio", "Da Vinci", "Giotto"],
-                    "Botticelli",
-                    "Botticelli pintó Venus.",
-                ),
-                Pregunta(
-                    "¿Qué monarca impulsó la Contrarreforma?",
-                    ["Carlos V", "Luis XIV", "Isabel I", "Pedro I"],
-                    "Carlos V",
-                    "Carlos V apoyó la Contrarreforma.",
-                ),
-                Pregunta(
-                    "¿Qué instrumento mejoró Galileo?",
-                    ["Telescopio", "Microscopio", "Brújula", "Reloj"],
-                    "Telescopio",
-                    "Galileo perfeccionó el telescopio.",
-                ),
-                Pregunta(
-                    "¿Qué país lideró la exploración del Atlántico?",
-                    ["Portugal", "Rusia", "Suecia", "Polonia"],
-                    "Portugal",
-                    "Portugal exploró rutas atlánticas.",
-                ),
-                Pregunta(
-                    "¿Qué obra pintó Rafael en el Vaticano?",
-                    ["La Escuela de Atenas", "Guernica", "Las Meninas", "La Última Cena"],
-                    "La Escuela de Atenas",
-                    "Rafael pintó La Escuela de Atenas.",
-                ),
-            ],
-        ),
-        Categoria(
-            nombre="Revoluciones",
-            descripcion="Cambios políticos, industriales y sociales.",
-            preguntas=[
-                Pregunta(
-                    "¿Qué documento proclamó los derechos del hombre en 1789?",
-                    ["Declaración de los Derechos del Hombre", "Carta Magna", "Constitución de Cádiz", "Bill of Rights"],
-                    "Declaración de los Derechos del Hombre",
-                    "La declaración fue clave en la Revolución Francesa.",
-                ),
-                Pregunta(
-                    "¿Qué país lideró la Revolución Industrial?",
-                    ["Inglaterra", "España", "Portugal", "Rusia"],
-                    "Inglaterra",
-                    "Inglaterra fue pionera industrial.",
-                ),
-                Pregunta(
-                    "¿Qué máquina impulsó la industria textil?",
-                    ["Spinning Jenny", "Telégrafo", "Imprenta", "Locomotora"],
-                    "Spinning Jenny",
-                    "La Spinning Jenny aumentó la producción.",
-                ),
-                Pregunta(
-                    "¿Qué líder encabezó la independencia de Haití?",
-                    ["Toussaint Louverture", "Bolívar", "San Martín", "Sucre"],
-                    "Toussaint Louverture",
-                    "Louverture lideró la revolución haitiana.",
-                ),
-                Pregunta(
-                    "¿Qué evento inició la Revolución Francesa?",
-                    ["Toma de la Bastilla", "Congreso de Viena", "Paz de Westfalia", "Tratado de Versalles"],
-                    "Toma de la Bastilla",
-                    "La toma de la Bastilla fue simbólica.",
-                ),
-                Pregunta(
-                    "¿Quién lideró la independencia de EE.UU.?",
-                    ["George Washington", "Abraham Lincoln", "Thomas Jefferson", "Benjamin Franklin"],
-                    "George Washington",
-                    "Washington comandó al ejército continental.",
-                ),
-                Pregunta(
-                    "¿Qué imperio fue derrotado en la Revolución Americana?",
-                    ["Británico", "Español", "Francés", "Portugués"],
-                    "Británico",
-                    "Las colonias vencieron al Imperio Británico.",
-                ),
-                Pregunta(
-                    "¿Qué líder consolidó el poder tras la Revolución Francesa?",
-                    ["Napoleón", "Robespierre", "Luis XVI", "Marat"],
-                    "Napoleón",
-                    "Napoleón se proclamó emperador.",
-                ),
-                Pregunta(
-                    "¿Qué revolución ocurrió en 1917 en Rusia?",
-                    ["Revolución Bolchevique", "Revolución Gloriosa", "Revolución Industrial", "Revolución Cultural"],
-                    "Revolución Bolchevique",
-                    "Los bolcheviques tomaron el poder.",
-                ),
-                Pregunta(
-                    "¿Qué sistema económico defendía Karl Marx?",
-                    ["Socialismo", "Mercantilismo", "Liberalismo", "Feudalismo"],
-                    "Socialismo",
-                    "Marx propuso el socialismo científico.",
-                ),
-                Pregunta(
-                    "¿Qué fue la Comuna de París?",
-                    ["Gobierno obrero", "Tratado", "Reforma agraria", "Movimiento religioso"],
-                    "Gobierno obrero",
-                    "La Comuna fue un gobierno popular.",
-                ),
-                Pregunta(
-                    "¿Qué revolución inició en 1910 en México?",
-                    ["Revolución Mexicana", "Revolución Cubana", "Revolución Gloriosa", "Revolución Verde"],
-                    "Revolución Mexicana",
-                    "La Revolución Mexicana cambió el país.",
-                ),
-                Pregunta(
-                    "¿Qué líder mexicano impulsó la reforma agraria?",
-                    ["Emiliano Zapata", "Porfirio Díaz", "Villa", "Madero"],
-                    "Emiliano Zapata",
-                    "Zapata defendió 'Tierra y libertad'.",
-                ),
-                Pregunta(
-                    "¿Qué evento marcó el inicio de la independencia de Venezuela?",
-                    ["19 de abril de 1810", "5 de julio de 1811", "Batalla de Carabobo", "Congreso de Angostura"],
-                    "19 de abril de 1810",
-                    "Fue el inicio del proceso independentista.",
-                ),
-                Pregunta(
-                    "¿Qué batalla selló la independencia de Venezuela?",
-                    ["Carabobo", "Boyacá", "Pichincha", "Junín"],
-                    "Carabobo",
-                    "Carabobo fue decisiva en 1821.",
-                ),
-                Pregunta(
-                    "¿Qué documento firmó la independencia de Venezuela?",
-                    ["Acta de 1811", "Constitución de 1830", "Grito de Dolores", "Tratado de Tordesillas"],
-                    "Acta de 1811",
-                    "El 5 de julio se firmó el Acta.",
-                ),
-                Pregunta(
-                    "¿Qué revolución terminó en 1959 en Cuba?",
-                    ["Revolución Cubana", "Revolución Gloriosa", "Revolución Industrial", "Revolución Cultural"],
-                    "Revolución Cubana",
-                    "Fidel Castro lideró la Revolución Cubana.",
-                ),
-                Pregunta(
-                    "¿Qué líder cubano encabezó la revolución?",
-                    ["Fidel Castro", "Che Guevara", "Batista", "Allende"],
-                    "Fidel Castro",
-                    "Fidel Castro lideró el movimiento.",
-                ),
-                Pregunta(
-                    "¿Qué movimiento buscó abolir la esclavitud en el siglo XIX?",
-                    ["Abolicionismo", "Mercantilismo", "Colonialismo", "Nacionalismo"],
-                    "Abolicionismo",
-                    "El abolicionismo luchó contra la esclavitud.",
-                ),
-                Pregunta(
-                    "¿Qué tratado terminó la Primera Guerra Mundial?",
-                    ["Tratado de Versalles", "Tratado de Utrecht", "Tratado de París", "Tratado de Viena"],
-                    "Tratado de Versalles",
-                    "Versalles se firmó en 1919.",
-                ),
-            ],
-        ),
-        Categoria(
-            nombre="Siglo XX",
-            descripcion="Guerras mundiales, tecnología y geopolítica.",
-            preguntas=[
-                Pregunta(
-                    "¿Qué conflicto inició en 1914?",
-                    ["Primera Guerra Mundial", "Guerra Fría", "Guerra de Crimea", "Guerra de los Cien Años"],
-                    "Primera Guerra Mundial",
-                    "La Primera Guerra Mundial inició en 1914.",
-                ),
-                Pregunta(
-                    "¿Qué evento desencadenó la Primera Guerra Mundial?",
-                    ["Asesinato de Sarajevo", "Revolución Rusa", "Tratado de Versalles", "Ataque a Pearl Harbor"],
-                    "Asesinato de Sarajevo",
-                    "El asesinato del archiduque fue la chispa.",
-                ),
-                Pregunta(
-                    "¿Qué organización surgió tras la Segunda Guerra Mundial?",
-                    ["ONU", "OTAN", "Unión Europea", "Liga Hanseática"],
-                    "ONU",
-                    "La ONU se fundó en 1945.",
-                ),
-                Pregunta(
-                    "¿Qué país lanzó la bomba atómica en 1945?",
-                    ["Estados Unidos", "Alemania", "Japón", "URSS"],
-                    "Estados Unidos",
-                    "EE.UU. lanzó bombas en Hiroshima y Nagasaki.",
-                ),
-                Pregunta(
-                    "¿Qué alianza se formó en 1949?",
-                    ["OTAN", "Pacto de Varsovia", "ASEAN", "OEA"],
-                    "OTAN",
-                    "La OTAN nació en 1949.",
-                ),
-                Pregunta(
-                    "¿Qué muro cayó en 1989?",
-                    ["Muro de Berlín", "Muralla China", "Muro de Adriano", "Muro de Varsovia"],
-                    "Muro de Berlín",
-                    "La caída del muro simbolizó el fin de la Guerra Fría.",
-                ),
-                Pregunta(
-                    "¿Qué conflicto enfrentó a EE.UU. y la URSS?",
-                    ["Guerra Fría", "Guerra de Corea", "Guerra de Vietnam", "Guerra del Golfo"],
-                    "Guerra Fría",
-                    "Fue un conflicto ideológico y geopolítico.",
-                ),
-                Pregunta(
-                    "¿Qué carrera tecnológica marcó la Guerra Fría?",
-                    ["Carrera espacial", "Carrera naval", "Carrera armamentista", "Carrera comercial"],
-                    "Carrera espacial",
-                    "La carrera espacial impulsó la tecnología.",
-                ),
-                Pregunta(
-                    "¿Quién fue el primer humano en la Luna?",
-                    ["Neil Armstrong", "Yuri Gagarin", "Buzz Aldrin", "John Glenn"],
-                    "Neil Armstrong",
-                    "Armstrong llegó a la Luna en 1969.",
-                ),
-                Pregunta(
-                    "¿Qué país fue potencia del bloque oriental?",
-                    ["URSS", "Reino Unido", "Francia", "Italia"],
-                    "URSS",
-                    "La URSS lideró el bloque oriental.",
-                ),
-                Pregunta(
-                    "¿Qué conflicto se libró en Vietnam?",
-                    ["Guerra de Vietnam", "Guerra de Corea", "Guerra del Golfo", "Guerra Civil Española"],
-                    "Guerra de Vietnam",
-                    "Vietnam fue un conflicto de la Guerra Fría.",
-                ),
-                Pregunta(
-                    "¿Qué país fue dividido en dos después de 1945?",
-                    ["Alemania", "España", "Brasil", "Canadá"],
-                    "Alemania",
-                    "Alemania se dividió en RFA y RDA.",
-                ),
-                Pregunta(
-                    "¿Qué evento inició la Segunda Guerra Mundial?",
-                    ["Invasión de Polonia", "Ataque a Pearl Harbor", "Revolución China", "Guerra Civil Española"],
-                    "Invasión de Polonia",
-                    "Alemania invadió Polonia en 1939.",
-                ),
-                Pregunta(
-                    "¿Qué líder encabezó la India independiente?",
-                    ["Mahatma Gandhi", "Churchill", "Mandela", "Nehru"],
-                    "Mahatma Gandhi",
-                    "Gandhi lideró la independencia con no violencia.",
-                ),
-                Pregunta(
-                    "¿Qué líder sudafricano luchó contra el apartheid?",
-                    ["Nelson Mandela", "Desmond Tutu", "De Klerk", "Mbeki"],
-                    "Nelson Mandela",
-                    "Mandela fue símbolo de la lucha antiapartheid.",
-                ),
-                Pregunta(
-                    "¿Qué organización busca la cooperación económica en Europa?",
-                    ["Unión Europea", "OTAN", "ONU", "OEA"],
-                    "Unión Europea",
-                    "La UE integra economías europeas.",
-                ),
-                Pregunta(
-                    "¿Qué revolución tecnológica marcó finales del siglo XX?",
-                    ["Internet", "Imprenta", "Máquina de vapor", "Telégrafo"],
-                    "Internet",
-                    "Internet cambió la comunicación global.",
-                ),
-                Pregunta(
-                    "¿Qué conflicto ocurrió en 1991 en el Golfo?",
-                    ["Guerra del Golfo", "Guerra de Corea", "Guerra Civil Española", "Guerra de los Balcanes"],
-                    "Guerra del Golfo",
-                    "La Guerra del Golfo inició en 1991.",
-                ),
-                Pregunta(
-                    "¿Qué país lanzó el primer satélite artificial?",
-                    ["URSS", "Estados Unidos", "China", "Francia"],
-                    "URSS",
-                    "La URSS lanzó el Sputnik en 1957.",
-                ),
-                Pregunta(
-                    "¿Qué líder fue primer ministro del Reino Unido en la Segunda Guerra Mundial?",
-                    ["Winston Churchill", "Thatcher", "Chamberlain", "Attlee"],
-                    "Winston Churchill",
-                    "Churchill lideró al Reino Unido durante la guerra.",
-                ),
-            ],
-        ),
-    ]
-
-
-def leer_guardados() -> list[dict]:
-    if not ARCHIVO_GUARDADO.exists():
-        return []
-    with ARCHIVO_GUARDADO.open("r", encoding="utf-8") as archivo:
-        return json.load(archivo)
-
-
-def escribir_guardados(guardados: list[dict]) -> None:
-    with ARCHIVO_GUARDADO.open("w", encoding="utf-8") as archivo:
-        json.dump(guardados, archivo, ensure_ascii=False, indent=2)
+def obtener_almacen() -> EscrituraDiferida:
+    """Copia en memoria de las partidas; el disco se actualiza en segundo plano."""
+    global _almacen
+    if _almacen is None:
+        _almacen = EscrituraDiferida(crear_almacen(ARCHIVO_GUARDADO))
+    return _almacen
 
 
 class AplicacionJuego:
-    def __init__(self, raiz: tk.Tk) -> None:
+    def __init__(self, raiz: tk.Tk, eventos: RegistroEventos | None = None) -> None:
         self.raiz = raiz
         self.raiz.title("Juego de Historia Universal")
         self.raiz.geometry("1200x720")
         self.raiz.configure(bg="#edf2f9")
 
         self.categorias = cargar_categorias()
-        self.indice_categoria = 0
-        self.indice_pregunta = 0
-        self.vidas = 3
-        self.puntaje = 0
-        self.orden_preguntas: list[int] = []
-        self.tiempo_limite = 30
-        self.tiempo_restante = 30
-        self.pregunta_especial = False
-        self.pregunta_actual: Pregunta | None = None
-        self.temporizador_id: str | None = None
-        self.temporizador_investigar_id: str | None = None
+        self.eventos = eventos
+        self.motor = MotorJuego(self.categorias, eventos=eventos.registrar if eventos else None)
+        self.planificador = Planificador(self.raiz)
         self.tiempo_investigar_restante = 0
-        self.comodines = {"pista": 1, "saltar": 1, "investigar": 1, "eliminar": 1}
         self.permitir_salida_hasta: float = 0.0
-        self.dificultad = "normal"
-        self.configuracion = self._obtener_configuracion("normal")
+        self.busqueda: IndiceBusqueda | None = None
+        # Hilo que crea o pone al día el índice de búsqueda y el tema que espera por él.
+        self._indexando: threading.Thread | None = None
+        self._error_indice: Exception | None = None
+        self._tema_pendiente = ""
+
+        self.nombres_guardados: list[str] = []
+        self.textos_guardados: list[str] = []
+        self.pagina_guardados = 0
 
-        self.particulas_confeti: list[tuple[int, int, int, int, str]] = []
+        self.botones_opciones: list[ttk.Button] = []
+        self.opciones_visibles = 0
+        self.inicio_respuesta: float | None = None
+        self.latencias_respuesta_ms: deque[float] = deque(maxlen=100)
 
         self._configurar_estilos()
         self._construir_interfaz()
@@ -717,6 +95,17 @@ class AplicacionJuego:
         self._renderizar_guardados()
         self.raiz.bind("<FocusOut>", self._gestionar_salida)
         self.raiz.bind("<Unmap>", self._gestionar_salida)
+        self.raiz.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+    def cerrar(self) -> None:
+        self.planificador.cancelar_todo()
+        if _almacen is not None:
+            _almacen.cerrar()
+        if self.busqueda is not None:
+            self.busqueda.cerrar()
+        if self.eventos is not None:
+            self.eventos.cerrar()
+        self.raiz.destroy()
 
     def _configurar_estilos(self) -> None:
         estilo = ttk.Style()
@@ -743,73 +132,11 @@ class AplicacionJuego:
         )
         estilo.map("BotonSecundario.TButton", background=[("active", "#e5e7eb")])
 
-    def _obtener_configuracion(self, nivel: str) -> dict:
-        configuraciones = {
-            "principiante": {
-                "vidas_iniciales": 0,
-                "tiempo_pregunta": 30,
-                "tiempo_especial": 0,
-                "probabilidad_especial": 0,
-                "vidas_extra_especial": 0,
-                "anti_trampa": False,
-                "comodines": {"pista": 0, "saltar": 0, "investigar": 0, "eliminar": 0},
-                "puede_guardar": True,
-            },
-            "facil": {
-                "vidas_iniciales": 10,
-                "tiempo_pregunta": 30,
-                "tiempo_especial": 10,
-                "probabilidad_especial": 0.1,
-                "vidas_extra_especial": 1,
-                "anti_trampa": True,
-                "comodines": {"pista": 2, "saltar": 2, "investigar": 2, "eliminar": 2},
-                "puede_guardar": True,
-            },
-            "normal": {
-                "vidas_iniciales": 5,
-                "tiempo_pregunta": 30,
-                "tiempo_especial": 10,
-                "probabilidad_especial": 0.1,
-                "vidas_extra_especial": 1,
-                "anti_trampa": True,
-                "comodines": {"pista": 1, "saltar": 1, "investigar": 1, "eliminar": 1},
-                "puede_guardar": True,
-            },
-            "dificil": {
-                "vidas_iniciales": 3,
-                "tiempo_pregunta": 20,
-                "tiempo_especial": 5,
-                "probabilidad_especial": 0.05,
-                "vidas_extra_especial": 1,
-                "anti_trampa": True,
-                "comodines": {"pista": 0, "saltar": 0, "investigar": 0, "eliminar": 0},
-                "puede_guardar": True,
-            },
-            "hardcore": {
-                "vidas_iniciales": 1,
-                "tiempo_pregunta": 10,
-                "tiempo_especial": 0,
-                "probabilidad_especial": 0,
-                "vidas_extra_especial": 0,
-                "anti_trampa": True,
-                "comodines": {"pista": 0, "saltar": 0, "investigar": 0, "eliminar": 0},
-                "puede_guardar": False,
-            },
-        }
-        return configuraciones.get(nivel, configuraciones["normal"]).copy()
-
     def _aplicar_dificultad(self, nivel: str, actualizar_selector: bool = False) -> None:
-        self.dificultad = nivel
-        self.configuracion = self._obtener_configuracion(nivel)
-        self.vidas = self.configuracion["vidas_iniciales"]
-        self.tiempo_limite = self.configuracion["tiempo_pregunta"]
-        self.tiempo_restante = self.configuracion["tiempo_pregunta"]
-        self.comodines = self.configuracion["comodines"].copy()
+        self.motor.aplicar_dificultad(nivel)
         self._detener_temporizador_investigar()
-        if actualizar_selector and hasattr(self, "selector_dificultad"):
-            opciones = ["principiante", "facil", "normal", "dificil", "hardcore"]
-            if nivel in opciones:
-                self.selector_dificultad.current(opciones.index(nivel))
+        if actualizar_selector and hasattr(self, "selector_dificultad") and nivel in DIFICULTADES:
+            self.selector_dificultad.current(DIFICULTADES.index(nivel))
         if hasattr(self, "boton_pista"):
             self._actualizar_comodines()
         self._actualizar_panel()
@@ -865,6 +192,14 @@ class AplicacionJuego:
         self.selector_dificultad.pack(fill="x", padx=16)
         self.selector_dificultad.bind("<<ComboboxSelected>>", self._cambiar_dificultad)
 
+        ttk.Label(self.columna_menu, text="Practicar por tema", style="Texto.TLabel").pack(anchor="w", padx=16, pady=(12, 4))
+        self.entrada_tema = ttk.Entry(self.columna_menu)
+        self.entrada_tema.pack(fill="x", padx=16)
+        self.entrada_tema.bind("<Return>", lambda _evento: self.practicar_tema())
+        ttk.Button(self.columna_menu, text="Practicar", style="BotonSecundario.TButton", command=self.practicar_tema).pack(
+            fill="x", padx=16, pady=4
+        )
+
         ttk.Label(self.columna_menu, text="Nombre de la partida", style="Texto.TLabel").pack(anchor="w", padx=16, pady=(12, 4))
         self.entrada_nombre = ttk.Entry(self.columna_menu)
         self.entrada_nombre.pack(fill="x", padx=16)
@@ -877,9 +212,28 @@ class AplicacionJuego:
         self.estado_guardado.pack(anchor="w", padx=16, pady=(4, 8))
 
         ttk.Label(self.columna_menu, text="Partidas guardadas", style="Subtitulo.TLabel").pack(anchor="w", padx=16)
-        self.lista_guardados = tk.Listbox(self.columna_menu, height=10)
+        self.lista_guardados = tk.Listbox(self.columna_menu, height=GUARDADOS_POR_PAGINA)
         self.lista_guardados.pack(fill="x", padx=16, pady=6)
         self.lista_guardados.bind("<<ListboxSelect>>", self._seleccionar_guardado)
+
+        self.paginador_guardados = ttk.Frame(self.columna_menu, style="Tarjeta.TFrame")
+        self.paginador_guardados.pack(fill="x", padx=16)
+        ttk.Button(
+            self.paginador_guardados,
+            text="◀",
+            width=3,
+            style="BotonSecundario.TButton",
+            command=lambda: self._cambiar_pagina_guardados(-1),
+        ).pack(side="left")
+        self.etiqueta_pagina_guardados = ttk.Label(self.paginador_guardados, text="", style="Texto.TLabel")
+        self.etiqueta_pagina_guardados.pack(side="left", expand=True)
+        ttk.Button(
+            self.paginador_guardados,
+            text="▶",
+            width=3,
+            style="BotonSecundario.TButton",
+            command=lambda: self._cambiar_pagina_guardados(1),
+        ).pack(side="right")
         self.selector_dificultad.bind("<<ComboboxSelected>>", self._cambiar_dificultad)
 
         self.columna_juego = ttk.Frame(self.zona_principal, style="Tarjeta.TFrame")
@@ -945,6 +299,7 @@ class AplicacionJuego:
 
         self.lienzo_confeti = tk.Canvas(self.columna_juego, height=120, bg="#ffffff", highlightthickness=0)
         self.lienzo_confeti.pack(fill="x", padx=20, pady=(12, 16))
+        self.confeti = MotorConfeti(self.lienzo_confeti, alto=120)
 
         self.panel_categorias = ttk.Frame(self.contenedor, style="Tarjeta.TFrame")
         self.panel_categorias.pack(fill="x")
@@ -956,144 +311,113 @@ class AplicacionJuego:
         for indice, categoria in enumerate(self.categorias):
             boton = ttk.Button(
                 self.lista_categorias,
-                text=f"{categoria.nombre} ({len(categoria.preguntas)} preguntas)",
+                text=f"{categoria.nombre} ({categoria.total} preguntas)",
                 style="BotonSecundario.TButton",
                 command=lambda i=indice: self.seleccionar_categoria(i),
             )
             boton.pack(side="left", padx=4, pady=4)
 
-        self._aplicar_dificultad(self.dificultad, actualizar_selector=True)
+        self._aplicar_dificultad(self.motor.dificultad, actualizar_selector=True)
 
     def _actualizar_panel(self) -> None:
-        categoria = self.categorias[self.indice_categoria]
-        if not self.orden_preguntas:
-            self.orden_preguntas = list(range(len(categoria.preguntas)))
-            random.shuffle(self.orden_preguntas)
-        self.etiqueta_categoria.config(text=categoria.nombre)
+        motor = self.motor
+        pregunta = motor.siguiente_pregunta()
+        self.etiqueta_categoria.config(text=motor.categoria.nombre)
         self.etiqueta_nivel.config(text="Reto activo")
-        self.etiqueta_vidas.config(text=f"Vidas: {self.vidas}")
-        self.etiqueta_puntaje.config(text=f"Puntaje: {self.puntaje}")
-        self.etiqueta_tiempo.config(text=f"Tiempo: {self.tiempo_restante}s")
+        self.etiqueta_vidas.config(text=f"Vidas: {motor.vidas}")
+        self.etiqueta_puntaje.config(text=f"Puntaje: {motor.puntaje}")
 
-        if self.indice_pregunta >= len(categoria.preguntas):
+        if pregunta is None:
+            self.etiqueta_tiempo.config(text=f"Tiempo: {motor.tiempo_restante}s")
             self.texto_pregunta.config(text="¡Categoría completada!")
             self.retroalimentacion.config(text="Excelente trabajo. Puedes elegir otra categoría.")
-            for widget in self.marco_opciones.winfo_children():
-                widget.destroy()
+            for boton in self.botones_opciones:
+                boton.pack_forget()
+            self.opciones_visibles = 0
             self._detener_temporizador()
+            self._medir_latencia_respuesta()
             return
 
-        indice_real = self.orden_preguntas[self.indice_pregunta]
-        pregunta = self._seleccionar_pregunta(categoria, indice_real)
-        self.pregunta_actual = pregunta
         self.texto_pregunta.config(text=pregunta.enunciado)
         self.retroalimentacion.config(text="Selecciona la opción correcta.")
         self._iniciar_temporizador()
-
-        for widget in self.marco_opciones.winfo_children():
-            widget.destroy()
-
-        for opcion in pregunta.opciones:
-            ttk.Button(
-                self.marco_opciones,
-                text=opcion,
-                style="BotonSecundario.TButton",
-                command=lambda op=opcion: self.responder(op),
-            ).pack(side="left", padx=4, pady=4)
+        self._mostrar_opciones(pregunta.opciones)
         self._actualizar_comodines()
-
-    def _seleccionar_pregunta(self, categoria: Categoria, indice_real: int) -> Pregunta:
-        es_especial = random.random() < self.configuracion["probabilidad_especial"]
-        self.pregunta_especial = es_especial
-        if es_especial:
-            self.tiempo_limite = self.configuracion["tiempo_especial"]
-            self.tiempo_restante = self.configuracion["tiempo_especial"]
-            return self._obtener_pregunta_especial(categoria.nombre)
-        self.tiempo_limite = self.configuracion["tiempo_pregunta"]
-        self.tiempo_restante = self.configuracion["tiempo_pregunta"]
-        return categoria.preguntas[indice_real]
-
-    def _obtener_pregunta_especial(self, categoria: str) -> Pregunta:
-        banco = {
-            "Antigüedad": [
-                Pregunta(
-                    "¿Qué mito habla de una isla avanzada que desapareció en el mar?",
-                    ["Atlántida", "Lemuria", "Pangea", "Hiperbórea"],
-                    "Atlántida",
-                    "Atlántida es una leyenda antigua.",
-                )
-            ],
-            "Edad Media": [
-                Pregunta(
-                    "¿Qué objeto sagrado se buscaba en leyendas medievales?",
-                    ["Santo Grial", "Piedra Filosofal", "Arca de Noé", "Cáliz de Oro"],
-                    "Santo Grial",
-                    "El Santo Grial es un mito medieval.",
-                )
-            ],
-            "Renacimiento": [
-                Pregunta(
-                    "¿Qué personaje es famoso por el misterio de su sonrisa en una pintura?",
-                    ["Mona Lisa", "David", "Venus", "Dama del Armiño"],
-                    "Mona Lisa",
-                    "La sonrisa de la Mona Lisa es enigmática.",
+        self._medir_latencia_respuesta()
+        # Mientras la interfaz está ociosa se deja lista la pregunta siguiente.
+        self.planificador.en_reposo("preparar_siguiente", motor.preparar_siguiente)
+
+    # Los botones de opción se crean una vez y se reconfiguran en cada pregunta.
+    def _mostrar_opciones(self, opciones: Sequence[str]) -> None:
+        while len(self.botones_opciones) < len(opciones):
+            indice = len(self.botones_opciones)
+            self.botones_opciones.append(
+                ttk.Button(
+                    self.marco_opciones,
+                    style="BotonSecundario.TButton",
+                    command=lambda i=indice: self._responder_opcion(i),
                 )
-            ],
-            "Revoluciones": [
-                Pregunta(
-                    "¿Qué consigna se asocia con la Revolución Francesa?",
-                    ["Libertad, igualdad, fraternidad", "Orden y progreso", "Paz y trabajo", "Fe y patria"],
-                    "Libertad, igualdad, fraternidad",
-                    "Es una consigna histórica de la época.",
-                )
-            ],
-            "Siglo XX": [
-                Pregunta(
-                    "¿Qué fenómeno se relaciona con teorías del siglo XX sobre objetos voladores?",
-                    ["OVNIs", "Hiperbórea", "Atlántida", "Roswell es mito"],
-                    "OVNIs",
-                    "Los OVNIs protagonizan teorías modernas.",
-                )
-            ],
+            )
+        for indice, boton in enumerate(self.botones_opciones):
+            if indice < len(opciones):
+                boton.configure(text=opciones[indice], state="normal")
+                if indice >= self.opciones_visibles:
+                    boton.pack(side="left", padx=4, pady=4)
+            elif indice < self.opciones_visibles:
+                boton.pack_forget()
+        self.opciones_visibles = len(opciones)
+
+    def _responder_opcion(self, indice: int) -> None:
+        pregunta = self.motor.pregunta_actual
+        if pregunta and indice < len(pregunta.opciones):
+            self.responder(indice)
+
+    def _medir_latencia_respuesta(self) -> None:
+        if self.inicio_respuesta is None:
+            return
+        self.latencias_respuesta_ms.append((time.perf_counter() - self.inicio_respuesta) * 1000)
+        self.inicio_respuesta = None
+
+    def resumen_latencias(self) -> dict:
+        """p50 y p95 de las últimas respuestas (del clic a la pregunta siguiente) frente al presupuesto."""
+        muestras = sorted(self.latencias_respuesta_ms)
+        if not muestras:
+            return {"muestras": 0, "presupuesto_ms": PRESUPUESTO_RESPUESTA_MS}
+        p95 = muestras[min(len(muestras) - 1, int(len(muestras) * 0.95))]
+        return {
+            "muestras": len(muestras),
+            "p50_ms": round(muestras[len(muestras) // 2], 4),
+            "p95_ms": round(p95, 4),
+            "maximo_ms": round(muestras[-1], 4),
+            "presupuesto_ms": PRESUPUESTO_RESPUESTA_MS,
+            "dentro_del_presupuesto": p95 <= PRESUPUESTO_RESPUESTA_MS,
         }
-        return random.choice(banco.get(categoria, banco["Antigüedad"]))
 
     def _iniciar_temporizador(self) -> None:
-        self._detener_temporizador()
-        self.etiqueta_tiempo.config(text=f"Tiempo: {self.tiempo_restante}s")
-        self.temporizador_id = self.raiz.after(1000, self._actualizar_temporizador)
-
-    def _actualizar_temporizador(self) -> None:
-        self.tiempo_restante -= 1
-        self.etiqueta_tiempo.config(text=f"Tiempo: {self.tiempo_restante}s")
-        if self.tiempo_restante <= 0:
-            self._tiempo_agotado()
-            return
-        self.temporizador_id = self.raiz.after(1000, self._actualizar_temporizador)
+        self.planificador.cuenta_regresiva(
+            "pregunta", self.motor.tiempo_restante, self._actualizar_temporizador, self._tiempo_agotado
+        )
+
+    def _actualizar_temporizador(self, restante: int) -> None:
+        self.motor.tiempo_restante = restante
+        self.etiqueta_tiempo.config(text=f"Tiempo: {restante}s")
 
     def _detener_temporizador(self) -> None:
-        if self.temporizador_id:
-            self.raiz.after_cancel(self.temporizador_id)
-            self.temporizador_id = None
+        self.planificador.cancelar("pregunta")
 
     def _tiempo_agotado(self) -> None:
         self._detener_temporizador()
-        self._perder_pregunta("Se acabó el tiempo.")
+        self._perder_pregunta("Se acabó el tiempo.", "tiempo")
 
     def _perder_partida(self, mensaje: str) -> None:
+        self.inicio_respuesta = None
         self._detener_temporizador_investigar()
         self._detener_temporizador()
         reiniciar = messagebox.askyesno(
             "Partida perdida",
             f"{mensaje}\n\nHas perdido y debes empezar de cero.\n\n¿Deseas iniciar una nueva partida ahora?",
         )
-        self.vidas = 0
-        self.puntaje = 0
-        self.indice_pregunta = 0
-        self.orden_preguntas = list(range(len(self.categorias[self.indice_categoria].preguntas)))
-        random.shuffle(self.orden_preguntas)
-        self.vidas = self.configuracion["vidas_iniciales"]
-        self.comodines = self.configuracion["comodines"].copy()
+        self.motor.reiniciar_ronda(self.motor.con_repaso)
         self.retroalimentacion.config(text=f"{mensaje} Debes empezar de cero.")
         self._actualizar_comodines()
         self._guardar_automatico()
@@ -1101,22 +425,18 @@ class AplicacionJuego:
         if reiniciar:
             self.nueva_partida()
 
-    def _perder_pregunta(self, mensaje: str) -> None:
+    def _perder_pregunta(self, mensaje: str, motivo: str = "salida") -> None:
         self.retroalimentacion.config(text=f"{mensaje} Pierdes la pregunta.")
-        if self.configuracion["vidas_iniciales"] > 0:
-            self.vidas = max(0, self.vidas - 1)
-        self.indice_pregunta += 1
-        if self.dificultad == "hardcore":
-            self._perder_partida("Modo hardcore: perdiste la pregunta.")
-            return
-        if self.configuracion["vidas_iniciales"] > 0 and self.vidas <= 0:
-            self._perder_partida("Has perdido todas las vidas.")
+        resultado = self.motor.perder_pregunta(mensaje, motivo)
+        if resultado.partida_perdida:
+            self._perder_partida(resultado.mensaje)
             return
         self._actualizar_panel()
 
     def _actualizar_comodines(self) -> None:
         if not hasattr(self, "boton_pista"):
             return
+        comodines = self.motor.comodines
         botones = {
             "pista": self.boton_pista,
             "saltar": self.boton_saltar,
@@ -1124,39 +444,35 @@ class AplicacionJuego:
             "eliminar": self.boton_eliminar,
         }
         for clave, boton in botones.items():
-            cantidad = self.comodines.get(clave, 0)
+            cantidad = comodines.get(clave, 0)
             boton.configure(state="normal" if cantidad > 0 else "disabled")
         etiqueta_investigar = f"{self.tiempo_investigar_restante}s" if self.tiempo_investigar_restante > 0 else "10s"
-        self.boton_pista.configure(text=f"Comodín: Pista ({self.comodines.get('pista', 0)})")
-        self.boton_saltar.configure(text=f"Comodín: Saltar ({self.comodines.get('saltar', 0)})")
+        self.boton_pista.configure(text=f"Comodín: Pista ({comodines.get('pista', 0)})")
+        self.boton_saltar.configure(text=f"Comodín: Saltar ({comodines.get('saltar', 0)})")
         self.boton_investigar.configure(
-            text=f"Comodín: Investigar {etiqueta_investigar} ({self.comodines.get('investigar', 0)})"
+            text=f"Comodín: Investigar {etiqueta_investigar} ({comodines.get('investigar', 0)})"
         )
-        self.boton_eliminar.configure(text=f"Comodín: Eliminar 2 ({self.comodines.get('eliminar', 0)})")
+        self.boton_eliminar.configure(text=f"Comodín: Eliminar 2 ({comodines.get('eliminar', 0)})")
 
     def usar_comodin_pista(self) -> None:
-        if self.comodines["pista"] <= 0 or not self.pregunta_actual:
+        pista = self.motor.usar_pista()
+        if pista is None:
             return
-        pista = f"Pista: la respuesta inicia con \"{self.pregunta_actual.respuesta[0]}\"."
         self.retroalimentacion.config(text=pista)
-        self.comodines["pista"] -= 1
         self._actualizar_comodines()
         self._guardar_automatico()
 
     def usar_comodin_saltar(self) -> None:
-        if self.comodines["saltar"] <= 0:
+        if not self.motor.usar_saltar():
             return
-        self.comodines["saltar"] -= 1
-        self.indice_pregunta += 1
         self._actualizar_comodines()
         self._actualizar_panel()
         self._guardar_automatico()
 
     def usar_comodin_investigar(self) -> None:
-        if self.comodines["investigar"] <= 0:
+        if not self.motor.usar_investigar():
             return
-        self.comodines["investigar"] -= 1
-        self.permitir_salida_hasta = datetime.now().timestamp() + 10
+        self.permitir_salida_hasta = time.monotonic() + 10
         self._iniciar_temporizador_investigar()
         self.estado_guardado.config(text="Puedes salir 10 segundos para investigar.")
         self._actualizar_comodines()
@@ -1164,117 +480,142 @@ class AplicacionJuego:
 
     # Temporizador visual del comodín de investigar.
     def _iniciar_temporizador_investigar(self) -> None:
-        self.tiempo_investigar_restante = 10
-        if self.temporizador_investigar_id:
-            self.raiz.after_cancel(self.temporizador_investigar_id)
-        self._actualizar_comodines()
-        self.temporizador_investigar_id = self.raiz.after(1000, self._actualizar_temporizador_investigar)
+        self.planificador.cuenta_regresiva(
+            "investigar", 10, self._actualizar_temporizador_investigar, self._detener_temporizador_investigar
+        )
 
-    def _actualizar_temporizador_investigar(self) -> None:
-        self.tiempo_investigar_restante -= 1
+    def _actualizar_temporizador_investigar(self, restante: int) -> None:
+        self.tiempo_investigar_restante = restante
         self._actualizar_comodines()
-        if self.tiempo_investigar_restante <= 0:
-            self._detener_temporizador_investigar()
-            return
-        self.temporizador_investigar_id = self.raiz.after(1000, self._actualizar_temporizador_investigar)
 
     def _detener_temporizador_investigar(self) -> None:
-        if self.temporizador_investigar_id:
-            self.raiz.after_cancel(self.temporizador_investigar_id)
-            self.temporizador_investigar_id = None
+        self.planificador.cancelar("investigar")
         self.tiempo_investigar_restante = 0
         if hasattr(self, "boton_investigar"):
             self._actualizar_comodines()
 
     def usar_comodin_eliminar(self) -> None:
-        if self.comodines["eliminar"] <= 0 or not self.pregunta_actual:
-            return
-        botones = list(self.marco_opciones.winfo_children())
-        incorrectos = [boton for boton in botones if boton.cget("text") != self.pregunta_actual.respuesta]
-        disponibles = [boton for boton in incorrectos if str(boton.cget("state")) != "disabled"]
-        if len(disponibles) < 2:
+        eliminadas = self.motor.usar_eliminar()
+        if not eliminadas:
             return
-        random.shuffle(disponibles)
-        for boton in disponibles[:2]:
-            boton.configure(state="disabled")
-        self.comodines["eliminar"] -= 1
+        for indice in eliminadas:
+            self.botones_opciones[indice].configure(state="disabled")
         self._actualizar_comodines()
         self._guardar_automatico()
 
     def _gestionar_salida(self, _evento: tk.Event) -> None:
-        if not self.configuracion["anti_trampa"]:
+        if not self.motor.configuracion["anti_trampa"]:
             return
-        ahora = datetime.now().timestamp()
-        if ahora > self.permitir_salida_hasta:
+        if time.monotonic() > self.permitir_salida_hasta:
             self._perder_pregunta("Saliste de la ventana sin comodín.")
         else:
-            self.raiz.after(11000, self._comprobar_regreso)
+            # Una sola comprobación pendiente: salir varias veces no apila llamadas.
+            self.planificador.despues("comprobar_regreso", 11, self._comprobar_regreso)
 
     def _comprobar_regreso(self) -> None:
         if not self.raiz.focus_displayof():
             self._perder_pregunta("No regresaste a tiempo.")
 
-    def responder(self, opcion: str) -> None:
-        if not self.pregunta_actual:
+    def responder(self, indice: int) -> None:
+        if not self.motor.pregunta_actual:
             return
+        self.inicio_respuesta = time.perf_counter()
         self._detener_temporizador()
-        if opcion == self.pregunta_actual.respuesta:
-            self.puntaje += 10
-            self.retroalimentacion.config(text=f"✅ {self.pregunta_actual.retroalimentacion}")
+        resultado = self.motor.responder(indice)
+        if resultado.correcta:
+            texto = f"✅ {resultado.retroalimentacion}"
+            if resultado.vida_extra:
+                texto += " ¡Ganaste una vida!"
             self._lanzar_confeti()
-            if self.pregunta_especial and self.configuracion["vidas_extra_especial"] > 0:
-                self.vidas += 1
-                self.retroalimentacion.config(text=f"✅ {self.pregunta_actual.retroalimentacion} ¡Ganaste una vida!")
         else:
-            if self.configuracion["vidas_iniciales"] > 0:
-                self.vidas -= 1
-            self.retroalimentacion.config(
-                text=f"❌ {self.pregunta_actual.retroalimentacion} Te quedan {self.vidas} vidas."
-            )
+            texto = f"❌ {resultado.retroalimentacion} Te quedan {self.motor.vidas} vidas."
+        self.retroalimentacion.config(text=texto)
 
-        self.indice_pregunta += 1
-        if self.dificultad == "hardcore" and opcion != self.pregunta_actual.respuesta:
-            self._perder_partida("Modo hardcore: fallaste la pregunta.")
-            return
-        if self.configuracion["vidas_iniciales"] > 0 and self.vidas <= 0:
-            self._perder_partida("Has perdido todas las vidas.")
+        if resultado.partida_perdida:
+            self._perder_partida(resultado.mensaje)
             return
         self._guardar_automatico()
         self._actualizar_panel()
 
     def seleccionar_categoria(self, indice: int) -> None:
-        self.indice_categoria = indice
-        self.indice_pregunta = 0
-        self.vidas = self.configuracion["vidas_iniciales"]
-        self.puntaje = 0
-        self.orden_preguntas = list(range(len(self.categorias[indice].preguntas)))
-        random.shuffle(self.orden_preguntas)
-        self.comodines = self.configuracion["comodines"].copy()
+        self.motor.iniciar_categoria(indice)
         self._actualizar_panel()
         self._guardar_automatico()
 
+    @property
+    def en_practica(self) -> bool:
+        """True mientras se juega un tema buscado en lugar de una categoría."""
+        return self.motor.indice_categoria >= len(self.categorias)
+
+    def practicar_tema(self) -> None:
+        consulta = self.entrada_tema.get().strip()
+        if not consulta:
+            messagebox.showwarning("Tema requerido", "Escribe un tema, por ejemplo «Roma» o «Bolívar».")
+            return
+        if self.busqueda is not None:
+            self._jugar_tema(consulta)
+            return
+        # El índice se crea o se pone al día la primera vez que se busca, en
+        # otro hilo para que la ventana siga respondiendo.
+        self._tema_pendiente = consulta
+        if self._indexando is None:
+            self._indexando = threading.Thread(target=self._actualizar_indice, name="indice-busqueda", daemon=True)
+            self._indexando.start()
+            self.retroalimentacion.config(text="Preparando la búsqueda por temas…")
+            self._esperar_indice()
+
+    def _actualizar_indice(self) -> None:
+        # Con su propia conexión: SQLite no comparte una conexión entre hilos.
+        indice = IndiceBusqueda()
+        try:
+            indice.actualizar()
+        except Exception as error:
+            self._error_indice = error
+        finally:
+            indice.cerrar()
+
+    def _esperar_indice(self) -> None:
+        if self._indexando.is_alive():
+            self.planificador.despues("indice_busqueda", 0.1, self._esperar_indice)
+            return
+        self._indexando = None
+        if self._error_indice is not None:
+            error, self._error_indice = self._error_indice, None
+            messagebox.showerror("Búsqueda por temas", f"No se pudo preparar el índice de búsqueda: {error}")
+            return
+        self.busqueda = IndiceBusqueda()
+        self._jugar_tema(self._tema_pendiente)
+
+    def _jugar_tema(self, consulta: str) -> None:
+        tema = self.busqueda.tema(consulta, PREGUNTAS_POR_TEMA)
+        if not tema.preguntas:
+            messagebox.showinfo("Sin resultados", f"No hay preguntas sobre «{consulta}».")
+            return
+        # El tema va después de las categorías para no alterar sus índices. Se
+        # juega en orden de relevancia y sin repaso: la práctica no se guarda.
+        self.motor.categorias = [*self.categorias, tema]
+        self.motor.iniciar_categoria(len(self.categorias), barajar=False)
+        self._actualizar_panel()
+
     def nueva_partida(self) -> None:
-        self.indice_categoria = 0
-        self.indice_pregunta = 0
-        self.vidas = self.configuracion["vidas_iniciales"]
-        self.puntaje = 0
-        self.orden_preguntas = list(range(len(self.categorias[0].preguntas)))
-        random.shuffle(self.orden_preguntas)
-        self.comodines = self.configuracion["comodines"].copy()
+        self.motor.iniciar_categoria(0)
         self._actualizar_panel()
         self._guardar_automatico()
 
     def _guardar_automatico(self) -> None:
-        if not self.configuracion["puede_guardar"]:
+        if not self.motor.configuracion["puede_guardar"] or self.en_practica:
             return
         nombre = self.entrada_nombre.get().strip()
         if nombre:
             self._guardar_con_nombre(nombre)
 
     def guardar_partida(self) -> None:
-        if not self.configuracion["puede_guardar"]:
+        if not self.motor.configuracion["puede_guardar"]:
             messagebox.showwarning("Modo hardcore", "En modo hardcore no se guardan partidas.")
             return
+        if self.en_practica:
+            messagebox.showwarning("Práctica por tema", "Las prácticas por tema no se guardan; elige una categoría.")
+            return
         nombre = self.entrada_nombre.get().strip()
         if not nombre:
             messagebox.showwarning("Nombre requerido", "Escribe un nombre para guardar la partida.")
@@ -1282,30 +623,8 @@ class AplicacionJuego:
         self._guardar_con_nombre(nombre)
 
     def _guardar_con_nombre(self, nombre: str) -> None:
-        guardados = leer_guardados()
-        existente = next((g for g in guardados if g["nombre"] == nombre), None)
-        maximo = max(existente["maximo_puntaje"] if existente else 0, self.puntaje)
-        registro = {
-            "id": existente["id"] if existente else str(random.randint(1000, 9999)),
-            "nombre": nombre,
-            "fecha": datetime.now().strftime("%d/%m/%Y %H:%M"),
-            "maximo_puntaje": maximo,
-            "estado": {
-                "indice_categoria": self.indice_categoria,
-                "indice_pregunta": self.indice_pregunta,
-                "vidas": self.vidas,
-                "puntaje": self.puntaje,
-                "orden_preguntas": self.orden_preguntas,
-                "tiempo_limite": self.tiempo_limite,
-                "tiempo_restante": self.tiempo_restante,
-                "pregunta_especial": self.pregunta_especial,
-                "comodines": self.comodines,
-                "dificultad": self.dificultad,
-            },
-        }
-        guardados = [g for g in guardados if g["nombre"] != nombre]
-        guardados.insert(0, registro)
-        escribir_guardados(guardados)
+        almacen = obtener_almacen()
+        almacen.guardar(crear_registro(nombre, self.motor.estado(), almacen.resumen(nombre)))
         self.estado_guardado.config(text="Partida guardada correctamente.")
         self._renderizar_guardados()
 
@@ -1314,75 +633,112 @@ class AplicacionJuego:
         if not seleccion:
             messagebox.showwarning("Selecciona una partida", "Selecciona una partida en la lista.")
             return
-        registro = leer_guardados()[seleccion[0]]
-        self._cargar_registro(registro)
+        self._cargar_guardado_en(seleccion[0])
 
     def _seleccionar_guardado(self, _evento: tk.Event) -> None:
         seleccion = self.lista_guardados.curselection()
         if not seleccion:
             return
-        registro = leer_guardados()[seleccion[0]]
-        self._cargar_registro(registro)
+        self._cargar_guardado_en(seleccion[0])
+
+    def _cargar_guardado_en(self, posicion: int) -> None:
+        if posicion >= len(self.nombres_guardados):
+            return
+        registro = obtener_almacen().obtener(self.nombres_guardados[posicion])
+        if registro:
+            self._cargar_registro(registro)
 
     def _cargar_registro(self, registro: dict) -> None:
-        estado = registro["estado"]
-        self.indice_categoria = estado["indice_categoria"]
-        self.indice_pregunta = estado["indice_pregunta"]
-        self.vidas = estado["vidas"]
-        self.puntaje = estado["puntaje"]
-        self.orden_preguntas = estado.get(
-            "orden_preguntas", list(range(len(self.categorias[self.indice_categoria].preguntas)))
-        )
-        self.tiempo_limite = estado.get("tiempo_limite", 30)
-        self.tiempo_restante = estado.get("tiempo_restante", 30)
-        self.pregunta_especial = estado.get("pregunta_especial", False)
-        self.comodines = estado.get("comodines", {"pista": 1, "saltar": 1, "investigar": 1, "eliminar": 1})
-        if estado.get("dificultad"):
-            self._aplicar_dificultad(estado["dificultad"], actualizar_selector=True)
+        self.motor.cargar_estado(registro["estado"])
+        self._detener_temporizador_investigar()
+        if self.motor.dificultad in DIFICULTADES:
+            self.selector_dificultad.current(DIFICULTADES.index(self.motor.dificultad))
         self.entrada_nombre.delete(0, tk.END)
         self.entrada_nombre.insert(0, registro["nombre"])
         self.estado_guardado.config(text=f"Partida cargada: {registro['nombre']}")
         self._actualizar_panel()
 
+    # Solo se dibuja la página visible; el resto de partidas sigue en memoria.
     def _renderizar_guardados(self) -> None:
-        self.lista_guardados.delete(0, tk.END)
-        guardados = leer_guardados()
-        if not guardados:
-            self.lista_guardados.insert(tk.END, "Sin partidas guardadas")
-            return
-        for guardado in guardados:
-            texto = f"{guardado['nombre']} | Máx {guardado['maximo_puntaje']} | {guardado['fecha']}"
-            self.lista_guardados.insert(tk.END, texto)
+        almacen = obtener_almacen()
+        total = almacen.total()
+        paginas = max(1, -(-total // GUARDADOS_POR_PAGINA))
+        self.pagina_guardados = min(self.pagina_guardados, paginas - 1)
+        guardados = almacen.listar(self.pagina_guardados * GUARDADOS_POR_PAGINA, GUARDADOS_POR_PAGINA)
+        textos = [f"{g['nombre']} | Máx {g['maximo_puntaje']} | {g['fecha']}" for g in guardados]
+        if not textos:
+            textos = ["Cargando partidas..." if almacen.cargando else "Sin partidas guardadas"]
+        if textos != self.textos_guardados:
+            self.lista_guardados.delete(0, tk.END)
+            self.lista_guardados.insert(tk.END, *textos)
+            self.textos_guardados = textos
+        self.nombres_guardados = [guardado["nombre"] for guardado in guardados]
+        estado = f"Página {self.pagina_guardados + 1} de {paginas}"
+        if almacen.cargando:
+            estado += " (cargando...)"
+            if not self.planificador.pendiente("refrescar_guardados"):
+                self.planificador.despues("refrescar_guardados", 0.1, self._renderizar_guardados)
+        self.etiqueta_pagina_guardados.config(text=estado)
+
+    def _cambiar_pagina_guardados(self, paso: int) -> None:
+        self.pagina_guardados = max(0, self.pagina_guardados + paso)
+        self._renderizar_guardados()
 
     def _lanzar_confeti(self) -> None:
-        self.lienzo_confeti.delete("all")
         ancho = self.lienzo_confeti.winfo_width() or 800
-        for _ in range(40):
-            x = random.randint(0, ancho)
-            y = random.randint(0, 20)
-            dx = random.randint(-3, 3)
-            dy = random.randint(2, 6)
-            color = random.choice(["#6366f1", "#38bdf8", "#f472b6", "#22c55e"])
-            self.particulas_confeti.append((x, y, dx, dy, color))
-        self._animar_confeti()
+        self.confeti.lanzar(40, ancho)
+        if not self.planificador.pendiente("confeti"):
+            self._animar_confeti()
 
     def _animar_confeti(self) -> None:
-        self.lienzo_confeti.delete("all")
-        nuevas = []
-        for x, y, dx, dy, color in self.particulas_confeti:
-            nx, ny = x + dx, y + dy
-            if ny < 120:
-                nuevas.append((nx, ny, dx, dy, color))
-                self.lienzo_confeti.create_oval(nx, ny, nx + 6, ny + 6, fill=color, outline="")
-        self.particulas_confeti = nuevas
-        if nuevas:
-            self.raiz.after(30, self._animar_confeti)
+        if self.confeti.paso():
+            self.planificador.despues("confeti", 0.03, self._animar_confeti)
 
 
 def main() -> None:
-    raiz = tk.Tk()
-    AplicacionJuego(raiz)
-    raiz.mainloop()
+    parser = argparse.ArgumentParser(description="Juego de Historia Universal (interfaz gráfica).")
+    parser.add_argument(
+        "--perfil",
+        type=Path,
+        default=os.environ.get(VARIABLE_PERFIL) or None,
+        help="agrega a este archivo JSON por líneas los tiempos de los puntos críticos",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        default=os.environ.get(VARIABLE_CPROFILE) or None,
+        help="guarda en este archivo el perfil de cProfile de la sesión",
+    )
+    parser.add_argument(
+        "--eventos",
+        type=Path,
+        default=os.environ.get(VARIABLE_EVENTOS) or ARCHIVO_EVENTOS,
+        help="archivo JSON por líneas donde se anotan las respuestas y comodines",
+    )
+    parser.add_argument("--sin-eventos", action="store_true", help="no anota eventos de juego")
+    argumentos = parser.parse_args()
+
+    perfil = None
+    if argumentos.perfil:
+        perfil = Perfil()
+        perfil.instrumentar(AplicacionJuego, PUNTOS_CRITICOS)
+        perfil.instrumentar(EscrituraDiferida, PUNTOS_CRITICOS_GUARDADOS)
+    perfilador = None
+    if argumentos.cprofile:
+        import cProfile
+
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+    try:
+        raiz = tk.Tk()
+        AplicacionJuego(raiz, None if argumentos.sin_eventos else crear_registro_eventos(argumentos.eventos))
+        raiz.mainloop()
+    finally:
+        if perfilador is not None:
+            perfilador.disable()
+            perfilador.dump_stats(argumentos.cprofile)
+        if perfil is not None:
+            perfil.exportar(argumentos.perfil)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+"""Banco de preguntas compartido por las interfaces del juego.
+
+Las preguntas viven en archivos JSON dentro de ``datos/`` (uno por categoría
+o período) y un manifiesto pequeño describe qué archivos existen. Al iniciar
+solo se lee el manifiesto; las preguntas de cada categoría se cargan la
+primera vez que se consultan.
+
+Cada ``Pregunta`` es un registro inmutable que guarda la respuesta como el
+índice de la opción correcta, y las categorías guardan sus preguntas por
+columnas (``ColumnasPreguntas``): un bloque de texto, tablas de números y
+cada opción distinta una sola vez.
+
+Las preguntas especiales (las de mitos y leyendas que dan una vida extra)
+están en ``datos/categorias/especiales.json``, agrupadas por categoría y con
+un ``peso`` opcional. Se leen una sola vez, la primera vez que hacen falta,
+en un registro inmutable (``registro_especiales``).
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import random
+import re
+import sys
+import unicodedata
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+
+DIRECTORIO_DATOS = Path(__file__).resolve().parent / "datos"
+MANIFIESTO_CATEGORIAS = DIRECTORIO_DATOS / "categorias" / "manifiesto.json"
+MANIFIESTO_PERIODOS = DIRECTORIO_DATOS / "periodos" / "manifiesto.json"
+ARCHIVO_ESPECIALES = DIRECTORIO_DATOS / "categorias" / "especiales.json"
+
+_PALABRA = re.compile(r"\w+")
+_TILDES = re.compile(r"[\u0300-\u036f]")
+
+PALABRAS_VACIAS = frozenset(
+    """
+    a al algun alguna algunas alguno algunos ante aquel aquella cada como con cual cuales cuando cuanto cuantos de
+    del desde donde durante e el ella ellas ellos en entre era eran es esa ese eso esta estas este esto estos fue
+    fueron ha han hasta hay la las le les lo los mas muy no o para pero por que quien quienes se ser sin sobre son
+    su sus tras un una uno unos unas y ya
+    """.split()
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Pregunta:
+    enunciado: str
+    opciones: tuple[str, ...]
+    indice_respuesta: int
+    retroalimentacion: str
+
+    @classmethod
+    def crear(cls, enunciado: str, opciones: Iterable[str], respuesta: str, retroalimentacion: str) -> Pregunta:
+        """Pregunta con la respuesta escrita como texto, como en los JSON de ``datos/``."""
+        # Las mismas opciones ("Egipto", "Roma") se repiten en muchas preguntas.
+        opciones = tuple(sys.intern(opcion) for opcion in opciones)
+        if respuesta not in opciones:
+            raise ValueError(f"La respuesta {respuesta!r} no está entre las opciones de {enunciado!r}.")
+        return cls(enunciado, opciones, opciones.index(respuesta), retroalimentacion)
+
+    @property
+    def respuesta(self) -> str:
+        return self.opciones[self.indice_respuesta]
+
+
+class ColumnasPreguntas(Sequence[Pregunta]):
+    """Preguntas de una categoría guardadas por columnas.
+
+    Enunciados y retroalimentaciones van en un solo bloque UTF-8 con sus
+    límites, cada opción distinta se guarda una vez y las preguntas la
+    nombran por número, y la respuesta ocupa un byte. La ``Pregunta`` se arma
+    al pedirla, así que una categoría grande ocupa poco más que su texto.
+    """
+
+    __slots__ = ("_textos", "_limites", "_opciones", "_inicios", "_numeros", "_respuestas")
+
+    def __init__(self, preguntas: Iterable[Pregunta]) -> None:
+        textos = bytearray()
+        self._limites = array("Q", [0])
+        self._opciones: list[str] = []
+        numeros_opciones: dict[str, int] = {}
+        self._inicios = array("Q", [0])
+        self._numeros = array("I")
+        self._respuestas = array("B")
+        for pregunta in preguntas:
+            for texto in (pregunta.enunciado, pregunta.retroalimentacion):
+                textos += texto.encode("utf-8")
+                self._limites.append(len(textos))
+            for opcion in pregunta.opciones:
+                numero = numeros_opciones.setdefault(opcion, len(self._opciones))
+                if numero == len(self._opciones):
+                    self._opciones.append(opcion)
+                self._numeros.append(numero)
+            self._inicios.append(len(self._numeros))
+            self._respuestas.append(pregunta.indice_respuesta)
+        self._textos = bytes(textos)
+
+    @classmethod
+    def desde_datos(cls, datos: list[dict]) -> ColumnasPreguntas:
+        return cls(_pregunta(item) for item in datos)
+
+    def __len__(self) -> int:
+        return len(self._respuestas)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[posicion] for posicion in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        inicio, medio, fin = self._limites[2 * indice : 2 * indice + 3]
+        opciones = self._opciones
+        return Pregunta(
+            self._textos[inicio:medio].decode("utf-8"),
+            tuple(opciones[numero] for numero in self._numeros[self._inicios[indice] : self._inicios[indice + 1]]),
+            self._respuestas[indice],
+            self._textos[medio:fin].decode("utf-8"),
+        )
+
+
+@dataclass
+class Categoria:
+    """Categoría cuyas preguntas se leen del disco en el primer acceso."""
+
+    nombre: str
+    descripcion: str
+    total: int
+    archivo: Path
+    _preguntas: ColumnasPreguntas | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def preguntas(self) -> ColumnasPreguntas:
+        if self._preguntas is None:
+            self._preguntas = ColumnasPreguntas.desde_datos(leer_json(self.archivo)["preguntas"])
+        return self._preguntas
+
+    @property
+    def cargada(self) -> bool:
+        return self._preguntas is not None
+
+
+@dataclass(frozen=True)
+class Especiales:
+    """Preguntas especiales de una categoría, elegidas al azar según su peso.
+
+    Usa el método alias: armar las tablas cuesta ``O(n)`` una vez y cada
+    elección es un número al azar y una comparación, sin importar cuántas
+    preguntas tenga la categoría.
+    """
+
+    preguntas: tuple[Pregunta, ...]
+    # Por casilla: probabilidad de quedarse con su pregunta y, si no, la otra.
+    probabilidades: tuple[float, ...]
+    alias: tuple[int, ...]
+
+    @classmethod
+    def desde_datos(cls, datos: list[dict]) -> Especiales:
+        pesos = [float(item.get("peso", 1)) for item in datos]
+        if not pesos or min(pesos) <= 0:
+            raise ValueError("Las preguntas especiales necesitan pesos positivos.")
+        total = len(pesos)
+        escala = total / sum(pesos)
+        probabilidades = [peso * escala for peso in pesos]
+        alias = list(range(total))
+        pequenas = [casilla for casilla, valor in enumerate(probabilidades) if valor < 1]
+        grandes = [casilla for casilla, valor in enumerate(probabilidades) if valor >= 1]
+        while pequenas and grandes:
+            pequena, grande = pequenas.pop(), grandes[-1]
+            alias[pequena] = grande
+            probabilidades[grande] -= 1 - probabilidades[pequena]
+            if probabilidades[grande] < 1:
+                pequenas.append(grandes.pop())
+        # Lo que sobra es 1 salvo por redondeo.
+        for casilla in pequenas + grandes:
+            probabilidades[casilla] = 1.0
+        return cls(tuple(leer_preguntas(datos)), tuple(probabilidades), tuple(alias))
+
+    def __len__(self) -> int:
+        return len(self.preguntas)
+
+    def elegir(self, azar: random.Random) -> Pregunta:
+        valor = azar.random() * len(self.preguntas)
+        casilla = int(valor)
+        if valor - casilla < self.probabilidades[casilla]:
+            return self.preguntas[casilla]
+        return self.preguntas[self.alias[casilla]]
+
+    def indice(self, pregunta: Pregunta) -> int:
+        return self.preguntas.index(pregunta)
+
+
+def leer_json(ruta: Path) -> dict:
+    with ruta.open("r", encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def _pregunta(item: dict) -> Pregunta:
+    return Pregunta.crear(item["enunciado"], item["opciones"], item["respuesta"], item["retroalimentacion"])
+
+
+def leer_preguntas(datos: list[dict]) -> list[Pregunta]:
+    return [_pregunta(item) for item in datos]
+
+
+def normalizar(texto: str) -> list[str]:
+    """Palabras en minúsculas, sin tildes ni palabras vacías."""
+    texto = texto.casefold()
+    if not texto.isascii():
+        texto = _TILDES.sub("", unicodedata.normalize("NFKD", texto))
+    return [palabra for palabra in _PALABRA.findall(texto) if palabra not in PALABRAS_VACIAS]
+
+
+def leer_especiales(ruta: Path = ARCHIVO_ESPECIALES) -> Mapping[str, Especiales]:
+    """Especiales de cada categoría; las categorías sin especiales no aparecen."""
+    especiales = leer_json(ruta)["especiales"]
+    return MappingProxyType({nombre: Especiales.desde_datos(datos) for nombre, datos in especiales.items() if datos})
+
+
+@functools.cache
+def registro_especiales() -> Mapping[str, Especiales]:
+    """Registro compartido de ``datos/``: se lee una sola vez por proceso."""
+    return leer_especiales()
+
+
+def leer_manifiesto_categorias(ruta: Path = MANIFIESTO_CATEGORIAS) -> list[Categoria]:
+    """Lee solo el manifiesto; ninguna pregunta se carga todavía."""
+    manifiesto = leer_json(ruta)
+    return [
+        Categoria(
+            nombre=entrada["nombre"],
+            descripcion=entrada.get("descripcion", ""),
+            total=entrada["total"],
+            archivo=ruta.parent / entrada["archivo"],
+        )
+        for entrada in manifiesto["categorias"]
+    ]
+
+
+def fuentes_del_banco() -> Iterator[tuple[Path, str]]:
+    """Archivo y nombre de cada categoría y cada período de los manifiestos, y las especiales."""
+    for manifiesto, clave in ((MANIFIESTO_CATEGORIAS, "categorias"), (MANIFIESTO_PERIODOS, "periodos")):
+        for entrada in leer_json(manifiesto)[clave]:
+            yield manifiesto.parent / entrada["archivo"], entrada["nombre"]
+    yield ARCHIVO_ESPECIALES, "Especiales"
+
+
+def grupos_de_fuente(nombre: str, datos: dict) -> list[tuple[str, list[dict]]]:
+    """Grupos de preguntas de un archivo: la categoría y sus difíciles, cada nivel de un período o las especiales."""
+    if "especiales" in datos:
+        return [(f"{categoria} (especiales)", preguntas) for categoria, preguntas in datos["especiales"].items()]
+    if "niveles" in datos:
+        return [(f"{nombre} / {nivel['nombre']}", nivel["preguntas"]) for nivel in datos["niveles"]]
+    grupos = [(nombre, datos["preguntas"])]
+    if datos.get("preguntas_dificiles"):
+        grupos.append((f"{nombre} (difíciles)", datos["preguntas_dificiles"]))
+    return grupos
@@ -0,0 +1,368 @@
+"""Mediciones de rendimiento reproducibles del juego.
+
+Uso::
+
+    python benchmark.py --salida resultados.json
+    xvfb-run python benchmark.py --salida resultados.json
+
+Mide la importación en frío y el arranque de ``app_gui`` y ``main`` (cada
+repetición en un intérprete nuevo), el costo de ``cargar_categorias()``, el
+ritmo de ``_guardar_con_nombre()`` con archivos de 10 a 100 000 partidas y la
+latencia de ``_actualizar_panel()`` y ``_animar_confeti()``, y la memoria que
+ocupa un banco de 100 000 preguntas (como lista de ``Pregunta`` y como
+``ColumnasPreguntas``, que es como lo guardan las categorías). Las mediciones
+de la ventana necesitan una pantalla (real o virtual, como ``xvfb-run``); sin
+ella esas secciones quedan marcadas como omitidas y el resto se mide igual.
+
+El resultado es un JSON con los tiempos en milisegundos (mínimo, mediana,
+p95, máximo y media) para comparar versiones antes de llevarlas a los
+laboratorios. Las partidas se escriben en un directorio temporal.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import app_gui
+import confeti
+from banco import ColumnasPreguntas, leer_preguntas
+from guardados import ESQUEMA, VARIABLE_ALMACEN, crear_almacen
+
+DIRECTORIO = Path(__file__).resolve().parent
+TAMANOS_GUARDADO = [10, 100, 1_000, 10_000, 100_000]
+PREGUNTAS_MEMORIA = 100_000
+SEMILLA = 1234
+
+CODIGO_IMPORTACION = """
+import time
+inicio = time.perf_counter()
+import {modulo}
+print(time.perf_counter() - inicio)
+"""
+
+CODIGO_ARRANQUE = {
+    "main": """
+import time
+inicio = time.perf_counter()
+import main
+main.construir_periodos()
+print(time.perf_counter() - inicio)
+""",
+    "app_gui": """
+import tempfile, time
+from pathlib import Path
+inicio = time.perf_counter()
+import app_gui
+app_gui.ARCHIVO_GUARDADO = Path(tempfile.mkdtemp()) / "partidas.json"
+raiz = app_gui.tk.Tk()
+aplicacion = app_gui.AplicacionJuego(raiz)
+raiz.update()
+print(time.perf_counter() - inicio)
+aplicacion.cerrar()
+""",
+}
+
+
+def resumir(segundos: list[float]) -> dict:
+    """Resumen en milisegundos de una lista de muestras en segundos."""
+    muestras = sorted(valor * 1000 for valor in segundos)
+    return {
+        "muestras": len(muestras),
+        "minimo_ms": round(muestras[0], 4),
+        "mediana_ms": round(statistics.median(muestras), 4),
+        "p95_ms": round(muestras[min(len(muestras) - 1, int(len(muestras) * 0.95))], 4),
+        "maximo_ms": round(muestras[-1], 4),
+        "media_ms": round(statistics.fmean(muestras), 4),
+    }
+
+
+def hay_pantalla() -> bool:
+    try:
+        raiz = app_gui.tk.Tk()
+    except app_gui.tk.TclError:
+        return False
+    raiz.destroy()
+    return True
+
+
+def _ejecutar(codigo: str) -> float:
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=DIRECTORIO, capture_output=True, text=True, check=True
+    )
+    return float(salida.stdout.split()[0])
+
+
+def medir_arranque(repeticiones: int, con_pantalla: bool) -> dict:
+    """Importación y arranque en un proceso nuevo por repetición (sin caché de módulos)."""
+    resultados = {}
+    for modulo in ("main", "app_gui"):
+        importacion = [_ejecutar(CODIGO_IMPORTACION.format(modulo=modulo)) for _ in range(repeticiones)]
+        resultados[modulo] = {"importacion": resumir(importacion)}
+        if modulo == "app_gui" and not con_pantalla:
+            resultados[modulo]["arranque"] = {"omitido": "sin pantalla"}
+            continue
+        arranque = [_ejecutar(CODIGO_ARRANQUE[modulo]) for _ in range(repeticiones)]
+        resultados[modulo]["arranque"] = resumir(arranque)
+    return resultados
+
+
+def medir_categorias(repeticiones: int) -> dict:
+    manifiesto = []
+    completas = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        categorias = app_gui.cargar_categorias()
+        manifiesto.append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        for categoria in categorias:
+            categoria.preguntas
+        completas.append(time.perf_counter() - inicio)
+    return {"cargar_categorias": resumir(manifiesto), "primera_lectura_preguntas": resumir(completas)}
+
+
+def _banco_sintetico(cantidad: int) -> str:
+    """JSON con las preguntas de las categorías repetidas hasta ``cantidad``, cada una con textos propios."""
+    base = [pregunta for categoria in app_gui.cargar_categorias() for pregunta in categoria.preguntas]
+    preguntas = []
+    for indice in range(cantidad):
+        pregunta = base[indice % len(base)]
+        preguntas.append(
+            {
+                "enunciado": f"{pregunta.enunciado} ({indice})",
+                "opciones": list(pregunta.opciones),
+                "respuesta": pregunta.respuesta,
+                "retroalimentacion": f"{pregunta.retroalimentacion} ({indice})",
+            }
+        )
+    return json.dumps(preguntas, ensure_ascii=False)
+
+
+def medir_memoria(cantidad: int) -> dict:
+    texto = _banco_sintetico(cantidad)
+    resultados: dict = {"preguntas": cantidad}
+    for nombre, leer in (("lista", leer_preguntas), ("columnas", ColumnasPreguntas.desde_datos)):
+        gc.collect()
+        tracemalloc.start()
+        # Los diccionarios del JSON se liberan al terminar: queda solo el banco.
+        preguntas = leer(json.loads(texto))
+        gc.collect()
+        ocupado = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        accesos = []
+        for indice in range(0, cantidad, max(1, cantidad // 1000)):
+            inicio = time.perf_counter()
+            preguntas[indice]
+            accesos.append(time.perf_counter() - inicio)
+        resultados[nombre] = {
+            "megabytes": round(ocupado / 1_000_000, 2),
+            "bytes_por_pregunta": round(ocupado / cantidad),
+            "acceso": resumir(accesos),
+        }
+        del preguntas
+    return resultados
+
+
+def _registro(indice: int) -> dict:
+    return {
+        "id": str(1000 + indice % 9000),
+        "nombre": f"jugador{indice:06d}",
+        "fecha": "01/01/2025 10:00",
+        "maximo_puntaje": indice % 200,
+        "version": ESQUEMA,
+        "estado": {
+            "indice_categoria": indice % 5,
+            "indice_pregunta": indice % 20,
+            "vidas": 3,
+            "puntaje": indice % 200,
+            "tiempo_limite": 30,
+            "tiempo_restante": 30,
+            "pregunta_especial": False,
+            "comodines": {"pista": 1, "saltar": 1, "investigar": 1, "eliminar": 1},
+            "dificultad": "normal",
+            "con_repaso": True,
+            "repasos": {},
+        },
+    }
+
+
+def _preparar_archivo(directorio: Path, tamano: int) -> Path:
+    ruta = directorio / f"partidas_{tamano}.json"
+    almacen = crear_almacen(ruta)
+    almacen.escribir_todos([_registro(indice) for indice in range(tamano)])
+    almacen.cerrar()
+    return ruta
+
+
+def _abrir_almacen(ruta: Path) -> float:
+    """Reinicia el almacén de ``app_gui`` sobre ``ruta`` y espera su carga completa."""
+    if app_gui._almacen is not None:
+        app_gui._almacen.cerrar()
+    app_gui._almacen = None
+    app_gui.ARCHIVO_GUARDADO = ruta
+    inicio = time.perf_counter()
+    almacen = app_gui.obtener_almacen()
+    while almacen.cargando:
+        time.sleep(0.001)
+    return time.perf_counter() - inicio
+
+
+def medir_guardado(tamanos: list[int], operaciones: int, aplicacion: app_gui.AplicacionJuego | None) -> dict:
+    """Ritmo de ``_guardar_con_nombre`` a medida que crece el archivo de partidas.
+
+    Sin pantalla se mide solo el trabajo de almacenamiento que hace el método
+    (buscar la partida existente y guardar el registro nuevo).
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as directorio:
+        for tamano in tamanos:
+            ruta = _preparar_archivo(Path(directorio), tamano)
+            carga = _abrir_almacen(ruta)
+            almacen = app_gui.obtener_almacen()
+            azar = random.Random(SEMILLA)
+            nombres = [f"jugador{azar.randrange(tamano):06d}" for _ in range(operaciones)]
+            muestras = []
+            for indice, nombre in enumerate(nombres):
+                inicio = time.perf_counter()
+                if aplicacion is not None:
+                    aplicacion._guardar_con_nombre(nombre)
+                else:
+                    existente = almacen.obtener(nombre)
+                    registro = dict(existente or _registro(indice), fecha=datetime.now().strftime("%d/%m/%Y %H:%M"))
+                    almacen.guardar(registro)
+                muestras.append(time.perf_counter() - inicio)
+            inicio = time.perf_counter()
+            almacen.descargar()
+            descarga = time.perf_counter() - inicio
+            total = sum(muestras)
+            resultados[str(tamano)] = {
+                "modo": "interfaz" if aplicacion is not None else "almacen",
+                "carga_inicial_ms": round(carga * 1000, 4),
+                "guardar": resumir(muestras),
+                "guardados_por_segundo": round(operaciones / total, 1) if total else None,
+                "descarga_final_ms": round(descarga * 1000, 4),
+                "escritura": almacen.estadisticas(),
+                "bytes_en_disco": sum(
+                    archivo.stat().st_size for archivo in Path(directorio).glob(f"{ruta.stem}*") if archivo.is_file()
+                ),
+            }
+            app_gui._almacen.cerrar()
+            app_gui._almacen = None
+    return resultados
+
+
+def medir_interfaz(aplicacion: app_gui.AplicacionJuego, repeticiones: int) -> dict:
+    raiz = aplicacion.raiz
+    panel = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        aplicacion._actualizar_panel()
+        raiz.update_idletasks()
+        panel.append(time.perf_counter() - inicio)
+        aplicacion.motor.indice_pregunta = (aplicacion.motor.indice_pregunta + 1) % aplicacion.motor.categoria.total
+
+    # Respuestas correctas seguidas: la latencia va del clic a la pregunta siguiente en pantalla.
+    aplicacion.latencias_respuesta_ms.clear()
+    for _ in range(repeticiones):
+        pregunta = aplicacion.motor.pregunta_actual
+        if pregunta is None:
+            aplicacion.seleccionar_categoria(aplicacion.motor.indice_categoria)
+            pregunta = aplicacion.motor.pregunta_actual
+        aplicacion.responder(pregunta.indice_respuesta)
+        raiz.update_idletasks()
+    respuesta = aplicacion.resumen_latencias()
+
+    confeti = {}
+    for particulas in (40, 200, 1000):
+        aplicacion.confeti.lanzar(particulas, raiz.winfo_width() or 800)
+        cuadros = []
+        while aplicacion.confeti.cantidad_activa:
+            inicio = time.perf_counter()
+            aplicacion._animar_confeti()
+            raiz.update_idletasks()
+            cuadros.append(time.perf_counter() - inicio)
+            # Los cuadros se avanzan aquí, sin esperar al temporizador de la ventana.
+            aplicacion.planificador.cancelar("confeti")
+        confeti[str(particulas)] = resumir(cuadros)
+    return {"actualizar_panel": resumir(panel), "responder": respuesta, "animar_confeti": confeti}
+
+
+def crear_aplicacion(directorio: Path) -> app_gui.AplicacionJuego:
+    random.seed(SEMILLA)
+    app_gui.ARCHIVO_GUARDADO = directorio / "partidas.json"
+    raiz = app_gui.tk.Tk()
+    aplicacion = app_gui.AplicacionJuego(raiz)
+    # Perder el foco de la ventana no debe contar como salir a investigar.
+    raiz.unbind("<FocusOut>")
+    raiz.unbind("<Unmap>")
+    aplicacion.motor.azar.seed(SEMILLA)
+    aplicacion.entrada_nombre.delete(0, app_gui.tk.END)
+    raiz.update()
+    return aplicacion
+
+
+def ejecutar(repeticiones: int, tamanos: list[int], operaciones: int, preguntas: int = PREGUNTAS_MEMORIA) -> dict:
+    con_pantalla = hay_pantalla()
+    resultados = {
+        "arranque": medir_arranque(repeticiones, con_pantalla),
+        "categorias": medir_categorias(repeticiones),
+        "memoria": medir_memoria(preguntas),
+    }
+    with tempfile.TemporaryDirectory() as directorio:
+        aplicacion = crear_aplicacion(Path(directorio)) if con_pantalla else None
+        resultados["guardado"] = medir_guardado(tamanos, operaciones, aplicacion)
+        if aplicacion is not None:
+            _abrir_almacen(Path(directorio) / "partidas.json")
+            resultados["interfaz"] = medir_interfaz(aplicacion, repeticiones * 10)
+            aplicacion.cerrar()
+        else:
+            resultados["interfaz"] = {"omitido": "sin pantalla"}
+    return {
+        "version": 1,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "almacen": os.environ.get(VARIABLE_ALMACEN, "diario"),
+        "numpy": confeti.np is not None,
+        "pantalla": con_pantalla,
+        "parametros": {"repeticiones": repeticiones, "tamanos": tamanos, "operaciones": operaciones, "preguntas": preguntas},
+        "resultados": resultados,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide el rendimiento del juego y escribe un JSON.")
+    parser.add_argument("--salida", type=Path, help="archivo JSON de salida (por defecto, la consola)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument(
+        "--tamanos",
+        default=",".join(str(tamano) for tamano in TAMANOS_GUARDADO),
+        help="cantidades de partidas guardadas separadas por comas",
+    )
+    parser.add_argument("--operaciones", type=int, default=200, help="guardados medidos por cada tamaño")
+    parser.add_argument("--preguntas", type=int, default=PREGUNTAS_MEMORIA, help="tamaño del banco para medir la memoria")
+    argumentos = parser.parse_args()
+
+    tamanos = [int(valor) for valor in argumentos.tamanos.split(",") if valor]
+    informe = ejecutar(argumentos.repeticiones, tamanos, argumentos.operaciones, argumentos.preguntas)
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if argumentos.salida:
+        argumentos.salida.write_text(texto + "\n", encoding="utf-8")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
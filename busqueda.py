@@ -0,0 +1,233 @@
+"""Búsqueda por palabras en el banco de preguntas de ``datos/``.
+
+Uso::
+
+    python busqueda.py Bolívar
+    python busqueda.py "imperio roma" --limite 5
+    python busqueda.py eufrates --json
+
+El índice invertido es una tabla FTS5 de SQLite guardada en
+``datos/.busqueda.db`` que cubre el enunciado, las opciones y la
+retroalimentación de cada pregunta. El tokenizador ``unicode61`` con
+``remove_diacritics`` ignora mayúsculas y tildes, así que "ATENAS" encuentra
+"Atenas" y "Eufrates" encuentra "Éufrates". Cada palabra de la consulta busca
+también las que empiezan por ella ("roma" encuentra "romano") y los resultados
+se ordenan por relevancia (BM25), pesando más el enunciado que las opciones y
+estas más que la retroalimentación.
+
+El índice se construye la primera vez y después se actualiza por archivo:
+solo se vuelve a indexar un archivo de ``datos/`` si cambió su contenido
+(huella SHA-256, que solo se calcula si cambió su fecha o tamaño).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from banco import DIRECTORIO_DATOS, Pregunta, fuentes_del_banco, grupos_de_fuente, leer_preguntas, normalizar
+
+RUTA_INDICE = DIRECTORIO_DATOS / ".busqueda.db"
+VERSION_INDICE = 1
+LIMITE = 20
+# Pesos de BM25 para enunciado, opciones y retroalimentación.
+PESOS = (3.0, 2.0, 1.0)
+
+
+@dataclass
+class Resultado:
+    grupo: str
+    indice: int
+    pregunta: Pregunta
+
+    def como_dict(self) -> dict:
+        return {
+            "grupo": self.grupo,
+            "indice": self.indice,
+            "enunciado": self.pregunta.enunciado,
+            "opciones": self.pregunta.opciones,
+            "respuesta": self.pregunta.respuesta,
+            "retroalimentacion": self.pregunta.retroalimentacion,
+        }
+
+
+@dataclass
+class Tema:
+    """Preguntas encontradas por una búsqueda, jugables como una categoría."""
+
+    nombre: str
+    preguntas: list[Pregunta]
+    # Grupo e índice de cada pregunta en el banco (como en ``Resultado``),
+    # para que los eventos de la práctica nombren la pregunta original.
+    ubicaciones: list[tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.preguntas)
+
+
+def consulta_fts(texto: str) -> str:
+    """Convierte el texto del usuario en una consulta FTS5 segura (todas las palabras, por prefijo).
+
+    Las palabras vacías ("qué", "de") se descartan: aparecen en casi todas
+    las preguntas y solo harían más lenta la búsqueda.
+    """
+    return " AND ".join(f'"{palabra}"*' for palabra in normalizar(texto))
+
+
+def _firma(ruta: Path) -> str:
+    estadistica = ruta.stat()
+    return f"{estadistica.st_mtime_ns}:{estadistica.st_size}"
+
+
+class IndiceBusqueda:
+    def __init__(self, ruta: Path = RUTA_INDICE) -> None:
+        self.ruta = ruta
+        self._conexion = sqlite3.connect(ruta, isolation_level=None)
+        if self._conexion.execute("PRAGMA user_version").fetchone()[0] != VERSION_INDICE:
+            self._crear()
+
+    def _crear(self) -> None:
+        self._conexion.executescript(
+            f"""
+            DROP TABLE IF EXISTS fuentes;
+            DROP TABLE IF EXISTS preguntas;
+            DROP TABLE IF EXISTS texto;
+            CREATE TABLE fuentes (archivo TEXT PRIMARY KEY, firma TEXT NOT NULL, huella TEXT NOT NULL);
+            CREATE TABLE preguntas (
+                id INTEGER PRIMARY KEY,
+                archivo TEXT NOT NULL,
+                grupo TEXT NOT NULL,
+                indice INTEGER NOT NULL,
+                datos TEXT NOT NULL
+            );
+            CREATE INDEX idx_preguntas_archivo ON preguntas (archivo);
+            -- La fila de ``texto`` tiene el mismo rowid que su pregunta.
+            CREATE VIRTUAL TABLE texto USING fts5(
+                enunciado, opciones, retroalimentacion,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            );
+            PRAGMA user_version = {VERSION_INDICE};
+            """
+        )
+
+    def actualizar(self, forzar: bool = False) -> list[str]:
+        """Indexa los archivos de ``datos/`` que cambiaron; devuelve sus nombres."""
+        conexion = self._conexion
+        previas = {archivo: (firma, huella) for archivo, firma, huella in conexion.execute("SELECT * FROM fuentes")}
+        cambiados = []
+        conexion.execute("BEGIN")
+        try:
+            vigentes = set()
+            for ruta, nombre in fuentes_del_banco():
+                archivo = ruta.relative_to(DIRECTORIO_DATOS).as_posix() if ruta.is_relative_to(DIRECTORIO_DATOS) else str(ruta)
+                vigentes.add(archivo)
+                firma = _firma(ruta)
+                previa = previas.get(archivo)
+                if not forzar and previa and previa[0] == firma:
+                    continue
+                contenido = ruta.read_bytes()
+                huella = hashlib.sha256(contenido).hexdigest()
+                conexion.execute("INSERT OR REPLACE INTO fuentes VALUES (?, ?, ?)", (archivo, firma, huella))
+                if not forzar and previa and previa[1] == huella:
+                    continue
+                self._quitar(archivo)
+                self._indexar(archivo, nombre, json.loads(contenido))
+                cambiados.append(archivo)
+            for archivo in previas.keys() - vigentes:
+                self._quitar(archivo)
+                conexion.execute("DELETE FROM fuentes WHERE archivo = ?", (archivo,))
+                cambiados.append(archivo)
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+        return cambiados
+
+    def _quitar(self, archivo: str) -> None:
+        self._conexion.execute("DELETE FROM texto WHERE rowid IN (SELECT id FROM preguntas WHERE archivo = ?)", (archivo,))
+        self._conexion.execute("DELETE FROM preguntas WHERE archivo = ?", (archivo,))
+
+    def _indexar(self, archivo: str, nombre: str, datos: dict) -> None:
+        for grupo, preguntas in grupos_de_fuente(nombre, datos):
+            for indice, pregunta in enumerate(preguntas):
+                cursor = self._conexion.execute(
+                    "INSERT INTO preguntas (archivo, grupo, indice, datos) VALUES (?, ?, ?, ?)",
+                    (archivo, grupo, indice, json.dumps(pregunta, ensure_ascii=False)),
+                )
+                self._conexion.execute(
+                    "INSERT INTO texto (rowid, enunciado, opciones, retroalimentacion) VALUES (?, ?, ?, ?)",
+                    (
+                        cursor.lastrowid,
+                        pregunta["enunciado"],
+                        "\n".join(pregunta["opciones"]),
+                        pregunta["retroalimentacion"],
+                    ),
+                )
+
+    def buscar(self, texto: str, limite: int = LIMITE) -> list[Resultado]:
+        consulta = consulta_fts(texto)
+        if not consulta:
+            return []
+        filas = self._conexion.execute(
+            f"""
+            SELECT preguntas.grupo, preguntas.indice, preguntas.datos
+            FROM texto JOIN preguntas ON preguntas.id = texto.rowid
+            WHERE texto MATCH ?
+            ORDER BY bm25(texto, {", ".join(str(peso) for peso in PESOS)})
+            LIMIT ?
+            """,
+            (consulta, limite),
+        ).fetchall()
+        return [
+            Resultado(grupo=grupo, indice=indice, pregunta=leer_preguntas([json.loads(datos)])[0])
+            for grupo, indice, datos in filas
+        ]
+
+    def tema(self, texto: str, limite: int = LIMITE) -> Tema:
+        resultados = self.buscar(texto, limite)
+        return Tema(
+            nombre=f"Tema: {texto.strip()}",
+            preguntas=[resultado.pregunta for resultado in resultados],
+            ubicaciones=[(resultado.grupo, resultado.indice) for resultado in resultados],
+        )
+
+    def cerrar(self) -> None:
+        self._conexion.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Busca preguntas del banco por palabras.")
+    parser.add_argument("consulta", nargs="*", help="palabras a buscar (sin importar tildes ni mayúsculas)")
+    parser.add_argument("--limite", type=int, default=LIMITE)
+    parser.add_argument("--json", action="store_true", help="escribe los resultados en JSON")
+    parser.add_argument("--reconstruir", action="store_true", help="vuelve a indexar todo el banco")
+    argumentos = parser.parse_args()
+
+    indice = IndiceBusqueda()
+    try:
+        cambiados = indice.actualizar(forzar=argumentos.reconstruir)
+        if cambiados and not argumentos.json:
+            print(f"Índice actualizado: {', '.join(cambiados)}")
+        if not argumentos.consulta:
+            return
+        resultados = indice.buscar(" ".join(argumentos.consulta), argumentos.limite)
+    finally:
+        indice.cerrar()
+
+    if argumentos.json:
+        print(json.dumps([resultado.como_dict() for resultado in resultados], indent=2, ensure_ascii=False))
+        return
+    if not resultados:
+        print("No se encontraron preguntas.")
+    for resultado in resultados:
+        print(f"[{resultado.grupo} #{resultado.indice + 1}] {resultado.pregunta.enunciado} → {resultado.pregunta.respuesta}")
+
+
+if __name__ == "__main__":
+    main()
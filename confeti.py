@@ -0,0 +1,119 @@
+"""Motor de partículas para el confeti de la interfaz gráfica.
+
+Los óvalos del lienzo se crean una sola vez y se reciclan: una partícula que
+sale del lienzo se oculta y su óvalo queda libre para el siguiente disparo.
+La altura, la velocidad vertical y la clase de velocidad de cada partícula
+viven en arreglos compactos (NumPy si está instalado, ``array`` de la
+biblioteca estándar si no) que se actualizan de una vez en cada cuadro; la
+posición horizontal no hace falta porque solo importa cuándo sale por abajo.
+
+Como las velocidades son enteras y pocas, cada óvalo lleva la etiqueta de su
+velocidad y el lienzo mueve todos los de una misma etiqueta con una sola
+llamada a ``move``: el costo por cuadro en Tk depende de la cantidad de
+velocidades distintas, no de la cantidad de partículas.
+"""
+
+from __future__ import annotations
+
+import random
+import tkinter as tk
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional.
+    np = None
+
+COLORES = ["#6366f1", "#38bdf8", "#f472b6", "#22c55e"]
+VELOCIDADES_X = range(-3, 4)
+VELOCIDADES_Y = range(2, 7)
+TAMANO = 6
+
+
+def _clase_velocidad(dx: int, dy: int) -> int:
+    return (dx - VELOCIDADES_X.start) * len(VELOCIDADES_Y) + (dy - VELOCIDADES_Y.start)
+
+
+class MotorConfeti:
+    def __init__(self, lienzo: tk.Canvas, alto: int) -> None:
+        self.lienzo = lienzo
+        self.alto = alto
+        self.items: list[int] = []
+        self.libres: list[int] = []
+        self.clases = array("b")
+        self.y = self._arreglo([])
+        self.dy = self._arreglo([])
+        self.activos = self._mascara([])
+        self.velocidades = [(dx, dy) for dx in VELOCIDADES_X for dy in VELOCIDADES_Y]
+        self.por_clase = [0] * len(self.velocidades)
+
+    @staticmethod
+    def _arreglo(valores: list[float]):
+        return np.array(valores, dtype=np.float32) if np is not None else array("f", valores)
+
+    @staticmethod
+    def _mascara(valores: list[bool]):
+        return np.array(valores, dtype=bool) if np is not None else bytearray(valores)
+
+    @property
+    def cantidad_activa(self) -> int:
+        return sum(self.por_clase)
+
+    def _crecer(self, cantidad: int) -> None:
+        nuevos = [
+            self.lienzo.create_oval(0, 0, TAMANO, TAMANO, outline="", state="hidden") for _ in range(cantidad)
+        ]
+        self.libres.extend(range(len(self.items) + len(nuevos) - 1, len(self.items) - 1, -1))
+        self.items.extend(nuevos)
+        self.clases.extend([0] * cantidad)
+        if np is not None:
+            self.y = np.concatenate([self.y, np.zeros(cantidad, dtype=np.float32)])
+            self.dy = np.concatenate([self.dy, np.zeros(cantidad, dtype=np.float32)])
+            self.activos = np.concatenate([self.activos, np.zeros(cantidad, dtype=bool)])
+        else:
+            self.y.extend([0.0] * cantidad)
+            self.dy.extend([0.0] * cantidad)
+            self.activos.extend(bytes(cantidad))
+
+    def lanzar(self, cantidad: int, ancho: int) -> None:
+        if len(self.libres) < cantidad:
+            self._crecer(cantidad - len(self.libres))
+        for _ in range(cantidad):
+            indice = self.libres.pop()
+            x = random.randint(0, ancho)
+            y = random.randint(0, 20)
+            dx = random.choice(VELOCIDADES_X)
+            dy = random.choice(VELOCIDADES_Y)
+            clase = _clase_velocidad(dx, dy)
+            item = self.items[indice]
+            self.lienzo.coords(item, x, y, x + TAMANO, y + TAMANO)
+            self.lienzo.itemconfigure(item, fill=random.choice(COLORES), state="normal", tags=(f"confeti{clase}",))
+            self.clases[indice] = clase
+            self.y[indice] = y
+            self.dy[indice] = dy
+            self.activos[indice] = True
+            self.por_clase[clase] += 1
+
+    def paso(self) -> bool:
+        """Avanza un cuadro; devuelve si quedan partículas visibles."""
+        for clase, cantidad in enumerate(self.por_clase):
+            if cantidad:
+                dx, dy = self.velocidades[clase]
+                self.lienzo.move(f"confeti{clase}", dx, dy)
+        if np is not None:
+            self.y += self.dy * self.activos
+            salientes = np.flatnonzero(self.activos & (self.y >= self.alto)).tolist()
+        else:
+            salientes = []
+            for indice, activo in enumerate(self.activos):
+                if activo:
+                    self.y[indice] += self.dy[indice]
+                    if self.y[indice] >= self.alto:
+                        salientes.append(indice)
+        for indice in salientes:
+            item = self.items[indice]
+            self.lienzo.itemconfigure(item, state="hidden", tags=())
+            self.activos[indice] = False
+            self.por_clase[self.clases[indice]] -= 1
+            self.libres.append(indice)
+        return self.cantidad_activa > 0
@@ -0,0 +1,252 @@
+"""Detección de preguntas casi duplicadas en el banco de ``datos/``.
+
+Uso::
+
+    python duplicados.py                      # grupos de casi duplicados de todo el banco
+    python duplicados.py --umbral 0.4 --json  # más tolerante y en JSON
+    python duplicados.py --pregunta "¿Quién esculpió el David?" --opcion "Miguel Ángel"
+
+Cada pregunta se reduce a un conjunto de "tejas": los pares de palabras
+del enunciado (sin tildes ni palabras vacías) y cada opción como
+frase completa, con la respuesta marcada aparte. Dos preguntas se parecen
+según el índice de Jaccard de sus conjuntos.
+
+Para no comparar todas contra todas, cada conjunto se resume en una firma
+MinHash de ``PERMUTACIONES`` valores calculada con una sola función hash
+(cada teja cae en una casilla y la casilla guarda el mínimo; las casillas
+vacías toman prestado el valor de la siguiente llena). La firma se corta en
+``BANDAS`` bandas y cada banda va a una tabla hash (LSH): solo las preguntas
+que coinciden en alguna banda son candidatas, y a esas se les calcula el
+Jaccard exacto. Agregar o consultar una pregunta cuesta casi lo mismo sin
+importar el tamaño del banco, así que revisar una pregunta nueva es
+incremental: 100 000 preguntas se revisan en unos segundos.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from banco import Pregunta, fuentes_del_banco, grupos_de_fuente, leer_json, leer_preguntas, normalizar
+
+PERMUTACIONES = 32
+BANDAS = 16
+FILAS = PERMUTACIONES // BANDAS
+UMBRAL = 0.5
+_MASCARA = (1 << 64) - 1
+# Desplazamiento de una casilla vacía según su distancia a la casilla llena.
+_DESPLAZAMIENTOS = [distancia * 0x9E3779B97F4A7C15 << 64 for distancia in range(PERMUTACIONES + 1)]
+
+
+def tejas(pregunta: Pregunta) -> frozenset[str]:
+    palabras = normalizar(pregunta.enunciado)
+    # Pares de palabras y no palabras sueltas: una palabra común ("guerra",
+    # "imperio") haría candidatas a miles de preguntas sin relación.
+    conjunto = {f"{anterior} {siguiente}" for anterior, siguiente in zip(palabras, palabras[1:])} or set(palabras)
+    conjunto.update("o:" + " ".join(normalizar(opcion)) for opcion in pregunta.opciones)
+    if pregunta.opciones:
+        conjunto.add("r:" + " ".join(normalizar(pregunta.respuesta)))
+    return frozenset(conjunto)
+
+
+def jaccard(primero: frozenset[str], segundo: frozenset[str]) -> float:
+    if not primero and not segundo:
+        return 1.0
+    comunes = len(primero & segundo)
+    return comunes / (len(primero) + len(segundo) - comunes)
+
+
+@dataclass(frozen=True)
+class Referencia:
+    """Ubicación de una pregunta en el banco."""
+
+    grupo: str
+    indice: int
+    enunciado: str
+
+    def como_dict(self) -> dict:
+        return {"grupo": self.grupo, "indice": self.indice, "enunciado": self.enunciado}
+
+
+@dataclass
+class IndiceDuplicados:
+    umbral: float = UMBRAL
+    referencias: list[Referencia] = field(default_factory=list)
+    conjuntos: list[frozenset[str]] = field(default_factory=list)
+    # Una tabla por banda: valor de la banda -> posición de la pregunta, o
+    # lista de posiciones si varias coinciden (casi todas las cubetas tienen
+    # una sola y así no se crea una lista por cada una).
+    cubetas: list[dict[int, int | list[int]]] = field(default_factory=lambda: [{} for _ in range(BANDAS)])
+
+    def __len__(self) -> int:
+        return len(self.referencias)
+
+    @staticmethod
+    def firma(conjunto: frozenset[str]) -> list[int]:
+        """MinHash de una sola permutación con densificación por rotación."""
+        casillas = [-1] * PERMUTACIONES
+        for teja in conjunto:
+            # Las firmas solo se comparan dentro de una ejecución, así que
+            # basta con hash() aunque cambie de una ejecución a otra.
+            valor, casilla = divmod(hash(teja) & _MASCARA, PERMUTACIONES)
+            actual = casillas[casilla]
+            if actual < 0 or valor < actual:
+                casillas[casilla] = valor
+        primera = next((posicion for posicion, valor in enumerate(casillas) if valor >= 0), None)
+        if primera is None:
+            return casillas
+        # Cada casilla vacía copia la siguiente llena (circularmente) más un
+        # desplazamiento según la distancia, igual en cualquier conjunto.
+        firma = casillas[:]
+        prestado = casillas[primera]
+        distancia = primera
+        for posicion in range(PERMUTACIONES - 1, -1, -1):
+            valor = casillas[posicion]
+            if valor >= 0:
+                prestado = valor
+                distancia = 0
+            else:
+                distancia += 1
+                firma[posicion] = prestado + _DESPLAZAMIENTOS[distancia]
+        return firma
+
+    @staticmethod
+    def _bandas(firma: list[int]) -> list[int]:
+        return [hash(banda) for banda in zip(*[iter(firma)] * FILAS)]
+
+    def _similares(self, conjunto: frozenset[str], bandas: list[int]) -> list[tuple[int, float]]:
+        candidatas: set[int] = set()
+        for cubetas, clave in zip(self.cubetas, bandas):
+            cubeta = cubetas.get(clave)
+            if cubeta is None:
+                continue
+            if isinstance(cubeta, int):
+                candidatas.add(cubeta)
+            else:
+                candidatas.update(cubeta)
+        similares = []
+        for posicion in candidatas:
+            similitud = jaccard(conjunto, self.conjuntos[posicion])
+            if similitud >= self.umbral:
+                similares.append((posicion, similitud))
+        similares.sort(key=lambda par: (-par[1], par[0]))
+        return similares
+
+    def buscar(self, pregunta: Pregunta) -> list[tuple[Referencia, float]]:
+        """Preguntas del índice parecidas a ``pregunta``, sin agregarla."""
+        conjunto = tejas(pregunta)
+        similares = self._similares(conjunto, self._bandas(self.firma(conjunto)))
+        return [(self.referencias[posicion], similitud) for posicion, similitud in similares]
+
+    def agregar(self, referencia: Referencia, pregunta: Pregunta) -> list[tuple[int, float]]:
+        """Indexa la pregunta y devuelve las posiciones de sus casi duplicados previos."""
+        conjunto = tejas(pregunta)
+        bandas = self._bandas(self.firma(conjunto))
+        similares = self._similares(conjunto, bandas)
+        posicion = len(self.referencias)
+        self.referencias.append(referencia)
+        self.conjuntos.append(conjunto)
+        for cubetas, clave in zip(self.cubetas, bandas):
+            cubeta = cubetas.get(clave)
+            if cubeta is None:
+                cubetas[clave] = posicion
+            elif isinstance(cubeta, int):
+                cubetas[clave] = [cubeta, posicion]
+            else:
+                cubeta.append(posicion)
+        return similares
+
+
+def preguntas_del_banco() -> Iterator[tuple[str, list[Pregunta]]]:
+    """Todos los grupos de ``datos/``: categorías (y sus difíciles) y niveles de período."""
+    for ruta, nombre in fuentes_del_banco():
+        for grupo, preguntas in grupos_de_fuente(nombre, leer_json(ruta)):
+            yield grupo, leer_preguntas(preguntas)
+
+
+def construir_indice(grupos, umbral: float = UMBRAL) -> tuple[IndiceDuplicados, list[tuple[int, int, float]]]:
+    """Indexa todos los grupos; devuelve el índice y los pares parecidos encontrados."""
+    indice = IndiceDuplicados(umbral=umbral)
+    pares = []
+    for grupo, preguntas in grupos:
+        for numero, pregunta in enumerate(preguntas):
+            posicion = len(indice)
+            similares = indice.agregar(Referencia(grupo, numero, pregunta.enunciado), pregunta)
+            pares.extend((anterior, posicion, similitud) for anterior, similitud in similares)
+    return indice, pares
+
+
+def agrupar(indice: IndiceDuplicados, pares: list[tuple[int, int, float]]) -> list[dict]:
+    """Une los pares en grupos (componentes conexas), los más grandes primero."""
+    padre: dict[int, int] = {}
+
+    def raiz(posicion: int) -> int:
+        padre.setdefault(posicion, posicion)
+        while padre[posicion] != posicion:
+            padre[posicion] = padre[padre[posicion]]
+            posicion = padre[posicion]
+        return posicion
+
+    for primero, segundo, _ in pares:
+        padre[raiz(primero)] = raiz(segundo)
+    miembros: dict[int, list[int]] = defaultdict(list)
+    for posicion in padre:
+        miembros[raiz(posicion)].append(posicion)
+    maxima: dict[int, float] = defaultdict(float)
+    for primero, _, similitud in pares:
+        maxima[raiz(primero)] = max(maxima[raiz(primero)], similitud)
+
+    grupos = []
+    for clave, posiciones in miembros.items():
+        referencias = [indice.referencias[posicion] for posicion in sorted(posiciones)]
+        grupos.append(
+            {
+                "similitud_maxima": round(maxima[clave], 3),
+                "entre_grupos": len({referencia.grupo for referencia in referencias}) > 1,
+                "preguntas": [referencia.como_dict() for referencia in referencias],
+            }
+        )
+    grupos.sort(key=lambda grupo: (-len(grupo["preguntas"]), -grupo["similitud_maxima"]))
+    return grupos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Busca preguntas casi duplicadas en datos/.")
+    parser.add_argument("--umbral", type=float, default=UMBRAL, help="similitud de Jaccard mínima (0 a 1)")
+    parser.add_argument("--json", action="store_true", help="escribe el informe en JSON")
+    parser.add_argument("--pregunta", help="solo revisa este enunciado contra el banco")
+    parser.add_argument("--opcion", action="append", default=[], help="opción de --pregunta (la primera es la respuesta)")
+    argumentos = parser.parse_args()
+
+    if argumentos.pregunta:
+        indice, _ = construir_indice(preguntas_del_banco(), argumentos.umbral)
+        opciones = argumentos.opcion
+        nueva = Pregunta(argumentos.pregunta, tuple(opciones), 0 if opciones else -1, "")
+        similares = [dict(referencia.como_dict(), similitud=round(similitud, 3)) for referencia, similitud in indice.buscar(nueva)]
+        if argumentos.json:
+            print(json.dumps(similares, indent=2, ensure_ascii=False))
+            return
+        if not similares:
+            print("No hay preguntas parecidas en el banco.")
+        for similar in similares:
+            print(f"{similar['similitud']:.2f}  [{similar['grupo']} #{similar['indice'] + 1}] {similar['enunciado']}")
+        return
+
+    indice, pares = construir_indice(preguntas_del_banco(), argumentos.umbral)
+    grupos = agrupar(indice, pares)
+    if argumentos.json:
+        print(json.dumps({"preguntas": len(indice), "umbral": argumentos.umbral, "grupos": grupos}, indent=2, ensure_ascii=False))
+        return
+    print(f"{len(indice)} preguntas revisadas, {len(grupos)} grupos de casi duplicados (umbral {argumentos.umbral}).")
+    for numero, grupo in enumerate(grupos, start=1):
+        alcance = "entre grupos" if grupo["entre_grupos"] else "mismo grupo"
+        print(f"\nGrupo {numero} ({alcance}, similitud máxima {grupo['similitud_maxima']:.2f}):")
+        for pregunta in grupo["preguntas"]:
+            print(f"  [{pregunta['grupo']} #{pregunta['indice'] + 1}] {pregunta['enunciado']}")
+
+
+if __name__ == "__main__":
+    main()
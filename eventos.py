@@ -0,0 +1,150 @@
+"""Registro de lo que hacen los jugadores, en archivos JSON por líneas rotativos.
+
+Cada evento (respuesta, pregunta perdida, comodín usado, partida perdida) es
+un diccionario pequeño que ``MotorJuego`` entrega a ``RegistroEventos.registrar``.
+Registrar solo lo agrega a una lista en memoria: un hilo escritor junta los
+eventos y los escribe en lotes cuando hay ``LOTE`` pendientes o pasaron
+``INTERVALO`` segundos, así ``responder`` nunca espera al disco.
+
+Los eventos van a ``eventos_juego.jsonl``. Cuando el archivo llegaría a su
+tamaño máximo se renombra a ``eventos_juego.1.jsonl`` (el ``.1`` anterior pasa
+a ``.2`` y así) y se empieza uno nuevo; el más viejo se borra. Entre todos los
+archivos nunca se supera ``limite_bytes``. Si el disco no da abasto y se
+acumulan más de ``MAXIMO_PENDIENTES`` eventos, los nuevos se descartan y se
+cuentan en ``estadisticas()``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import threading
+from pathlib import Path
+
+VARIABLE_EVENTOS = "JUEGO_EVENTOS"
+VARIABLE_LIMITE_EVENTOS = "JUEGO_EVENTOS_MB"
+LIMITE_MB = 20
+ARCHIVOS = 5
+LOTE = 256
+INTERVALO = 2.0
+MAXIMO_PENDIENTES = 50_000
+
+
+def _serializar(evento: dict) -> bytes:
+    return (json.dumps(evento, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class RegistroEventos:
+    def __init__(
+        self,
+        ruta: Path,
+        limite_bytes: int = LIMITE_MB * 1024 * 1024,
+        archivos: int = ARCHIVOS,
+        lote: int = LOTE,
+        intervalo: float = INTERVALO,
+    ) -> None:
+        if archivos < 1 or limite_bytes < archivos:
+            raise ValueError("El registro de eventos necesita al menos un archivo y un byte por archivo.")
+        self.ruta = ruta
+        self.tamano_archivo = limite_bytes // archivos
+        self.archivos = archivos
+        self.lote = lote
+        self.intervalo = intervalo
+        # Identifica esta ejecución: junto con la ronda, agrupa los eventos de un jugador.
+        self.sesion = secrets.token_hex(6)
+        self._pendientes: list[dict] = []
+        self._condicion = threading.Condition()
+        self._cerrado = False
+        self._metricas = {"escritos": 0, "descartados": 0, "lotes": 0, "rotaciones": 0}
+        self._archivo = ruta.open("ab")
+        self._tamano = self._archivo.tell()
+        self._hilo = threading.Thread(target=self._escribir_en_segundo_plano, name="escritor-eventos", daemon=True)
+        self._hilo.start()
+
+    def ruta_rotada(self, numero: int) -> Path:
+        return self.ruta if numero == 0 else self.ruta.with_name(f"{self.ruta.stem}.{numero}{self.ruta.suffix}")
+
+    def rutas(self) -> list[Path]:
+        """Archivos existentes, del más viejo al más nuevo."""
+        return [ruta for ruta in map(self.ruta_rotada, range(self.archivos - 1, -1, -1)) if ruta.exists()]
+
+    def registrar(self, evento: dict) -> None:
+        evento["sesion"] = self.sesion
+        with self._condicion:
+            if len(self._pendientes) >= MAXIMO_PENDIENTES:
+                self._metricas["descartados"] += 1
+                return
+            self._pendientes.append(evento)
+            if len(self._pendientes) >= self.lote:
+                self._condicion.notify()
+
+    def _rotar(self) -> None:
+        self._archivo.close()
+        for numero in range(self.archivos - 1, 0, -1):
+            anterior = self.ruta_rotada(numero - 1)
+            if anterior.exists():
+                os.replace(anterior, self.ruta_rotada(numero))
+        if self.archivos == 1:
+            self.ruta.unlink(missing_ok=True)
+        self._archivo = self.ruta.open("ab")
+        self._tamano = 0
+        self._metricas["rotaciones"] += 1
+
+    def _escribir(self, eventos: list[dict]) -> None:
+        trozo = bytearray()
+        for evento in eventos:
+            linea = _serializar(evento)
+            if self._tamano + len(trozo) + len(linea) > self.tamano_archivo:
+                if trozo:
+                    self._archivo.write(trozo)
+                    self._tamano += len(trozo)
+                    trozo.clear()
+                if self._tamano:
+                    self._rotar()
+                if len(linea) > self.tamano_archivo:
+                    # No entra ni en un archivo vacío: mejor perderla que pasarse del límite.
+                    self._metricas["descartados"] += 1
+                    continue
+            trozo += linea
+        if trozo:
+            self._archivo.write(trozo)
+            self._tamano += len(trozo)
+        self._archivo.flush()
+
+    def _escribir_en_segundo_plano(self) -> None:
+        while True:
+            with self._condicion:
+                # ``registrar`` despierta al hilo cuando se junta un lote completo.
+                if len(self._pendientes) < self.lote and not self._cerrado:
+                    self._condicion.wait(self.intervalo)
+                eventos, self._pendientes = self._pendientes, []
+                cerrado = self._cerrado
+            if eventos:
+                self._escribir(eventos)
+                with self._condicion:
+                    self._metricas["escritos"] += len(eventos)
+                    self._metricas["lotes"] += 1
+            if cerrado:
+                self._archivo.close()
+                return
+
+    def estadisticas(self) -> dict:
+        with self._condicion:
+            return {"pendientes": len(self._pendientes), **self._metricas}
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y detiene el hilo escritor."""
+        with self._condicion:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            self._condicion.notify_all()
+        self._hilo.join()
+
+
+def crear_registro_eventos(ruta: Path) -> RegistroEventos:
+    """Registro con el límite de ``JUEGO_EVENTOS_MB`` (megabytes entre todos los archivos)."""
+    megas = float(os.environ.get(VARIABLE_LIMITE_EVENTOS) or LIMITE_MB)
+    return RegistroEventos(ruta, limite_bytes=int(megas * 1024 * 1024))
+
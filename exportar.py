@@ -0,0 +1,303 @@
+"""Exporta el banco de preguntas de ``datos/`` a todas las interfaces.
+
+``datos/`` es la única fuente de las preguntas: ``main.py`` y ``app_gui.py``
+la leen directamente y este script genera el resto:
+
+- el ``total`` de cada entrada de los manifiestos;
+- las constantes ``CATEGORIAS`` y ``ESPECIALES`` de ``index.html`` (desde
+  ``datos/categorias``; las especiales por nombre de categoría);
+- la constante ``PERIODOS`` de ``app.js`` (desde ``datos/periodos``).
+
+En los archivos web solo se reemplaza el bloque entre los comentarios
+``// <banco-generado>`` y ``// </banco-generado>``; el resto del código no se
+toca.
+
+La exportación es incremental. Cada archivo de datos se identifica por el
+SHA-256 de su contenido (solo se vuelve a leer si cambió su fecha o tamaño) y
+el código generado de cada categoría queda en ``datos/.exportacion/``
+nombrado por esa huella. Al editar una pregunta solo se regenera el fragmento
+de su categoría y solo se reescriben las salidas que la incluyen.
+
+Uso::
+
+    python exportar.py             # regenera lo que cambió
+    python exportar.py --forzar    # regenera todo
+    python exportar.py --comprobar # solo avisa (y falla) si algo está desactualizado
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from banco import DIRECTORIO_DATOS, leer_json
+from guardados import escribir_atomico
+
+DIRECTORIO = Path(__file__).resolve().parent
+MARCA_INICIO = "// <banco-generado>"
+MARCA_FIN = "// </banco-generado>"
+ANCHO_LINEA = 110
+VERSION_CACHE = 1
+
+
+def _clave_js(clave: str) -> str:
+    # "Edad Media" no es un identificador: va entre comillas.
+    return clave if clave.isidentifier() else json.dumps(clave, ensure_ascii=False)
+
+
+def _a_js(valor: object, sangria: int, ocupado: int) -> str:
+    """Literal de JavaScript con claves sin comillas y comas finales."""
+    if isinstance(valor, dict):
+        interior = " " * (sangria + 2)
+        lineas = []
+        for clave, item in valor.items():
+            clave = _clave_js(clave)
+            lineas.append(f"{interior}{clave}: {_a_js(item, sangria + 2, sangria + len(clave) + 4)},\n")
+        return "{\n" + "".join(lineas) + " " * sangria + "}"
+    if isinstance(valor, list):
+        if not valor:
+            return "[]"
+        if not any(isinstance(item, (dict, list)) for item in valor):
+            en_linea = "[" + ", ".join(_a_js(item, 0, 0) for item in valor) + "]"
+            if ocupado + len(en_linea) + 1 <= ANCHO_LINEA:
+                return en_linea
+        interior = " " * (sangria + 2)
+        lineas = [f"{interior}{_a_js(item, sangria + 2, sangria + 2)},\n" for item in valor]
+        return "[\n" + "".join(lineas) + " " * sangria + "]"
+    return json.dumps(valor, ensure_ascii=False)
+
+
+def _categoria_web(entrada: dict, datos: dict) -> dict:
+    categoria = {
+        "nombre": entrada["nombre"],
+        "descripcion": entrada.get("descripcion", ""),
+        "preguntas": datos["preguntas"],
+    }
+    if datos.get("preguntas_dificiles"):
+        categoria["preguntasDificiles"] = datos["preguntas_dificiles"]
+    return categoria
+
+
+def _periodo_web(entrada: dict, datos: dict) -> dict:
+    # app.js juega un solo nivel por período: el primero.
+    nivel = datos["niveles"][0]
+    return {
+        "name": entrada["nombre"],
+        "description": entrada.get("descripcion", ""),
+        "level": {
+            "name": nivel["nombre"],
+            "questions": [
+                {
+                    "prompt": pregunta["enunciado"],
+                    "options": pregunta["opciones"],
+                    "answer": pregunta["respuesta"],
+                    "feedback": pregunta["retroalimentacion"],
+                }
+                for pregunta in nivel["preguntas"]
+            ],
+        },
+    }
+
+
+def _especiales_web(datos: dict) -> dict:
+    return {categoria: preguntas for categoria, preguntas in datos["especiales"].items() if preguntas}
+
+
+def _total_categoria(datos: dict) -> int:
+    return len(datos["preguntas"])
+
+
+def _total_periodo(datos: dict) -> int:
+    return sum(len(nivel["preguntas"]) for nivel in datos["niveles"])
+
+
+def _total_especiales(datos: dict) -> int:
+    return sum(len(preguntas) for preguntas in datos["especiales"].values())
+
+
+@dataclass
+class Coleccion:
+    """Un manifiesto de ``datos/`` y el archivo web que se genera a partir de él."""
+
+    clave: str
+    manifiesto: Path
+    contar: Callable[[dict], int]
+    salida: Path
+    constante: str
+    convertir: Callable[[dict, dict], dict]
+    # Preguntas especiales por categoría, que van en el mismo bloque como ``ESPECIALES``.
+    especiales: Path | None = None
+
+
+def colecciones(datos: Path = DIRECTORIO_DATOS, raiz: Path = DIRECTORIO) -> list[Coleccion]:
+    return [
+        Coleccion(
+            clave="categorias",
+            manifiesto=datos / "categorias" / "manifiesto.json",
+            contar=_total_categoria,
+            salida=raiz / "index.html",
+            constante="CATEGORIAS",
+            convertir=_categoria_web,
+            especiales=datos / "categorias" / "especiales.json",
+        ),
+        Coleccion(
+            clave="periodos",
+            manifiesto=datos / "periodos" / "manifiesto.json",
+            contar=_total_periodo,
+            salida=raiz / "app.js",
+            constante="PERIODOS",
+            convertir=_periodo_web,
+        ),
+    ]
+
+
+def _huella_texto(*partes: str) -> str:
+    return hashlib.sha256("\0".join(partes).encode("utf-8")).hexdigest()
+
+
+def _firma(ruta: Path) -> list[int]:
+    estadistica = ruta.stat()
+    return [estadistica.st_mtime_ns, estadistica.st_size]
+
+
+class Exportador:
+    def __init__(self, datos: Path = DIRECTORIO_DATOS, raiz: Path = DIRECTORIO, forzar: bool = False) -> None:
+        self.datos = datos
+        self.raiz = raiz
+        self.cache = datos / ".exportacion"
+        self.ruta_estado = self.cache / "estado.json"
+        self.estado = {"version": VERSION_CACHE, "fuentes": {}, "salidas": {}}
+        if not forzar and self.ruta_estado.exists():
+            try:
+                estado = leer_json(self.ruta_estado)
+            except (OSError, ValueError):
+                estado = {}
+            if estado.get("version") == VERSION_CACHE:
+                self.estado = estado
+        self.fragmentos_usados: set[str] = set()
+        self.cambios: list[str] = []
+
+    def _nombre(self, ruta: Path) -> str:
+        return ruta.relative_to(self.raiz).as_posix() if ruta.is_relative_to(self.raiz) else str(ruta)
+
+    def _fuente(self, ruta: Path, contar: Callable[[dict], int]) -> tuple[dict | None, dict]:
+        """Devuelve ``(datos, info)``; ``datos`` es None si el archivo no cambió."""
+        clave = ruta.relative_to(self.datos).as_posix()
+        previa = self.estado["fuentes"].get(clave)
+        firma = _firma(ruta)
+        if previa and previa["firma"] == firma:
+            return None, previa
+        contenido = ruta.read_bytes()
+        datos = json.loads(contenido)
+        info = {"firma": firma, "huella": hashlib.sha256(contenido).hexdigest(), "total": contar(datos)}
+        self.estado["fuentes"][clave] = info
+        return datos, info
+
+    def _fragmento(self, coleccion: Coleccion, entrada: dict, ruta: Path, datos: dict | None, clave: str) -> str:
+        """Código JS de una entrada del manifiesto, guardado en la caché con su huella."""
+        archivo = self.cache / f"{clave}.js"
+        if archivo.exists():
+            return archivo.read_text(encoding="utf-8")
+        if datos is None:
+            datos = leer_json(ruta)
+        sangria = int(clave.split("-", 1)[0])
+        texto = " " * sangria + _a_js(coleccion.convertir(entrada, datos), sangria, sangria) + ",\n"
+        archivo.write_text(texto, encoding="utf-8")
+        return texto
+
+    def exportar(self, coleccion: Coleccion, comprobar: bool = False) -> None:
+        manifiesto = leer_json(coleccion.manifiesto)
+        fuentes = []
+        totales_cambiados = False
+        for entrada in manifiesto[coleccion.clave]:
+            ruta = coleccion.manifiesto.parent / entrada["archivo"]
+            datos, info = self._fuente(ruta, coleccion.contar)
+            if entrada.get("total") != info["total"]:
+                entrada["total"] = info["total"]
+                totales_cambiados = True
+            huella = _huella_texto(coleccion.clave, json.dumps(entrada, sort_keys=True, ensure_ascii=False), info["huella"])
+            fuentes.append((entrada, ruta, datos, huella))
+        especiales = None
+        if coleccion.especiales is not None:
+            datos_especiales, info = self._fuente(coleccion.especiales, _total_especiales)
+            especiales = (datos_especiales, info["huella"])
+        if totales_cambiados:
+            self.cambios.append(self._nombre(coleccion.manifiesto))
+            if not comprobar:
+                with coleccion.manifiesto.open("w", encoding="utf-8") as archivo:
+                    json.dump(manifiesto, archivo, indent=2, ensure_ascii=False)
+                    archivo.write("\n")
+
+        # Si ninguna fuente cambió y nadie tocó la salida, no hace falta ni leerla.
+        nombre = self._nombre(coleccion.salida)
+        huellas = [huella for *_, huella in fuentes]
+        if especiales is not None:
+            huellas.append(especiales[1])
+        huella_salida = _huella_texto(*huellas)
+        previa = self.estado["salidas"].get(nombre)
+        if previa and previa["huella"] == huella_salida and previa["firma"] == _firma(coleccion.salida):
+            self.fragmentos_usados.update(previa["fragmentos"])
+            return
+
+        original = coleccion.salida.read_text(encoding="utf-8")
+        inicio = original.index(MARCA_INICIO)
+        inicio_bloque = original.index("\n", inicio) + 1
+        fin = original.index(MARCA_FIN, inicio_bloque)
+        sangria = inicio - original.rindex("\n", 0, inicio) - 1
+        claves = [f"{sangria + 2}-{huella}" for *_, huella in fuentes]
+        fragmentos = [
+            self._fragmento(coleccion, entrada, ruta, datos, clave)
+            for (entrada, ruta, datos, _), clave in zip(fuentes, claves)
+        ]
+        self.fragmentos_usados.update(f"{clave}.js" for clave in claves)
+        margen = " " * sangria
+        bloque = f"{margen}const {coleccion.constante} = [\n" + "".join(fragmentos) + f"{margen}];\n"
+        if especiales is not None:
+            datos_especiales = especiales[0] if especiales[0] is not None else leer_json(coleccion.especiales)
+            inicio_constante = f"{margen}const ESPECIALES = "
+            bloque += inicio_constante + _a_js(_especiales_web(datos_especiales), sangria, len(inicio_constante)) + ";\n"
+        bloque += margen
+        if original[inicio_bloque:fin] != bloque:
+            self.cambios.append(nombre)
+            if comprobar:
+                return
+            escribir_atomico(coleccion.salida, [original[:inicio_bloque], bloque, original[fin:]])
+        self.estado["salidas"][nombre] = {
+            "huella": huella_salida,
+            "firma": _firma(coleccion.salida),
+            "fragmentos": [f"{clave}.js" for clave in claves],
+        }
+
+    def ejecutar(self, comprobar: bool = False) -> list[str]:
+        """Exporta todas las colecciones; devuelve los archivos que cambiaron."""
+        self.cache.mkdir(exist_ok=True)
+        for coleccion in colecciones(self.datos, self.raiz):
+            self.exportar(coleccion, comprobar)
+        # Los fragmentos que ya no corresponden a ninguna fuente se descartan.
+        for archivo in self.cache.glob("*.js"):
+            if archivo.name not in self.fragmentos_usados:
+                archivo.unlink()
+        escribir_atomico(self.ruta_estado, [json.dumps(self.estado, ensure_ascii=False)])
+        return self.cambios
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera los datos de cada interfaz desde datos/.")
+    parser.add_argument("--forzar", action="store_true", help="ignora la caché y regenera todo")
+    parser.add_argument("--comprobar", action="store_true", help="no modifica el proyecto; falla si hay cambios pendientes")
+    argumentos = parser.parse_args()
+
+    cambios = Exportador(forzar=argumentos.forzar).ejecutar(comprobar=argumentos.comprobar)
+    for ruta in cambios:
+        print(("Desactualizado: " if argumentos.comprobar else "Actualizado: ") + ruta)
+    if argumentos.comprobar and cambios:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
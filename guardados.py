@@ -0,0 +1,901 @@
+"""Almacenamiento de partidas guardadas de la interfaz gráfica.
+
+Hay dos almacenes intercambiables con la misma interfaz (``Almacen``):
+
+- ``AlmacenDiario`` (por defecto): cada guardado agrega una línea JSON pequeña
+  a un diario de solo anexado y en memoria se mantiene un índice por nombre de
+  jugador. Cuando el diario crece, un hilo en segundo plano compacta todo en
+  una instantánea y descarta los diarios ya incluidos en ella. Usa
+  ``partidas_guardadas.json`` (instantánea binaria, ver abajo) y
+  ``partidas_guardadas.diario.<generacion>.jsonl`` (cambios posteriores).
+- ``AlmacenSQLite``: una base ``sqlite3`` en modo WAL con índices por nombre y
+  por puntaje máximo; cada guardado actualiza solo su fila.
+
+``crear_almacen`` elige el almacén según la variable de entorno
+``JUEGO_ALMACEN`` (``diario`` o ``sqlite``).
+
+La instantánea binaria tiene una cabecera fija (``CABECERA``: formato,
+compresión, generación, total y dónde está el índice), los ``estado`` de las
+partidas en JSON compacto agrupados en bloques de ``REGISTROS_POR_BLOQUE``
+comprimidos con ``zlib`` o ``lzma`` (``JUEGO_COMPRESION``) y al final el
+índice: por partida, su id, nombre, fecha, puntaje máximo, ubicación y
+versión de esquema. Abrirla lee solo la cabecera y el índice; ``iterar``
+devuelve esos resúmenes (sin ``estado``) y el ``estado`` de una partida se lee,
+descomprime y migra al esquema actual (``migrar_registro``) cuando se pide
+con ``obtener``. Las instantáneas en JSON de versiones anteriores se siguen
+leyendo y se reescriben en binario en la próxima compactación.
+"""
+
+from __future__ import annotations
+
+import json
+import lzma
+import os
+import random
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Protocol, TextIO
+
+LIMITE_DIARIO = 200
+TAMANO_BLOQUE = 1000
+INTERVALO_ESCRITURA = 0.5
+VARIABLE_ALMACEN = "JUEGO_ALMACEN"
+VARIABLE_COMPRESION = "JUEGO_COMPRESION"
+
+MAGIA = b"JHPG"
+VERSION_FORMATO = 1
+# magia, formato, compresión, (libre), generación, total, inicio y largo del índice
+CABECERA = struct.Struct("<4sHBxIIQQ")
+REGISTROS_POR_BLOQUE = 64
+COMPRESION = "zlib"
+COMPRESORES: dict[str, tuple[int, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "ninguna": (0, bytes, bytes),
+    "zlib": (1, lambda datos: zlib.compress(datos, 9), zlib.decompress),
+    "lzma": (2, lzma.compress, lzma.decompress),
+}
+_DESCOMPRESORES = {codigo: descomprimir for codigo, _, descomprimir in COMPRESORES.values()}
+
+
+class Almacen(Protocol):
+    # ``iterar`` puede dar resúmenes sin ``estado``; ``obtener`` y
+    # ``leer_todos`` dan partidas completas y ``obtener`` además las migra.
+    def iterar(self, tamano: int = TAMANO_BLOQUE) -> Iterator[list[dict]]: ...
+
+    def leer_todos(self) -> list[dict]: ...
+
+    def obtener(self, nombre: str) -> dict | None: ...
+
+    def total(self) -> int: ...
+
+    def guardar(self, registro: dict) -> None: ...
+
+    def eliminar(self, nombre: str) -> None: ...
+
+    def escribir_todos(self, guardados: list[dict]) -> None: ...
+
+    def cerrar(self) -> None: ...
+
+
+def sincronizar_directorio(ruta: Path) -> None:
+    """Pasa al disco la carpeta de ``ruta``, para que un renombre sobreviva a un corte."""
+    try:
+        descriptor = os.open(ruta.parent, os.O_RDONLY)
+    except OSError:
+        # Windows no abre carpetas así; allí el renombre ya queda en el disco.
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def escribir_atomico_bytes(ruta: Path, partes: Iterable[bytes]) -> None:
+    """Escribe en un temporal, lo sincroniza, lo renombra sobre ``ruta`` y sincroniza la carpeta."""
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    with temporal.open("wb") as archivo:
+        archivo.writelines(partes)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+    sincronizar_directorio(ruta)
+
+
+def escribir_atomico(ruta: Path, lineas: Iterable[str]) -> None:
+    """Como ``escribir_atomico_bytes``, con texto en UTF-8."""
+    escribir_atomico_bytes(ruta, (linea.encode("utf-8") for linea in lineas))
+
+
+def _serializar(datos: dict) -> str:
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":"))
+
+
+# Migraciones del ``estado`` de una partida: ``MIGRACIONES[i]`` lo lleva de
+# la versión ``i`` a la ``i + 1`` (los registros sin versión son la 0).
+
+
+def _migrar_campos(estado: dict) -> None:
+    """Campos que las primeras partidas guardadas no tenían."""
+    estado.setdefault("tiempo_limite", 30)
+    estado.setdefault("tiempo_restante", 30)
+    estado.setdefault("pregunta_especial", False)
+    estado.setdefault("comodines", {"pista": 1, "saltar": 1, "investigar": 1, "eliminar": 1})
+
+
+def _migrar_orden(estado: dict) -> None:
+    """La lista del orden de las preguntas pasa al repaso espaciado.
+
+    Una lista en el orden del banco sigue así; cualquier otra pasa al repaso
+    conservando la pregunta en curso.
+    """
+    orden = estado.pop("orden_preguntas", None)
+    if "con_repaso" not in estado:
+        estado["con_repaso"] = orden != list(range(len(orden))) if orden is not None else True
+    estado.setdefault("repasos", {})
+    indice = estado["indice_pregunta"]
+    if estado["con_repaso"] and orden and indice < len(orden):
+        estado["pregunta_en_curso"] = orden[indice]
+
+
+MIGRACIONES: list[Callable[[dict], None]] = [_migrar_campos, _migrar_orden]
+ESQUEMA = len(MIGRACIONES)
+
+
+def migrar_registro(registro: dict) -> dict:
+    """Lleva el ``estado`` del registro al esquema actual (en el mismo diccionario)."""
+    version = registro.get("version", 0)
+    if version > ESQUEMA:
+        raise ValueError(f"La partida de {registro['nombre']} es de una versión más nueva del juego.")
+    for migracion in MIGRACIONES[version:]:
+        migracion(registro["estado"])
+    registro["version"] = ESQUEMA
+    return registro
+
+
+def crear_registro(nombre: str, estado: dict, existente: dict | None = None) -> dict:
+    """Registro de una partida guardada; conserva id y puntaje máximo del anterior."""
+    maximo = max(existente["maximo_puntaje"] if existente else 0, estado["puntaje"])
+    return {
+        "id": existente["id"] if existente else str(random.randint(1000, 9999)),
+        "nombre": nombre,
+        "fecha": datetime.now().strftime("%d/%m/%Y %H:%M"),
+        "maximo_puntaje": maximo,
+        "version": ESQUEMA,
+        "estado": estado,
+    }
+
+
+def _resumen(registro: dict) -> dict:
+    return {
+        "id": registro.get("id"),
+        "nombre": registro["nombre"],
+        "fecha": registro.get("fecha", ""),
+        "maximo_puntaje": registro.get("maximo_puntaje", 0),
+    }
+
+
+class _LectorBloques:
+    """Lee bloques de una instantánea binaria y recuerda el último."""
+
+    def __init__(self, ruta: Path, bloques: list[list[int]], compresion: int) -> None:
+        self.ruta = ruta
+        self.bloques = bloques
+        self.codigo = compresion
+        self.descomprimir = _DESCOMPRESORES[compresion]
+        self._ultimo: tuple[int, bytes] | None = None
+
+    def copia(self) -> _LectorBloques:
+        """Otro lector del mismo archivo, con su propio bloque recordado (para otro hilo)."""
+        return _LectorBloques(self.ruta, self.bloques, self.codigo)
+
+    def bloque(self, numero: int) -> bytes:
+        # Se lee ``_ultimo`` una sola vez: otro hilo puede reemplazarlo en cualquier momento.
+        ultimo = self._ultimo
+        if ultimo is not None and ultimo[0] == numero:
+            return ultimo[1]
+        inicio, largo = self.bloques[numero]
+        with self.ruta.open("rb") as archivo:
+            archivo.seek(inicio)
+            datos = self.descomprimir(archivo.read(largo))
+        self._ultimo = (numero, datos)
+        return datos
+
+    def crudo(self, ubicacion: tuple[int, int, int, int]) -> bytes:
+        bloque, inicio, largo, _ = ubicacion
+        return self.bloque(bloque)[inicio : inicio + largo]
+
+
+class AlmacenDiario:
+    """Partidas en un diario de solo anexado con compactación periódica.
+
+    De la instantánea binaria solo se lee el índice: las partidas quedan como
+    resúmenes y su ``estado`` se lee del bloque correspondiente al pedirlas.
+    Las instantáneas JSON por líneas de versiones anteriores se leen por
+    bloques a medida que se recorren con ``iterar``.
+    """
+
+    def __init__(self, ruta: Path, limite_diario: int = LIMITE_DIARIO, compresion: str = COMPRESION) -> None:
+        if compresion not in COMPRESORES:
+            raise ValueError(f"Compresión desconocida: {compresion}")
+        self.ruta = ruta
+        self.limite_diario = limite_diario
+        self.compresion = compresion
+        # Partidas de la instantánea (completas o resúmenes), la más reciente primero.
+        self._instantanea: dict[str, dict] = {}
+        self._lector: Iterator[dict] | None = None
+        # Nombre -> (bloque, inicio, largo, versión) de los resúmenes de la instantánea binaria.
+        self._ubicaciones: dict[str, tuple[int, int, int, int]] = {}
+        self._bloques: _LectorBloques | None = None
+        # Cambios del diario en orden de aplicación; None marca una partida eliminada.
+        self._cambios: dict[str, dict | None] = {}
+        self._cerrojo = threading.RLock()
+        self._hilo_compactacion: threading.Thread | None = None
+        self._generacion = 0
+        self._entradas_diario = 0
+        self._recuperar()
+        self._diario = self._abrir_diario(self._generacion)
+
+    def _ruta_diario(self, generacion: int) -> Path:
+        return self.ruta.with_name(f"{self.ruta.stem}.diario.{generacion}.jsonl")
+
+    def _abrir_diario(self, generacion: int) -> TextIO:
+        ruta = self._ruta_diario(generacion)
+        incompleto = False
+        if ruta.exists() and ruta.stat().st_size > 0:
+            with ruta.open("rb") as archivo:
+                archivo.seek(-1, os.SEEK_END)
+                incompleto = archivo.read(1) != b"\n"
+        diario = ruta.open("a", encoding="utf-8")
+        if incompleto:
+            # Cierra la línea cortada para que el próximo guardado no se mezcle con ella.
+            diario.write("\n")
+        return diario
+
+    def _diarios_existentes(self) -> list[tuple[int, Path]]:
+        diarios = []
+        for ruta in self.ruta.parent.glob(f"{self.ruta.stem}.diario.*.jsonl"):
+            generacion = ruta.name[len(self.ruta.stem) + len(".diario.") : -len(".jsonl")]
+            if generacion.isdigit():
+                diarios.append((int(generacion), ruta))
+        return sorted(diarios)
+
+    def _recuperar(self) -> None:
+        """Lee la cabecera de la instantánea y vuelve a aplicar la cola de diarios."""
+        generacion_base = 0
+        if self.ruta.exists():
+            with self.ruta.open("rb") as binario:
+                magia = binario.read(len(MAGIA))
+        if self.ruta.exists() and magia == MAGIA:
+            generacion_base = self._abrir_binaria()
+        elif self.ruta.exists():
+            archivo = self.ruta.open("r", encoding="utf-8")
+            primera = archivo.readline()
+            if primera.lstrip().startswith("["):
+                # Formato anterior: una lista JSON con todas las partidas.
+                partidas = json.loads(primera + archivo.read())
+                archivo.close()
+                self._instantanea = {registro["nombre"]: registro for registro in partidas}
+            elif primera.strip():
+                cabecera = json.loads(primera)
+                generacion_base = cabecera["generacion"]
+                if "partidas" in cabecera:
+                    archivo.close()
+                    self._instantanea = {registro["nombre"]: registro for registro in cabecera["partidas"]}
+                else:
+                    self._lector = self._leer_instantanea(archivo)
+            else:
+                archivo.close()
+        self._generacion = generacion_base
+        for generacion, ruta in self._diarios_existentes():
+            if generacion < generacion_base:
+                ruta.unlink(missing_ok=True)
+                continue
+            self._generacion = generacion
+            self._entradas_diario = self._reproducir(ruta)
+
+    def _abrir_binaria(self) -> int:
+        """Lee la cabecera y el índice de la instantánea; devuelve su generación."""
+        with self.ruta.open("rb") as archivo:
+            _, formato, compresion, generacion, _, inicio, largo = CABECERA.unpack(archivo.read(CABECERA.size))
+            if formato > VERSION_FORMATO:
+                raise ValueError(f"{self.ruta} es de una versión más nueva del juego.")
+            archivo.seek(inicio)
+            indice = json.loads(_DESCOMPRESORES[compresion](archivo.read(largo)))
+        for nombre, identificador, fecha, maximo, bloque, desde, tamano, version in indice["partidas"]:
+            self._instantanea[nombre] = {"id": identificador, "nombre": nombre, "fecha": fecha, "maximo_puntaje": maximo}
+            self._ubicaciones[nombre] = (bloque, desde, tamano, version)
+        self._bloques = _LectorBloques(self.ruta, indice["bloques"], compresion)
+        return generacion
+
+    def _completar(self, registro: dict) -> dict:
+        """La partida completa de un resumen de la instantánea binaria."""
+        if "estado" in registro:
+            return registro
+        ubicacion = self._ubicaciones[registro["nombre"]]
+        estado = json.loads(self._bloques.crudo(ubicacion))
+        return dict(registro, version=ubicacion[3], estado=estado)
+
+    @staticmethod
+    def _leer_instantanea(archivo: TextIO) -> Iterator[dict]:
+        with archivo:
+            for linea in archivo:
+                if linea.strip():
+                    yield json.loads(linea)
+
+    def _reproducir(self, ruta: Path) -> int:
+        entradas = 0
+        with ruta.open("r", encoding="utf-8") as archivo:
+            for linea in archivo:
+                try:
+                    entrada = json.loads(linea)
+                except json.JSONDecodeError:
+                    # Línea incompleta por un cierre inesperado: se ignora.
+                    continue
+                self._aplicar(entrada)
+                entradas += 1
+        return entradas
+
+    def _aplicar(self, entrada: dict) -> None:
+        if entrada["op"] == "guardar":
+            nombre, registro = entrada["registro"]["nombre"], entrada["registro"]
+        elif entrada["op"] == "eliminar":
+            nombre, registro = entrada["nombre"], None
+        else:
+            return
+        self._cambios.pop(nombre, None)
+        self._cambios[nombre] = registro
+
+    def _leer_bloque(self, tamano: int) -> list[dict]:
+        """Lee hasta ``tamano`` partidas más de la instantánea."""
+        bloque = []
+        with self._cerrojo:
+            if self._lector is None:
+                return bloque
+            for registro in self._lector:
+                self._instantanea[registro["nombre"]] = registro
+                bloque.append(registro)
+                if len(bloque) >= tamano:
+                    break
+            else:
+                self._lector = None
+        return bloque
+
+    def _cargar_resto(self) -> None:
+        while self._lector is not None:
+            self._leer_bloque(TAMANO_BLOQUE)
+
+    def _recientes(self) -> list[dict]:
+        return [registro for registro in reversed(self._cambios.values()) if registro is not None]
+
+    def iterar(self, tamano: int = TAMANO_BLOQUE) -> Iterator[list[dict]]:
+        """Recorre las partidas por bloques, la más reciente primero.
+
+        El primer bloque sale del diario y de lo ya leído, sin esperar al resto
+        de la instantánea.
+        """
+        with self._cerrojo:
+            bloque = self._recientes() + [
+                registro for nombre, registro in self._instantanea.items() if nombre not in self._cambios
+            ]
+        for inicio in range(0, len(bloque), tamano):
+            yield bloque[inicio : inicio + tamano]
+        while self._lector is not None:
+            bloque = self._leer_bloque(tamano)
+            with self._cerrojo:
+                bloque = [registro for registro in bloque if registro["nombre"] not in self._cambios]
+            if bloque:
+                yield bloque
+
+    def _vigentes(self) -> list[dict]:
+        """Partidas (completas o resúmenes) con la más reciente primero."""
+        with self._cerrojo:
+            self._cargar_resto()
+            return self._recientes() + [
+                registro for nombre, registro in self._instantanea.items() if nombre not in self._cambios
+            ]
+
+    def leer_todos(self) -> list[dict]:
+        """Devuelve las partidas con la más reciente primero."""
+        with self._cerrojo:
+            return [self._completar(registro) for registro in self._vigentes()]
+
+    def obtener(self, nombre: str) -> dict | None:
+        with self._cerrojo:
+            if nombre in self._cambios:
+                registro = self._cambios[nombre]
+            else:
+                if nombre not in self._instantanea:
+                    self._cargar_resto()
+                registro = self._instantanea.get(nombre)
+            return migrar_registro(self._completar(registro)) if registro is not None else None
+
+    def total(self) -> int:
+        return len(self._vigentes())
+
+    def _anexar(self, entrada: dict) -> None:
+        with self._cerrojo:
+            self._diario.write(_serializar(entrada) + "\n")
+            self._diario.flush()
+            self._aplicar(entrada)
+            self._entradas_diario += 1
+            compactar = self._entradas_diario >= self.limite_diario
+        if compactar:
+            self.compactar()
+
+    def guardar(self, registro: dict) -> None:
+        self._anexar({"op": "guardar", "registro": registro})
+
+    def eliminar(self, nombre: str) -> None:
+        if self.obtener(nombre) is not None:
+            self._anexar({"op": "eliminar", "nombre": nombre})
+
+    def escribir_todos(self, guardados: list[dict]) -> None:
+        """Reemplaza todas las partidas de una vez (la primera es la más reciente)."""
+        with self._cerrojo:
+            if self._lector is not None:
+                self._lector.close()
+                self._lector = None
+            self._instantanea = {}
+            for registro in guardados:
+                self._instantanea.setdefault(registro["nombre"], registro)
+            self._cambios = {}
+        self.compactar(esperar=True)
+
+    def compactar(self, esperar: bool = False) -> None:
+        """Escribe una instantánea nueva en segundo plano y rota el diario."""
+        en_curso = self._hilo_compactacion
+        if en_curso and en_curso.is_alive():
+            if not esperar:
+                return
+            en_curso.join()
+        with self._cerrojo:
+            partidas = self._vigentes()
+            # A partir de aquí los guardados van al diario de la nueva generación;
+            # la instantánea cubre todo lo anterior.
+            self._diario.close()
+            self._generacion += 1
+            self._entradas_diario = 0
+            self._diario = self._abrir_diario(self._generacion)
+            self._instantanea = {registro["nombre"]: registro for registro in partidas}
+            self._cambios = {}
+            hilo = threading.Thread(
+                target=self._escribir_instantanea,
+                # El hilo de compactación usa su propio lector de la instantánea vieja.
+                args=(partidas, self._generacion, self._ubicaciones, None if self._bloques is None else self._bloques.copia()),
+                name="compactacion-guardados",
+                daemon=True,
+            )
+            self._hilo_compactacion = hilo
+            hilo.start()
+        if esperar:
+            hilo.join()
+
+    def _escribir_instantanea(
+        self,
+        partidas: list[dict],
+        generacion: int,
+        ubicaciones: dict[str, tuple[int, int, int, int]],
+        lector: _LectorBloques | None,
+    ) -> None:
+        codigo, comprimir, _ = COMPRESORES[self.compresion]
+        temporal = self.ruta.with_name(self.ruta.name + ".tmp")
+        bloques: list[list[int]] = []
+        entradas = []
+        bloque = bytearray()
+        en_bloque = 0
+        with temporal.open("wb") as archivo:
+            archivo.write(bytes(CABECERA.size))
+
+            def cerrar_bloque() -> None:
+                datos = comprimir(bytes(bloque))
+                bloques.append([archivo.tell(), len(datos)])
+                archivo.write(datos)
+
+            for registro in partidas:
+                if "estado" in registro:
+                    crudo = _serializar(registro["estado"]).encode("utf-8")
+                    version = registro.get("version", 0)
+                else:
+                    # Resumen de la instantánea anterior: se copia sin decodificarlo.
+                    ubicacion = ubicaciones[registro["nombre"]]
+                    crudo, version = lector.crudo(ubicacion), ubicacion[3]
+                resumen = _resumen(registro)
+                entradas.append(
+                    [resumen["nombre"], resumen["id"], resumen["fecha"], resumen["maximo_puntaje"], len(bloques), len(bloque), len(crudo), version]
+                )
+                bloque += crudo
+                en_bloque += 1
+                if en_bloque == REGISTROS_POR_BLOQUE:
+                    cerrar_bloque()
+                    bloque.clear()
+                    en_bloque = 0
+            if en_bloque:
+                cerrar_bloque()
+            indice = comprimir(_serializar({"bloques": bloques, "partidas": entradas}).encode("utf-8"))
+            inicio_indice = archivo.tell()
+            archivo.write(indice)
+            archivo.seek(0)
+            archivo.write(CABECERA.pack(MAGIA, VERSION_FORMATO, codigo, generacion, len(entradas), inicio_indice, len(indice)))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        with self._cerrojo:
+            # Los resúmenes pasan a apuntar a la instantánea nueva junto con el cambio de archivo.
+            os.replace(temporal, self.ruta)
+            sincronizar_directorio(self.ruta)
+            self._ubicaciones = {entrada[0]: tuple(entrada[4:]) for entrada in entradas}
+            self._bloques = _LectorBloques(self.ruta, bloques, codigo)
+        for anterior, ruta in self._diarios_existentes():
+            if anterior < generacion:
+                ruta.unlink(missing_ok=True)
+
+    def cerrar(self) -> None:
+        if self._hilo_compactacion:
+            self._hilo_compactacion.join()
+        with self._cerrojo:
+            if self._lector is not None:
+                self._lector.close()
+                self._lector = None
+            self._diario.close()
+
+
+class AlmacenSQLite:
+    """Partidas en una base SQLite (modo WAL), una fila por jugador."""
+
+    def __init__(self, ruta: Path) -> None:
+        self.ruta = ruta
+        # El hilo escritor de ``EscrituraDiferida`` usa la misma conexión.
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+        self._cerrojo = threading.Lock()
+        with self._cerrojo:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            # La clave primaria ya crea el índice único por nombre.
+            self._conexion.execute(
+                """
+                CREATE TABLE IF NOT EXISTS partidas (
+                    nombre TEXT PRIMARY KEY,
+                    maximo_puntaje INTEGER NOT NULL DEFAULT 0,
+                    secuencia INTEGER NOT NULL,
+                    registro TEXT NOT NULL
+                )
+                """
+            )
+            self._conexion.execute("CREATE INDEX IF NOT EXISTS idx_partidas_maximo ON partidas (maximo_puntaje)")
+            self._conexion.execute("CREATE INDEX IF NOT EXISTS idx_partidas_secuencia ON partidas (secuencia)")
+            fila = self._conexion.execute("SELECT COALESCE(MAX(secuencia), 0) FROM partidas").fetchone()
+        self._secuencia = fila[0]
+
+    def _consultar(self, sql: str, parametros: tuple = ()) -> list[tuple]:
+        with self._cerrojo:
+            return self._conexion.execute(sql, parametros).fetchall()
+
+    def iterar(self, tamano: int = TAMANO_BLOQUE) -> Iterator[list[dict]]:
+        """Recorre las partidas por bloques, la más reciente primero."""
+        with self._cerrojo:
+            cursor = self._conexion.execute("SELECT registro FROM partidas ORDER BY secuencia DESC")
+        while True:
+            with self._cerrojo:
+                filas = cursor.fetchmany(tamano)
+            if not filas:
+                return
+            yield [json.loads(registro) for (registro,) in filas]
+
+    def leer_todos(self) -> list[dict]:
+        """Devuelve las partidas con la más reciente primero."""
+        filas = self._consultar("SELECT registro FROM partidas ORDER BY secuencia DESC")
+        return [json.loads(registro) for (registro,) in filas]
+
+    def obtener(self, nombre: str) -> dict | None:
+        filas = self._consultar("SELECT registro FROM partidas WHERE nombre = ?", (nombre,))
+        return migrar_registro(json.loads(filas[0][0])) if filas else None
+
+    def mejores(self, limite: int = 10) -> list[dict]:
+        """Partidas con mayor puntaje máximo, usando el índice de puntaje."""
+        filas = self._consultar(
+            "SELECT registro FROM partidas ORDER BY maximo_puntaje DESC LIMIT ?",
+            (limite,),
+        )
+        return [json.loads(registro) for (registro,) in filas]
+
+    def total(self) -> int:
+        return self._consultar("SELECT COUNT(*) FROM partidas")[0][0]
+
+    def guardar(self, registro: dict) -> None:
+        with self._cerrojo:
+            self._secuencia += 1
+            self._conexion.execute(
+                """
+                INSERT INTO partidas (nombre, maximo_puntaje, secuencia, registro) VALUES (?, ?, ?, ?)
+                ON CONFLICT (nombre) DO UPDATE SET
+                    maximo_puntaje = excluded.maximo_puntaje,
+                    secuencia = excluded.secuencia,
+                    registro = excluded.registro
+                """,
+                (
+                    registro["nombre"],
+                    registro.get("maximo_puntaje", 0),
+                    self._secuencia,
+                    _serializar(registro),
+                ),
+            )
+
+    def eliminar(self, nombre: str) -> None:
+        with self._cerrojo:
+            self._conexion.execute("DELETE FROM partidas WHERE nombre = ?", (nombre,))
+
+    def escribir_todos(self, guardados: list[dict]) -> None:
+        """Reemplaza todas las partidas (la primera es la más reciente)."""
+        filas = [
+            (
+                registro["nombre"],
+                registro.get("maximo_puntaje", 0),
+                secuencia,
+                _serializar(registro),
+            )
+            for secuencia, registro in enumerate(reversed(guardados), start=1)
+        ]
+        with self._cerrojo:
+            self._conexion.execute("BEGIN")
+            self._conexion.execute("DELETE FROM partidas")
+            self._conexion.executemany(
+                "INSERT OR REPLACE INTO partidas (nombre, maximo_puntaje, secuencia, registro) VALUES (?, ?, ?, ?)",
+                filas,
+            )
+            self._conexion.execute("COMMIT")
+            self._secuencia = len(filas)
+
+    def cerrar(self) -> None:
+        with self._cerrojo:
+            self._conexion.close()
+
+
+def crear_almacen(ruta: Path, tipo: str | None = None) -> Almacen:
+    """Crea el almacén indicado o el de ``JUEGO_ALMACEN`` (``diario`` por defecto).
+
+    Al estrenar la base SQLite se importan las partidas del diario existente.
+    La instantánea del diario se comprime según ``JUEGO_COMPRESION``
+    (``zlib`` por defecto, ``lzma`` o ``ninguna``).
+    """
+    tipo = tipo or os.environ.get(VARIABLE_ALMACEN, "diario")
+    if tipo == "diario":
+        return AlmacenDiario(ruta, compresion=os.environ.get(VARIABLE_COMPRESION, COMPRESION))
+    if tipo == "sqlite":
+        almacen = AlmacenSQLite(ruta.with_suffix(".db"))
+        if almacen.total() == 0 and ruta.exists():
+            anterior = AlmacenDiario(ruta)
+            almacen.escribir_todos(anterior.leer_todos())
+            anterior.cerrar()
+        return almacen
+    raise ValueError(f"Almacén desconocido: {tipo}")
+
+
+class EscrituraDiferida:
+    """Copia en memoria de las partidas con escritura diferida en un hilo.
+
+    La interfaz lee y modifica solo la copia en memoria. Los registros
+    modificados quedan pendientes y un hilo escritor los pasa al almacén
+    cuando transcurre ``intervalo`` segundos sin cambios nuevos (o al cerrar),
+    de modo que varios guardados seguidos del mismo jugador se escriben una
+    sola vez.
+
+    Al iniciar, el mismo hilo lee el almacén por bloques; mientras tanto
+    ``cargando`` es verdadero y las consultas ven solo lo leído hasta ahora.
+    """
+
+    def __init__(self, almacen: Almacen, intervalo: float = INTERVALO_ESCRITURA) -> None:
+        self.almacen = almacen
+        self.intervalo = intervalo
+        # Partidas guardadas en esta sesión; el último elemento es la más reciente.
+        self._sesion: dict[str, dict] = {}
+        # Partidas leídas del almacén, la más reciente primero (sin las de la sesión).
+        self._cargados: dict[str, dict] = {}
+        self._eliminados: set[str] = set()
+        self.cargando = True
+        # Nombre -> registro por escribir, o None si hay que eliminarlo.
+        self._pendientes: dict[str, dict | None] = {}
+        self._reemplazo: list[dict] | None = None
+        self._en_escritura = 0
+        self._desde: float | None = None
+        self._ultimo_cambio = 0.0
+        self._condicion = threading.Condition()
+        self._cerrado = False
+        self._metricas = {
+            "descargas": 0,
+            "registros_escritos": 0,
+            "ultima_latencia_ms": 0.0,
+            "maxima_latencia_ms": 0.0,
+            # Escrituras que fallaron (se descartan) y el mensaje de la última.
+            "errores": 0,
+            "ultimo_error": None,
+        }
+        self._hilo = threading.Thread(target=self._escribir_en_segundo_plano, name="escritor-guardados", daemon=True)
+        self._hilo.start()
+
+    def _cargar(self) -> None:
+        for bloque in self.almacen.iterar():
+            with self._condicion:
+                if not self.cargando:
+                    # ``escribir_todos`` reemplazó todo mientras se leía.
+                    return
+                for registro in bloque:
+                    nombre = registro["nombre"]
+                    if nombre in self._eliminados:
+                        continue
+                    actual = self._sesion.get(nombre)
+                    if actual is None:
+                        self._cargados[nombre] = registro
+                        continue
+                    # Guardado en esta sesión antes de leerse del disco: conserva el
+                    # identificador y el puntaje máximo ya registrados.
+                    actual["id"] = registro.get("id", actual.get("id"))
+                    actual["maximo_puntaje"] = max(actual.get("maximo_puntaje", 0), registro.get("maximo_puntaje", 0))
+                    self._marcar(nombre, actual)
+
+    def listar(self, desplazamiento: int, limite: int) -> list[dict]:
+        """Devuelve una página de partidas, la más reciente primero."""
+        with self._condicion:
+            recientes = len(self._sesion)
+            pagina = list(islice(reversed(self._sesion.values()), desplazamiento, desplazamiento + limite))
+            inicio = max(0, desplazamiento - recientes)
+            pagina.extend(islice(self._cargados.values(), inicio, inicio + limite - len(pagina)))
+            return pagina
+
+    def leer_todos(self) -> list[dict]:
+        """Devuelve las partidas con la más reciente primero."""
+        with self._condicion:
+            registros = list(reversed(self._sesion.values())) + list(self._cargados.values())
+        return [registro if "estado" in registro else self.obtener(registro["nombre"]) for registro in registros]
+
+    def obtener(self, nombre: str) -> dict | None:
+        with self._condicion:
+            registro = self._sesion.get(nombre) or self._cargados.get(nombre)
+        if registro is None:
+            return None
+        if "estado" in registro:
+            return migrar_registro(registro)
+        # Resumen del índice: la partida se lee del almacén recién ahora.
+        completo = self.almacen.obtener(nombre)
+        with self._condicion:
+            if completo is not None and self._cargados.get(nombre) is registro:
+                self._cargados[nombre] = completo
+        return completo
+
+    def resumen(self, nombre: str) -> dict | None:
+        """Id, fecha y puntaje máximo de la partida sin leer su estado del almacén."""
+        with self._condicion:
+            registro = self._sesion.get(nombre) or self._cargados.get(nombre)
+            return None if registro is None else _resumen(registro)
+
+    def total(self) -> int:
+        return len(self._sesion) + len(self._cargados)
+
+    def guardar(self, registro: dict) -> None:
+        nombre = registro["nombre"]
+        with self._condicion:
+            self._cargados.pop(nombre, None)
+            self._sesion.pop(nombre, None)
+            self._sesion[nombre] = registro
+            self._eliminados.discard(nombre)
+            self._marcar(nombre, registro)
+
+    def eliminar(self, nombre: str) -> None:
+        with self._condicion:
+            self._sesion.pop(nombre, None)
+            self._cargados.pop(nombre, None)
+            if self.cargando:
+                self._eliminados.add(nombre)
+            self._marcar(nombre, None)
+
+    def escribir_todos(self, guardados: list[dict]) -> None:
+        """Reemplaza todas las partidas (la primera es la más reciente)."""
+        with self._condicion:
+            self.cargando = False
+            self._sesion = {}
+            self._cargados = {}
+            for registro in guardados:
+                self._cargados.setdefault(registro["nombre"], registro)
+            self._reemplazo = list(guardados)
+            self._pendientes.clear()
+            self._marcar(None, None)
+
+    def _marcar(self, nombre: str | None, registro: dict | None) -> None:
+        if nombre is not None:
+            self._pendientes[nombre] = registro
+        self._ultimo_cambio = time.monotonic()
+        if self._desde is None:
+            self._desde = self._ultimo_cambio
+        self._condicion.notify()
+
+    def _fallo(self, error: Exception) -> None:
+        with self._condicion:
+            self._metricas["errores"] += 1
+            self._metricas["ultimo_error"] = f"{type(error).__name__}: {error}"
+
+    def _escribir_en_segundo_plano(self) -> None:
+        try:
+            self._cargar()
+        except Exception as error:
+            # Se sigue con lo leído hasta el fallo; lo nuevo se escribe igual.
+            self._fallo(error)
+        finally:
+            with self._condicion:
+                self.cargando = False
+                self._condicion.notify_all()
+        while True:
+            with self._condicion:
+                while not self._hay_pendientes() and not self._cerrado:
+                    self._condicion.wait()
+                # Espera a que los cambios se calmen antes de escribir.
+                while not self._cerrado:
+                    restante = self._ultimo_cambio + self.intervalo - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicion.wait(restante)
+                if not self._hay_pendientes():
+                    return
+                reemplazo, self._reemplazo = self._reemplazo, None
+                pendientes, self._pendientes = self._pendientes, {}
+                desde, self._desde = self._desde, None
+                self._en_escritura = len(pendientes) + (1 if reemplazo is not None else 0)
+            escritos = 0
+            try:
+                if reemplazo is not None:
+                    self.almacen.escribir_todos(reemplazo)
+                    escritos += 1
+                for nombre, registro in pendientes.items():
+                    # Un registro que falla no impide escribir los demás.
+                    try:
+                        if registro is None:
+                            self.almacen.eliminar(nombre)
+                        else:
+                            self.almacen.guardar(registro)
+                        escritos += 1
+                    except Exception as error:
+                        self._fallo(error)
+            except Exception as error:
+                self._fallo(error)
+            finally:
+                # Aunque algo falle, ``descargar`` y ``cerrar`` no deben quedar esperando.
+                with self._condicion:
+                    latencia = (time.monotonic() - desde) * 1000
+                    self._metricas["descargas"] += 1
+                    self._metricas["registros_escritos"] += escritos
+                    self._metricas["ultima_latencia_ms"] = latencia
+                    self._metricas["maxima_latencia_ms"] = max(self._metricas["maxima_latencia_ms"], latencia)
+                    self._en_escritura = 0
+                    self._condicion.notify_all()
+
+    def _hay_pendientes(self) -> bool:
+        return bool(self._pendientes) or self._reemplazo is not None
+
+    def estadisticas(self) -> dict:
+        """Profundidad de la cola, latencia (desde el primer cambio hasta el disco) y errores."""
+        with self._condicion:
+            return {
+                "profundidad_cola": len(self._pendientes) + self._en_escritura,
+                **self._metricas,
+            }
+
+    def descargar(self) -> None:
+        """Bloquea hasta que todo lo pendiente esté en el almacén."""
+        with self._condicion:
+            self._ultimo_cambio = 0.0
+            self._condicion.notify_all()
+            while self.cargando or self._hay_pendientes() or self._en_escritura:
+                self._condicion.wait()
+
+    def cerrar(self) -> None:
+        """Escribe lo pendiente, detiene el hilo escritor y cierra el almacén."""
+        with self._condicion:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            self._condicion.notify_all()
+        self._hilo.join()
+        self.almacen.cerrar()
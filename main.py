@@ -2,21 +2,56 @@
 
 Este archivo mantiene un flujo sencillo para practicar Historia Universal
 con preguntas de selección múltiple, sistema de vidas y puntaje.
+
+Con ``--lote`` juega sin preguntar nada: lee guiones de partidas de un
+archivo (o de la entrada estándar con ``-``) y escribe el resultado de cada
+una como una línea JSON::
+
+    python main.py --lote guiones.jsonl --salida resultados.jsonl
+    printf '1 2 1 3\n' | python main.py --lote - --periodo 2 --nivel 1
+
+Cada línea del guion es un objeto JSON (``{"jugador": "ana", "periodo": 1,
+"nivel": 2, "respuestas": [1, 3, 2]}``, con el período y el nivel por número
+o por nombre) o solo las respuestas separadas por espacios, que se juegan en
+``--periodo`` y ``--nivel``. Los números son los que se escribirían en la
+consola, empezando por 1. Si las respuestas se acaban antes que el nivel, la
+partida queda sin completar. Un guion con ``"ranura"`` guarda su resultado
+en esa ranura; todas las ranuras del lote se escriben juntas al final.
+
+Las partidas se guardan en ranuras con nombre dentro de ``savegame.json``
+(ver ``ranuras.py``).
 """
 
+import argparse
+import functools
 import json
-from dataclasses import dataclass
+import sys
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TextIO
 
-ARCHIVO_GUARDADO = Path("savegame.json")
+from banco import MANIFIESTO_PERIODOS, Pregunta, leer_json, leer_preguntas
+from motor import MotorJuego
+from ranuras import ArchivoRanuras
 
+ARCHIVO_GUARDADO = Path("savegame.json")
+RANURA_PREDETERMINADA = "partida"
+# Resultados del modo por lotes que se juntan antes de cada escritura.
+LOTE_SALIDA = 1000
 
-@dataclass
-class Pregunta:
-    enunciado: str
-    opciones: list[str]
-    respuesta: str
-    retroalimentacion: str
+# La consola no tiene temporizador, comodines ni preguntas especiales.
+CONFIGURACION_CONSOLA = {
+    "vidas_iniciales": 3,
+    "tiempo_pregunta": 0,
+    "tiempo_especial": 0,
+    "probabilidad_especial": 0,
+    "vidas_extra_especial": 0,
+    "anti_trampa": False,
+    "comodines": {},
+    "puede_guardar": True,
+    "reinicia_al_fallar": False,
+}
 
 
 @dataclass
@@ -27,192 +62,33 @@ class Nivel:
 
 @dataclass
 class Periodo:
+    """Período histórico cuyos niveles se leen del disco en el primer acceso."""
+
     nombre: str
-    niveles: list[Nivel]
+    archivo: Path
+    _niveles: list[Nivel] | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def niveles(self) -> list[Nivel]:
+        if self._niveles is None:
+            datos = leer_json(self.archivo)
+            self._niveles = [
+                Nivel(nombre=nivel["nombre"], preguntas=leer_preguntas(nivel["preguntas"]))
+                for nivel in datos["niveles"]
+            ]
+        return self._niveles
 
 
 def construir_periodos() -> list[Periodo]:
-    """Crea los periodos históricos con sus niveles y preguntas."""
+    """Lee el manifiesto de períodos; las preguntas se cargan al elegir uno."""
+    manifiesto = leer_json(MANIFIESTO_PERIODOS)
     return [
-        Periodo(
-            nombre="Antigüedad",
-            niveles=[
-                Nivel(
-                    nombre="Civilizaciones Iniciales",
-                    preguntas=[
-                        Pregunta(
-                            enunciado="¿Cuál de estas civilizaciones se desarrolló junto al río Nilo?",
-                            opciones=["Mesopotamia", "Egipto", "China", "Grecia"],
-                            respuesta="Egipto",
-                            retroalimentacion="Egipto se consolidó gracias a las crecidas del río Nilo.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué invento es clave en el surgimiento de las ciudades antiguas?",
-                            opciones=["La pólvora", "La escritura", "El motor a vapor", "Internet"],
-                            respuesta="La escritura",
-                            retroalimentacion="La escritura permitió registrar leyes y transacciones.",
-                        ),
-                        Pregunta(
-                            enunciado="¿En qué región surgió la civilización mesopotámica?",
-                            opciones=[
-                                "Entre los ríos Tigris y Éufrates",
-                                "En los Andes",
-                                "En la península Ibérica",
-                                "En el Sahara",
-                            ],
-                            respuesta="Entre los ríos Tigris y Éufrates",
-                            retroalimentacion="Mesopotamia significa ""entre ríos"".",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué cultura aportó el concepto de democracia directa?",
-                            opciones=["Roma", "Grecia", "Fenicia", "Persia"],
-                            respuesta="Grecia",
-                            retroalimentacion="Atenas es recordada por su democracia directa.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué pueblo destacó por el comercio marítimo en el Mediterráneo?",
-                            opciones=["Fenicios", "Mayas", "Aztecas", "Incas"],
-                            respuesta="Fenicios",
-                            retroalimentacion="Los fenicios fueron grandes navegantes y comerciantes.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué imperio construyó la Vía Apia y otras calzadas famosas?",
-                            opciones=[
-                                "Imperio Romano",
-                                "Imperio Persa",
-                                "Imperio Chino",
-                                "Imperio Otomano",
-                            ],
-                            respuesta="Imperio Romano",
-                            retroalimentacion="Roma expandió su red de calzadas para unir el imperio.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Cuál fue un aporte científico de los griegos antiguos?",
-                            opciones=["Geometría", "Imprenta", "Electricidad", "Motor de combustión"],
-                            respuesta="Geometría",
-                            retroalimentacion="Euclides y otros griegos sistematizaron la geometría.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué estructura monumental se construyó en Egipto como tumbas reales?",
-                            opciones=["Pirámides", "Zigurats", "Anfiteatros", "Catedrales"],
-                            respuesta="Pirámides",
-                            retroalimentacion="Las pirámides eran tumbas para los faraones.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué código legal es uno de los más antiguos de la historia?",
-                            opciones=["Código de Hammurabi", "Código Napoleónico", "Leyes de Indias", "Fuero Juzgo"],
-                            respuesta="Código de Hammurabi",
-                            retroalimentacion="El código de Hammurabi pertenece a Babilonia.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué invento chino revolucionó la navegación en la antigüedad?",
-                            opciones=["Brújula", "Telescopio", "Imprenta", "Motor a vapor"],
-                            respuesta="Brújula",
-                            retroalimentacion="La brújula permitió viajes marítimos más precisos.",
-                        ),
-                    ],
-                ),
-            ],
-        ),
-        Periodo(
-            nombre="Independencia y Venezuela",
-            niveles=[
-                Nivel(
-                    nombre="Campañas Libertadoras",
-                    preguntas=[
-                        Pregunta(
-                            enunciado="¿Quién lideró la Campaña Admirable en 1813?",
-                            opciones=[
-                                "Simón Bolívar",
-                                "José de San Martín",
-                                "Francisco Miranda",
-                                "Antonio José de Sucre",
-                            ],
-                            respuesta="Simón Bolívar",
-                            retroalimentacion="La Campaña Admirable consolidó el liderazgo de Bolívar.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué batalla aseguró la independencia de Venezuela en 1821?",
-                            opciones=["Carabobo", "Boyacá", "Junín", "Pichincha"],
-                            respuesta="Carabobo",
-                            retroalimentacion="Carabobo fue decisiva para la independencia venezolana.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Cuál era el objetivo principal del Congreso de Angostura?",
-                            opciones=[
-                                "Crear un gobierno central para la Gran Colombia",
-                                "Restaurar la monarquía española",
-                                "Dividir el territorio en virreinatos",
-                                "Declarar la guerra a Portugal",
-                            ],
-                            respuesta="Crear un gobierno central para la Gran Colombia",
-                            retroalimentacion="El Congreso de Angostura sentó bases institucionales.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué figura es conocida como la Libertadora del Libertador?",
-                            opciones=[
-                                "Manuela Sáenz",
-                                "Luisa Cáceres",
-                                "Juana Ramírez",
-                                "Josefa Camejo",
-                            ],
-                            respuesta="Manuela Sáenz",
-                            retroalimentacion="Manuela Sáenz apoyó a Bolívar en momentos clave.",
-                        ),
-                        Pregunta(
-                            enunciado="¿En qué ciudad se firmó el Acta de Independencia de Venezuela en 1811?",
-                            opciones=["Caracas", "Valencia", "Maracaibo", "Cumaná"],
-                            respuesta="Caracas",
-                            retroalimentacion="El Acta se firmó en Caracas el 5 de julio de 1811.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué batalla aseguró la independencia de Ecuador en 1822?",
-                            opciones=["Pichincha", "Junín", "Ayacucho", "Boyacá"],
-                            respuesta="Pichincha",
-                            retroalimentacion="La victoria de Pichincha fue clave para Ecuador.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué documento proclamó los derechos del hombre y del ciudadano en 1789?",
-                            opciones=[
-                                "Declaración de los Derechos del Hombre y del Ciudadano",
-                                "Carta Magna",
-                                "Constitución de Cádiz",
-                                "Edicto de Nantes",
-                            ],
-                            respuesta="Declaración de los Derechos del Hombre y del Ciudadano",
-                            retroalimentacion="Fue un texto fundamental de la Revolución Francesa.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Quién encabezó el proceso de independencia de Haití?",
-                            opciones=[
-                                "Toussaint Louverture",
-                                "Simón Bolívar",
-                                "Napoleón Bonaparte",
-                                "Bernardo O'Higgins",
-                            ],
-                            respuesta="Toussaint Louverture",
-                            retroalimentacion="Louverture fue líder de la revolución haitiana.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué país lideró la Revolución Industrial?",
-                            opciones=["Inglaterra", "España", "Portugal", "Rusia"],
-                            respuesta="Inglaterra",
-                            retroalimentacion="La Revolución Industrial inició en Inglaterra.",
-                        ),
-                        Pregunta(
-                            enunciado="¿Qué organización internacional surgió tras la Segunda Guerra Mundial?",
-                            opciones=["ONU", "OTAN", "Unión Europea", "Liga Hanseática"],
-                            respuesta="ONU",
-                            retroalimentacion="La ONU se fundó en 1945 para promover la paz.",
-                        ),
-                    ],
-                ),
-            ],
-        ),
+        Periodo(nombre=entrada["nombre"], archivo=MANIFIESTO_PERIODOS.parent / entrada["archivo"])
+        for entrada in manifiesto["periodos"]
     ]
 
 
-def elegir_opcion(pregunta: str, opciones: list[str]) -> int:
+def elegir_opcion(pregunta: str, opciones: Sequence[str]) -> int:
     """Solicita una opción válida al usuario y devuelve el índice seleccionado."""
     while True:
         print(f"\n{pregunta}")
@@ -224,53 +100,126 @@ def elegir_opcion(pregunta: str, opciones: list[str]) -> int:
         print("Opción inválida. Intenta nuevamente.")
 
 
-def cargar_partida() -> dict | None:
-    """Lee la partida guardada si existe."""
-    if not ARCHIVO_GUARDADO.exists():
-        return None
-    with ARCHIVO_GUARDADO.open("r", encoding="utf-8") as archivo:
-        return json.load(archivo)
+def partida_valida(periodos: list[Periodo], datos: dict) -> bool:
+    """True si el período y el nivel de la partida existen en el banco actual."""
+    indice_periodo = datos.get("period_index", 0)
+    indice_nivel = datos.get("level_index", 0)
+    return (
+        isinstance(indice_periodo, int)
+        and isinstance(indice_nivel, int)
+        and isinstance(datos.get("score", 0), int)
+        and 0 <= indice_periodo < len(periodos)
+        and 0 <= indice_nivel < len(periodos[indice_periodo].niveles)
+    )
 
 
-def guardar_partida(indice_periodo: int, indice_nivel: int, puntaje: int) -> None:
-    """Guarda el estado actual del juego."""
+def abrir_ranuras(periodos: list[Periodo]) -> ArchivoRanuras:
+    """Abre las ranuras; un ``savegame.json`` de una sola partida pasa a la ranura predeterminada."""
+    ranuras = ArchivoRanuras(ARCHIVO_GUARDADO)
+    if ranuras.anterior is not None:
+        datos = ranuras.anterior
+        if partida_valida(periodos, datos):
+            guardar_partida(
+                ranuras,
+                RANURA_PREDETERMINADA,
+                periodos,
+                datos.get("period_index", 0),
+                datos.get("level_index", 0),
+                datos.get("score", 0),
+            )
+        else:
+            # Como un archivo dañado: no se migra y el primer guardado lo aparta.
+            ranuras.anterior = None
+            ranuras.aviso = (
+                f"La partida de {ARCHIVO_GUARDADO} no corresponde a ningún período o nivel; "
+                f"al guardar se aparta como {ranuras.ruta_danado.name}."
+            )
+    if ranuras.aviso is not None:
+        print(f"Aviso: {ranuras.aviso}", file=sys.stderr)
+    return ranuras
+
+
+def cargar_partida(ranuras: ArchivoRanuras, nombre: str) -> dict | None:
+    """Lee la partida de la ranura, si existe."""
+    return ranuras.obtener(nombre)
+
+
+def guardar_partida(
+    ranuras: ArchivoRanuras,
+    nombre: str,
+    periodos: list[Periodo],
+    indice_periodo: int,
+    indice_nivel: int,
+    puntaje: int,
+    descargar: bool = True,
+) -> None:
+    """Guarda el estado del juego en la ranura; con ``descargar=False`` queda pendiente."""
     datos = {
         "period_index": indice_periodo,
         "level_index": indice_nivel,
         "score": puntaje,
     }
-    with ARCHIVO_GUARDADO.open("w", encoding="utf-8") as archivo:
-        json.dump(datos, archivo, indent=2, ensure_ascii=False)
+    periodo = periodos[indice_periodo]
+    resumen = {"periodo": periodo.nombre, "nivel": periodo.niveles[indice_nivel].nombre, "puntaje": puntaje}
+    ranuras.guardar(nombre, datos, resumen)
+    if descargar:
+        ranuras.descargar()
 
 
-def jugar_nivel(nivel: Nivel) -> int:
-    """Ejecuta las preguntas de un nivel y retorna el puntaje obtenido."""
-    vidas = 3
-    puntaje = 0
-    print(f"\nIniciando nivel: {nivel.nombre}")
-    for pregunta in nivel.preguntas:
-        if vidas == 0:
+@dataclass
+class ResultadoNivel:
+    puntaje: int
+    vidas: int
+    respondidas: int
+    aciertos: int
+    completado: bool
+
+
+def _callar(*_mensajes: object) -> None:
+    pass
+
+
+def _jugar(nivel: Nivel, elegir: Callable[[Pregunta], int | None], mostrar: Callable[..., None]) -> ResultadoNivel:
+    """Juega un nivel con ``elegir`` como jugador; si devuelve None, la partida se abandona."""
+    motor = MotorJuego([nivel], dificultad="consola", configuracion=CONFIGURACION_CONSOLA.copy())
+    motor.iniciar_categoria(0, barajar=False)
+    respondidas = aciertos = 0
+    mostrar(f"\nIniciando nivel: {nivel.nombre}")
+    while (pregunta := motor.siguiente_pregunta()) is not None:
+        indice_respuesta = elegir(pregunta)
+        if indice_respuesta is None:
             break
-        indice_respuesta = elegir_opcion(pregunta.enunciado, pregunta.opciones)
-        seleccion = pregunta.opciones[indice_respuesta]
-        if seleccion == pregunta.respuesta:
-            puntaje += 10
-            print("✅ ¡Correcto!", pregunta.retroalimentacion)
+        resultado = motor.responder(indice_respuesta)
+        respondidas += 1
+        if resultado.correcta:
+            aciertos += 1
+            mostrar("✅ ¡Correcto!", resultado.retroalimentacion)
         else:
-            vidas -= 1
-            print(f"❌ Respuesta incorrecta. {pregunta.retroalimentacion}")
-            print(f"Vidas restantes: {vidas}")
-            if vidas > 0:
-                print("¡Ánimo! Puedes seguir intentándolo.")
-    if vidas == 0:
-        print("El personaje se pone triste, pero puedes intentarlo de nuevo.")
+            mostrar(f"❌ Respuesta incorrecta. {resultado.retroalimentacion}")
+            mostrar(f"Vidas restantes: {motor.vidas}")
+            if motor.vidas > 0:
+                mostrar("¡Ánimo! Puedes seguir intentándolo.")
+        if resultado.partida_perdida:
+            break
+    if motor.vidas == 0:
+        mostrar("El personaje se pone triste, pero puedes intentarlo de nuevo.")
     else:
-        print("¡Felicidades! Has completado el nivel.")
-    print(f"Puntaje obtenido: {puntaje}")
-    return puntaje
+        mostrar("¡Felicidades! Has completado el nivel.")
+    mostrar(f"Puntaje obtenido: {motor.puntaje}")
+    return ResultadoNivel(motor.puntaje, motor.vidas, respondidas, aciertos, motor.terminada and motor.vidas > 0)
 
 
-def iniciar_nueva_partida(periodos: list[Periodo]) -> None:
+def jugar_nivel(nivel: Nivel) -> int:
+    """Ejecuta las preguntas de un nivel y retorna el puntaje obtenido."""
+    return _jugar(nivel, lambda pregunta: elegir_opcion(pregunta.enunciado, pregunta.opciones), print).puntaje
+
+
+def pedir_ranura() -> str:
+    nombre = input(f"Nombre de la ranura (Enter para \"{RANURA_PREDETERMINADA}\"): ").strip()
+    return nombre or RANURA_PREDETERMINADA
+
+
+def iniciar_nueva_partida(periodos: list[Periodo], ranuras: ArchivoRanuras) -> None:
     indice_periodo = elegir_opcion(
         "Selecciona el período histórico:",
         [periodo.nombre for periodo in periodos],
@@ -281,15 +230,30 @@ def iniciar_nueva_partida(periodos: list[Periodo]) -> None:
         [nivel.nombre for nivel in niveles],
     )
     puntaje = jugar_nivel(niveles[indice_nivel])
-    guardar_partida(indice_periodo, indice_nivel, puntaje)
-    print("Partida guardada.")
+    nombre = pedir_ranura()
+    guardar_partida(ranuras, nombre, periodos, indice_periodo, indice_nivel, puntaje)
+    print(f"Partida guardada en la ranura \"{nombre}\".")
 
 
-def reanudar_partida(periodos: list[Periodo]) -> None:
-    datos = cargar_partida()
-    if datos is None:
+def reanudar_partida(periodos: list[Periodo], ranuras: ArchivoRanuras) -> None:
+    # El menú sale del índice: no se lee ninguna partida hasta elegir una.
+    lista = ranuras.listar()
+    if not lista:
         print("No hay partidas guardadas.")
         return
+    eleccion = elegir_opcion(
+        "Selecciona la partida:",
+        [
+            f"{nombre} — {resumen.get('periodo', '?')} / {resumen.get('nivel', '?')}, "
+            f"{resumen.get('puntaje', 0)} puntos ({resumen.get('fecha', '')})"
+            for nombre, resumen in lista
+        ],
+    )
+    nombre = lista[eleccion][0]
+    datos = cargar_partida(ranuras, nombre)
+    if not partida_valida(periodos, datos):
+        print("La partida guardada no corresponde a ningún período o nivel.")
+        return
     indice_periodo = datos.get("period_index", 0)
     indice_nivel = datos.get("level_index", 0)
     puntaje = datos.get("score", 0)
@@ -300,12 +264,141 @@ def reanudar_partida(periodos: list[Periodo]) -> None:
         f"\nPuntaje previo: {puntaje}"
     )
     puntaje += jugar_nivel(periodos[indice_periodo].niveles[indice_nivel])
-    guardar_partida(indice_periodo, indice_nivel, puntaje)
+    guardar_partida(ranuras, nombre, periodos, indice_periodo, indice_nivel, puntaje)
     print("Partida actualizada.")
 
 
+def _buscar(opciones: Sequence, valor: int | str, que: str):
+    """Elemento por número (desde 1) o por nombre."""
+    if isinstance(valor, str) and not valor.isdigit():
+        for opcion in opciones:
+            if opcion.nombre == valor:
+                return opcion
+        raise ValueError(f"No existe el {que} {valor!r}.")
+    numero = int(valor)
+    if not 1 <= numero <= len(opciones):
+        raise ValueError(f"No existe el {que} número {numero}.")
+    return opciones[numero - 1]
+
+
+def jugar_guion(periodos: list[Periodo], guion: dict, ranuras: Callable[[], ArchivoRanuras] | None = None) -> dict:
+    """Juega una partida según el guion y devuelve su resultado.
+
+    Si el guion nombra una ``"ranura"``, el resultado queda pendiente de
+    guardar en las ranuras que devuelve ``ranuras()``; solo entonces se abren.
+    """
+    periodo = _buscar(periodos, guion.get("periodo", 1), "período")
+    nivel = _buscar(periodo.niveles, guion.get("nivel", 1), "nivel")
+    respuestas = iter(guion.get("respuestas", []))
+
+    def elegir(pregunta: Pregunta) -> int | None:
+        respuesta = next(respuestas, None)
+        if respuesta is None:
+            return None
+        if not isinstance(respuesta, int) or not 1 <= respuesta <= len(pregunta.opciones):
+            raise ValueError(f"Respuesta inválida: {respuesta!r}.")
+        return respuesta - 1
+
+    resultado = _jugar(nivel, elegir, _callar)
+    if ranuras is not None and guion.get("ranura"):
+        guardar_partida(
+            ranuras(),
+            str(guion["ranura"]),
+            periodos,
+            periodos.index(periodo),
+            periodo.niveles.index(nivel),
+            resultado.puntaje,
+            descargar=False,
+        )
+    return {
+        "jugador": guion.get("jugador"),
+        "periodo": periodo.nombre,
+        "nivel": nivel.nombre,
+        "puntaje": resultado.puntaje,
+        "vidas": resultado.vidas,
+        "respondidas": resultado.respondidas,
+        "aciertos": resultado.aciertos,
+        "completado": resultado.completado,
+    }
+
+
+def leer_guion(linea: str, periodo: int | str = 1, nivel: int | str = 1) -> dict | None:
+    """Guion de una línea: un objeto JSON o solo las respuestas; None si está vacía."""
+    linea = linea.strip()
+    if not linea:
+        return None
+    if linea.startswith("{"):
+        return json.loads(linea)
+    return {"periodo": periodo, "nivel": nivel, "respuestas": [int(numero) for numero in linea.split()]}
+
+
+def jugar_lote(
+    periodos: list[Periodo],
+    entrada: Iterable[str],
+    salida: TextIO,
+    periodo: int | str = 1,
+    nivel: int | str = 1,
+    ranuras: Callable[[], ArchivoRanuras] | None = None,
+) -> int:
+    """Juega los guiones de ``entrada`` y escribe un resultado JSON por línea en ``salida``.
+
+    Un guion con errores da una línea con ``"error"`` y el lote sigue. Las
+    ranuras que nombran los guiones se escriben todas juntas al final; si
+    ninguno nombra una, el archivo de ranuras ni se abre. Devuelve la
+    cantidad de partidas jugadas.
+    """
+    pendientes: list[str] = []
+    jugadas = 0
+    con_ranura = False
+    for numero, linea in enumerate(entrada, start=1):
+        try:
+            guion = leer_guion(linea, periodo, nivel)
+            if guion is None:
+                continue
+            con_ranura = con_ranura or bool(guion.get("ranura"))
+            resultado = jugar_guion(periodos, guion, ranuras)
+            jugadas += 1
+        except (ValueError, TypeError) as error:
+            resultado = {"error": str(error)}
+        resultado["linea"] = numero
+        pendientes.append(json.dumps(resultado, ensure_ascii=False))
+        if len(pendientes) >= LOTE_SALIDA:
+            salida.write("\n".join(pendientes) + "\n")
+            pendientes.clear()
+    if pendientes:
+        salida.write("\n".join(pendientes) + "\n")
+    salida.flush()
+    if ranuras is not None and con_ranura:
+        ranuras().descargar()
+    return jugadas
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Juego de Historia Universal (consola).")
+    parser.add_argument("--lote", help="archivo de guiones de partidas (- para la entrada estándar); juega sin preguntar")
+    parser.add_argument("--salida", help="archivo de resultados del lote (por defecto, la salida estándar)")
+    parser.add_argument("--periodo", default="1", help="período de los guiones que no lo indican (número o nombre)")
+    parser.add_argument("--nivel", default="1", help="nivel de los guiones que no lo indican (número o nombre)")
+    argumentos = parser.parse_args()
+
     periodos = construir_periodos()
+
+    # Se abren (y migran) al necesitarlas: un lote sin ranuras no toca el archivo.
+    @functools.cache
+    def ranuras() -> ArchivoRanuras:
+        return abrir_ranuras(periodos)
+
+    if argumentos.lote:
+        entrada = sys.stdin if argumentos.lote == "-" else open(argumentos.lote, encoding="utf-8")
+        salida = open(argumentos.salida, "w", encoding="utf-8") if argumentos.salida else sys.stdout
+        try:
+            jugar_lote(periodos, entrada, salida, argumentos.periodo, argumentos.nivel, ranuras)
+        finally:
+            if entrada is not sys.stdin:
+                entrada.close()
+            if salida is not sys.stdout:
+                salida.close()
+        return
     while True:
         print("\n=== Juego de Historia Universal ===")
         opcion = elegir_opcion(
@@ -313,9 +406,9 @@ def main() -> None:
             ["Iniciar nueva partida", "Cargar partida", "Salir"],
         )
         if opcion == 0:
-            iniciar_nueva_partida(periodos)
+            iniciar_nueva_partida(periodos, ranuras())
         elif opcion == 1:
-            reanudar_partida(periodos)
+            reanudar_partida(periodos, ranuras())
         else:
             print("Gracias por jugar. ¡Hasta pronto!")
             break
@@ -0,0 +1,435 @@
+"""Reglas del juego sin interfaz.
+
+``MotorJuego`` guarda el estado de una partida (categoría, pregunta actual,
+vidas, puntaje, comodines) y aplica las reglas de cada dificultad. No importa
+``tkinter``: la interfaz de escritorio, la de consola y cualquier servidor o
+prueba lo manejan llamando a sus métodos y mostrando el ``Resultado``.
+
+Salvo que se pida un orden fijo (``barajar=False``, como en la consola), la
+pregunta siguiente la decide el repaso espaciado del jugador (``Repaso``) en
+el momento de mostrarla, y cada respuesta se le informa. El repaso de cada
+categoría viaja en ``estado()`` junto con el resto de la partida.
+
+Si se le pasa ``eventos`` (por ejemplo ``RegistroEventos.registrar``), el
+motor le entrega un diccionario por cada respuesta, pregunta perdida, comodín
+usado y partida perdida; sin ``eventos`` no arma ninguno.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from banco import Especiales, Pregunta, registro_especiales
+from repaso import Repaso
+
+PUNTOS_POR_ACIERTO = 10
+DIFICULTADES = ["principiante", "facil", "normal", "dificil", "hardcore"]
+
+CONFIGURACIONES = {
+    "principiante": {
+        "vidas_iniciales": 0,
+        "tiempo_pregunta": 30,
+        "tiempo_especial": 0,
+        "probabilidad_especial": 0,
+        "vidas_extra_especial": 0,
+        "anti_trampa": False,
+        "comodines": {"pista": 0, "saltar": 0, "investigar": 0, "eliminar": 0},
+        "puede_guardar": True,
+        "reinicia_al_fallar": False,
+    },
+    "facil": {
+        "vidas_iniciales": 10,
+        "tiempo_pregunta": 30,
+        "tiempo_especial": 10,
+        "probabilidad_especial": 0.1,
+        "vidas_extra_especial": 1,
+        "anti_trampa": True,
+        "comodines": {"pista": 2, "saltar": 2, "investigar": 2, "eliminar": 2},
+        "puede_guardar": True,
+        "reinicia_al_fallar": False,
+    },
+    "normal": {
+        "vidas_iniciales": 5,
+        "tiempo_pregunta": 30,
+        "tiempo_especial": 10,
+        "probabilidad_especial": 0.1,
+        "vidas_extra_especial": 1,
+        "anti_trampa": True,
+        "comodines": {"pista": 1, "saltar": 1, "investigar": 1, "eliminar": 1},
+        "puede_guardar": True,
+        "reinicia_al_fallar": False,
+    },
+    "dificil": {
+        "vidas_iniciales": 3,
+        "tiempo_pregunta": 20,
+        "tiempo_especial": 5,
+        "probabilidad_especial": 0.05,
+        "vidas_extra_especial": 1,
+        "anti_trampa": True,
+        "comodines": {"pista": 0, "saltar": 0, "investigar": 0, "eliminar": 0},
+        "puede_guardar": True,
+        "reinicia_al_fallar": False,
+    },
+    "hardcore": {
+        "vidas_iniciales": 1,
+        "tiempo_pregunta": 10,
+        "tiempo_especial": 0,
+        "probabilidad_especial": 0,
+        "vidas_extra_especial": 0,
+        "anti_trampa": True,
+        "comodines": {"pista": 0, "saltar": 0, "investigar": 0, "eliminar": 0},
+        "puede_guardar": False,
+        "reinicia_al_fallar": True,
+    },
+}
+# Número de cada ronda empezada en el proceso: con la sesión del registro de
+# eventos identifica una ronda aunque varios motores compartan el registro.
+_RONDAS = itertools.count(1)
+
+
+def obtener_configuracion(nivel: str) -> dict:
+    configuracion = CONFIGURACIONES.get(nivel, CONFIGURACIONES["normal"]).copy()
+    configuracion["comodines"] = configuracion["comodines"].copy()
+    return configuracion
+
+
+class GrupoPreguntas(Protocol):
+    """Cualquier grupo con nombre y preguntas: ``Categoria`` o un nivel de consola."""
+
+    nombre: str
+
+    @property
+    def preguntas(self) -> Sequence[Pregunta]: ...
+
+
+@dataclass
+class Resultado:
+    correcta: bool
+    retroalimentacion: str = ""
+    vida_extra: bool = False
+    partida_perdida: bool = False
+    mensaje: str = ""
+
+
+@dataclass
+class MotorJuego:
+    categorias: list[GrupoPreguntas]
+    dificultad: str = "normal"
+    configuracion: dict = field(default_factory=dict)
+    azar: random.Random = field(default_factory=random.Random)
+    indice_categoria: int = 0
+    indice_pregunta: int = 0
+    vidas: int = 0
+    puntaje: int = 0
+    tiempo_limite: int = 30
+    tiempo_restante: int = 30
+    pregunta_especial: bool = False
+    pregunta_actual: Pregunta | None = None
+    comodines: dict = field(default_factory=dict)
+    eliminadas: set[int] = field(default_factory=set)
+    # Sin repaso las preguntas salen en el orden del banco. Con repaso el
+    # orden no se guarda: sale de la semilla y el cursor de cada ``Repaso``.
+    con_repaso: bool = True
+    repasos: dict[str, Repaso] = field(default_factory=dict)
+    reloj: Callable[[], float] = time.time
+    # Preguntas especiales por categoría; None usa las de ``datos/``.
+    especiales: Mapping[str, Especiales] | None = None
+    eventos: Callable[[dict], None] | None = None
+    # Preguntas que el repaso ya eligió y aún no se respondieron (la actual y
+    # la que quedó preparada): número en la ronda -> índice en la categoría.
+    _reservadas: dict[int, int] = field(default_factory=dict, repr=False)
+    _preparada: tuple | None = field(default=None, repr=False)
+    # Ronda actual (de ``_RONDAS``), para agrupar sus eventos, y cuándo se
+    # mostró la pregunta actual.
+    _ronda: int = field(default=0, repr=False)
+    _mostrada: float = field(default=0.0, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.configuracion:
+            self._aplicar_configuracion(self.configuracion)
+        else:
+            self.aplicar_dificultad(self.dificultad)
+
+    def _aplicar_configuracion(self, configuracion: dict) -> None:
+        self.configuracion = configuracion
+        self.vidas = configuracion["vidas_iniciales"]
+        self.tiempo_limite = configuracion["tiempo_pregunta"]
+        self.tiempo_restante = configuracion["tiempo_pregunta"]
+        self.comodines = configuracion["comodines"].copy()
+        self._preparada = None
+
+    def aplicar_dificultad(self, nivel: str) -> None:
+        self.dificultad = nivel
+        self._aplicar_configuracion(obtener_configuracion(nivel))
+
+    @property
+    def categoria(self) -> GrupoPreguntas:
+        return self.categorias[self.indice_categoria]
+
+    @property
+    def terminada(self) -> bool:
+        return self.indice_pregunta >= len(self.categoria.preguntas)
+
+    @property
+    def con_vidas(self) -> bool:
+        return self.configuracion["vidas_iniciales"] > 0
+
+    @property
+    def repaso(self) -> Repaso:
+        """Repaso espaciado del jugador en la categoría actual."""
+        nombre = self.categoria.nombre
+        if nombre not in self.repasos:
+            repaso = Repaso(semilla=self.azar.getrandbits(32))
+            repaso.reiniciar(len(self.categoria.preguntas))
+            self.repasos[nombre] = repaso
+        return self.repasos[nombre]
+
+    def _barajar(self, barajar: bool = True) -> None:
+        self.con_repaso = barajar
+        self._reservadas = {}
+        self._preparada = None
+        if barajar:
+            self.repaso.reiniciar(len(self.categoria.preguntas))
+
+    def _posicion(self, indice_pregunta: int) -> int:
+        """Índice en la categoría de la pregunta número ``indice_pregunta`` de la ronda."""
+        if not self.con_repaso:
+            return indice_pregunta
+        if indice_pregunta not in self._reservadas:
+            self._reservadas[indice_pregunta] = self.repaso.siguiente(self.reloj())
+        return self._reservadas[indice_pregunta]
+
+    def iniciar_categoria(self, indice: int, barajar: bool = True) -> None:
+        self.indice_categoria = indice
+        self.reiniciar_ronda(barajar)
+
+    def reiniciar_ronda(self, barajar: bool = True) -> None:
+        """Empieza la categoría actual de cero (también tras perder la partida)."""
+        self.indice_pregunta = 0
+        self.vidas = self.configuracion["vidas_iniciales"]
+        self.puntaje = 0
+        self._ronda = next(_RONDAS)
+        self.comodines = self.configuracion["comodines"].copy()
+        self._barajar(barajar)
+
+    # Selección de preguntas
+
+    def _clave(self, indice_pregunta: int) -> tuple:
+        return (self.indice_categoria, indice_pregunta, self.con_repaso, self.dificultad)
+
+    def elegir_pregunta(self, indice_pregunta: int) -> tuple[Pregunta, bool]:
+        """Decide si toca una pregunta especial y devuelve la pregunta elegida."""
+        # La pregunta del banco se reserva aunque salga una especial; el
+        # repaso la recupera cuando se responde la especial.
+        posicion = self._posicion(indice_pregunta)
+        if self.azar.random() < self.configuracion["probabilidad_especial"]:
+            # Una categoría sin especiales (un tema buscado, por ejemplo)
+            # sigue con la pregunta del banco.
+            especiales = (registro_especiales() if self.especiales is None else self.especiales).get(self.categoria.nombre)
+            if especiales:
+                return especiales.elegir(self.azar), True
+        return self.categoria.preguntas[posicion], False
+
+    def preparar_siguiente(self) -> None:
+        """Deja elegida la pregunta que sigue a la actual."""
+        siguiente = self.indice_pregunta + 1
+        if siguiente < len(self.categoria.preguntas):
+            self._preparada = (self._clave(siguiente), *self.elegir_pregunta(siguiente))
+
+    def siguiente_pregunta(self) -> Pregunta | None:
+        """Presenta la pregunta del índice actual, o None si la categoría terminó."""
+        if self.terminada:
+            self.pregunta_actual = None
+            return None
+        preparada, self._preparada = self._preparada, None
+        if preparada and preparada[0] == self._clave(self.indice_pregunta):
+            pregunta, especial = preparada[1], preparada[2]
+        else:
+            pregunta, especial = self.elegir_pregunta(self.indice_pregunta)
+        self.pregunta_actual = pregunta
+        self.pregunta_especial = especial
+        self.eliminadas = set()
+        clave_tiempo = "tiempo_especial" if especial else "tiempo_pregunta"
+        self.tiempo_limite = self.configuracion[clave_tiempo]
+        self.tiempo_restante = self.configuracion[clave_tiempo]
+        self._mostrada = self.reloj()
+        return pregunta
+
+    # Eventos
+
+    def _ubicacion(self) -> tuple[str, int]:
+        """Grupo e índice de la pregunta actual, con los nombres de ``banco.grupos_de_fuente``."""
+        nombre = self.categoria.nombre
+        if self.pregunta_especial:
+            especiales = (registro_especiales() if self.especiales is None else self.especiales)[nombre]
+            return f"{nombre} (especiales)", especiales.indice(self.pregunta_actual)
+        posicion = self._reservadas.get(self.indice_pregunta, -1) if self.con_repaso else self.indice_pregunta
+        # Un tema buscado (``busqueda.Tema``) sabe de qué grupo del banco viene cada pregunta.
+        ubicaciones = getattr(self.categoria, "ubicaciones", None)
+        if ubicaciones and 0 <= posicion < len(ubicaciones):
+            return ubicaciones[posicion]
+        return nombre, posicion
+
+    def _evento(self, tipo: str, **datos) -> None:
+        """Entrega el evento a ``eventos``; con pregunta actual agrega cuál es y cuánto se tardó."""
+        ahora = self.reloj()
+        evento = {"t": int(ahora * 1000), "tipo": tipo, "ronda": self._ronda, "dificultad": self.dificultad}
+        if self.pregunta_actual is not None and tipo != "partida_perdida":
+            grupo, indice = self._ubicacion()
+            evento.update(
+                grupo=grupo,
+                indice=indice,
+                ms=int((ahora - self._mostrada) * 1000),
+                limite=self.tiempo_limite,
+            )
+        evento.update(datos)
+        self.eventos(evento)
+
+    # Respuestas
+
+    def _informar_repaso(self, correcta: bool | None) -> None:
+        """Registra la respuesta a la pregunta actual en el repaso (None: no se respondió)."""
+        if not self.con_repaso or self.pregunta_actual is None:
+            return
+        indice = self._reservadas.pop(self.indice_pregunta, None)
+        if indice is None:
+            return
+        if correcta is None or self.pregunta_especial:
+            self.repaso.devolver(indice)
+        else:
+            self.repaso.registrar(indice, correcta, self.reloj())
+
+    def responder(self, indice: int) -> Resultado:
+        """Responde la pregunta actual con la opción número ``indice``."""
+        pregunta = self.pregunta_actual
+        if pregunta is None:
+            return Resultado(correcta=False)
+        correcta = indice == pregunta.indice_respuesta
+        if self.eventos is not None:
+            self._evento("respuesta", opcion=indice, correcta=correcta)
+        self._informar_repaso(correcta)
+        resultado = Resultado(correcta=correcta, retroalimentacion=pregunta.retroalimentacion)
+        if correcta:
+            self.puntaje += PUNTOS_POR_ACIERTO
+            if self.pregunta_especial and self.configuracion["vidas_extra_especial"] > 0:
+                self.vidas += 1
+                resultado.vida_extra = True
+        elif self.con_vidas:
+            self.vidas -= 1
+        self.indice_pregunta += 1
+        if not correcta and self.configuracion["reinicia_al_fallar"]:
+            resultado.partida_perdida = True
+            resultado.mensaje = f"Modo {self.dificultad}: fallaste la pregunta."
+        elif self.con_vidas and self.vidas <= 0:
+            resultado.partida_perdida = True
+            resultado.mensaje = "Has perdido todas las vidas."
+        if resultado.partida_perdida and self.eventos is not None:
+            self._evento("partida_perdida", motivo="respuesta", puntaje=self.puntaje)
+        return resultado
+
+    def perder_pregunta(self, mensaje: str, motivo: str = "perdida") -> Resultado:
+        """La pregunta cuenta como fallada (tiempo agotado, salir de la ventana...).
+
+        ``motivo`` solo se usa en el evento: ``"tiempo"``, ``"salida"``...
+        """
+        resultado = Resultado(correcta=False, mensaje=mensaje)
+        if self.eventos is not None:
+            self._evento("pregunta_perdida", motivo=motivo)
+        self._informar_repaso(False)
+        if self.con_vidas:
+            self.vidas = max(0, self.vidas - 1)
+        self.indice_pregunta += 1
+        if self.configuracion["reinicia_al_fallar"]:
+            resultado.partida_perdida = True
+            resultado.mensaje = f"Modo {self.dificultad}: perdiste la pregunta."
+        elif self.con_vidas and self.vidas <= 0:
+            resultado.partida_perdida = True
+            resultado.mensaje = "Has perdido todas las vidas."
+        if resultado.partida_perdida and self.eventos is not None:
+            self._evento("partida_perdida", motivo=motivo, puntaje=self.puntaje)
+        return resultado
+
+    def tiempo_agotado(self) -> Resultado:
+        return self.perder_pregunta("Se acabó el tiempo.", "tiempo")
+
+    # Comodines
+
+    def _consumir(self, comodin: str) -> bool:
+        if self.comodines.get(comodin, 0) <= 0:
+            return False
+        self.comodines[comodin] -= 1
+        if self.eventos is not None:
+            self._evento("comodin", comodin=comodin)
+        return True
+
+    def usar_pista(self) -> str | None:
+        if not self.pregunta_actual or not self._consumir("pista"):
+            return None
+        return f"Pista: la respuesta inicia con \"{self.pregunta_actual.respuesta[0]}\"."
+
+    def usar_saltar(self) -> bool:
+        if not self._consumir("saltar"):
+            return False
+        self._informar_repaso(None)
+        self.indice_pregunta += 1
+        return True
+
+    def usar_investigar(self) -> bool:
+        return self._consumir("investigar")
+
+    def usar_eliminar(self) -> list[int]:
+        """Descarta dos opciones incorrectas y devuelve sus índices."""
+        if self.comodines.get("eliminar", 0) <= 0 or not self.pregunta_actual:
+            return []
+        pregunta = self.pregunta_actual
+        disponibles = [
+            indice
+            for indice in range(len(pregunta.opciones))
+            if indice != pregunta.indice_respuesta and indice not in self.eliminadas
+        ]
+        if len(disponibles) < 2:
+            return []
+        elegidas = self.azar.sample(disponibles, 2)
+        self.eliminadas.update(elegidas)
+        self._consumir("eliminar")
+        return elegidas
+
+    # Guardado
+
+    def estado(self) -> dict:
+        return {
+            "indice_categoria": self.indice_categoria,
+            "indice_pregunta": self.indice_pregunta,
+            "vidas": self.vidas,
+            "puntaje": self.puntaje,
+            "tiempo_limite": self.tiempo_limite,
+            "tiempo_restante": self.tiempo_restante,
+            "pregunta_especial": self.pregunta_especial,
+            "comodines": dict(self.comodines),
+            "dificultad": self.dificultad,
+            "con_repaso": self.con_repaso,
+            "repasos": {nombre: repaso.estado() for nombre, repaso in self.repasos.items()},
+        }
+
+    def cargar_estado(self, estado: dict) -> None:
+        if estado.get("dificultad"):
+            self.aplicar_dificultad(estado["dificultad"])
+        self.indice_categoria = estado["indice_categoria"]
+        self.indice_pregunta = estado["indice_pregunta"]
+        self.vidas = estado["vidas"]
+        self.puntaje = estado["puntaje"]
+        self.tiempo_limite = estado["tiempo_limite"]
+        self.tiempo_restante = estado["tiempo_restante"]
+        self.pregunta_especial = estado["pregunta_especial"]
+        self.comodines = dict(estado["comodines"])
+        self.repasos = {nombre: Repaso.desde_estado(datos) for nombre, datos in estado["repasos"].items()}
+        self._barajar(estado["con_repaso"])
+        # Solo en partidas migradas desde la lista del orden (``guardados.migrar_registro``).
+        en_curso = estado.get("pregunta_en_curso")
+        if en_curso is not None and en_curso < len(self.categoria.preguntas):
+            self._reservadas[self.indice_pregunta] = en_curso
@@ -0,0 +1,177 @@
+"""Medición opcional de los puntos críticos de la interfaz.
+
+Uso::
+
+    python app_gui.py --perfil perfil.jsonl              # tiempos por punto crítico
+    python app_gui.py --cprofile sesion.pstats           # perfil completo de cProfile
+    JUEGO_PERFIL=perfil.jsonl python app_gui.py          # lo mismo, desde el entorno
+    python perfil.py perfil.jsonl                        # resume las sesiones medidas
+
+Con la medición encendida, ``Perfil.instrumentar`` reemplaza cada método
+elegido por una envoltura que mide su duración con ``perf_counter_ns`` y la
+suma a un histograma: un contador por potencia de dos de microsegundos, más
+el total y el máximo. Al cerrar la ventana se agrega al archivo una línea
+JSON con los datos de la sesión y una por punto medido, así las sesiones de
+varias computadoras se pueden juntar en un solo archivo.
+
+Apagada no cuesta nada: no se envuelve ningún método y el juego ejecuta
+exactamente el mismo código que sin este módulo.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import platform
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+VARIABLE_PERFIL = "JUEGO_PERFIL"
+VARIABLE_CPROFILE = "JUEGO_CPROFILE"
+# La cubeta ``i`` cuenta las llamadas de menos de 2^i microsegundos (y al menos 2^(i-1)).
+CUBETAS = 32
+
+
+@dataclass
+class Histograma:
+    llamadas: int = 0
+    total_ns: int = 0
+    maximo_ns: int = 0
+    cubetas: list[int] = field(default_factory=lambda: [0] * CUBETAS)
+
+    def registrar(self, nanosegundos: int) -> None:
+        self.llamadas += 1
+        self.total_ns += nanosegundos
+        if nanosegundos > self.maximo_ns:
+            self.maximo_ns = nanosegundos
+        self.cubetas[min((nanosegundos // 1000).bit_length(), CUBETAS - 1)] += 1
+
+    def sumar(self, otro: Histograma) -> None:
+        self.llamadas += otro.llamadas
+        self.total_ns += otro.total_ns
+        self.maximo_ns = max(self.maximo_ns, otro.maximo_ns)
+        self.cubetas = [propia + ajena for propia, ajena in zip(self.cubetas, otro.cubetas)]
+
+    def percentil(self, fraccion: float) -> float:
+        """Cota superior en milisegundos del percentil pedido (el borde de su cubeta)."""
+        objetivo = fraccion * self.llamadas
+        acumuladas = 0
+        for cubeta, cantidad in enumerate(self.cubetas):
+            acumuladas += cantidad
+            if cantidad and acumuladas >= objetivo:
+                return min((1 << cubeta) / 1000, self.maximo_ns / 1_000_000)
+        return self.maximo_ns / 1_000_000
+
+    def resumen(self) -> dict:
+        return {
+            "llamadas": self.llamadas,
+            "total_ms": round(self.total_ns / 1_000_000, 3),
+            "media_ms": round(self.total_ns / self.llamadas / 1_000_000, 4) if self.llamadas else 0.0,
+            "p50_ms": round(self.percentil(0.5), 4),
+            "p95_ms": round(self.percentil(0.95), 4),
+            "maximo_ms": round(self.maximo_ns / 1_000_000, 4),
+            "cubetas_us": {str(1 << cubeta): cantidad for cubeta, cantidad in enumerate(self.cubetas) if cantidad},
+        }
+
+    @classmethod
+    def desde_resumen(cls, datos: dict) -> Histograma:
+        cubetas = [0] * CUBETAS
+        for limite, cantidad in datos["cubetas_us"].items():
+            cubetas[int(limite).bit_length() - 1] = cantidad
+        return cls(
+            llamadas=datos["llamadas"],
+            total_ns=round(datos["total_ms"] * 1_000_000),
+            maximo_ns=round(datos["maximo_ms"] * 1_000_000),
+            cubetas=cubetas,
+        )
+
+
+class Perfil:
+    def __init__(self) -> None:
+        self.histogramas: dict[str, Histograma] = {}
+        self.inicio = time.time()
+
+    def medir(self, nombre: str, funcion: Callable) -> Callable:
+        histograma = self.histogramas.setdefault(nombre, Histograma())
+        reloj = time.perf_counter_ns
+
+        @functools.wraps(funcion)
+        def medida(*argumentos, **opciones):
+            inicio = reloj()
+            try:
+                return funcion(*argumentos, **opciones)
+            finally:
+                histograma.registrar(reloj() - inicio)
+
+        return medida
+
+    def instrumentar(self, objeto: object, nombres: Iterable[str], prefijo: str | None = None) -> None:
+        """Reemplaza los atributos ``nombres`` de ``objeto`` (clase o módulo) por versiones medidas."""
+        prefijo = prefijo or getattr(objeto, "__name__", type(objeto).__name__)
+        for nombre in nombres:
+            setattr(objeto, nombre, self.medir(f"{prefijo}.{nombre}", getattr(objeto, nombre)))
+
+    def exportar(self, ruta: Path) -> None:
+        """Agrega la sesión a ``ruta`` como líneas JSON."""
+        lineas = [
+            {
+                "tipo": "sesion",
+                "fecha": datetime.fromtimestamp(self.inicio).isoformat(timespec="seconds"),
+                "duracion_s": round(time.time() - self.inicio, 1),
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+            }
+        ]
+        lineas.extend({"tipo": "punto", "nombre": nombre, **histograma.resumen()} for nombre, histograma in self.histogramas.items())
+        with ruta.open("a", encoding="utf-8") as archivo:
+            archivo.writelines(json.dumps(linea, ensure_ascii=False) + "\n" for linea in lineas)
+
+
+def leer_sesiones(ruta: Path) -> tuple[int, dict[str, Histograma]]:
+    """Junta los histogramas de todas las sesiones de un archivo JSON por líneas."""
+    sesiones = 0
+    histogramas: dict[str, Histograma] = {}
+    with ruta.open("r", encoding="utf-8") as archivo:
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            datos = json.loads(linea)
+            if datos["tipo"] == "sesion":
+                sesiones += 1
+            elif datos["tipo"] == "punto":
+                histogramas.setdefault(datos["nombre"], Histograma()).sumar(Histograma.desde_resumen(datos))
+    return sesiones, histogramas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resume los tiempos medidos con --perfil.")
+    parser.add_argument("archivos", nargs="+", type=Path, help="archivos JSON por líneas de una o más computadoras")
+    parser.add_argument("--json", action="store_true", help="escribe el resumen en JSON")
+    argumentos = parser.parse_args()
+
+    sesiones = 0
+    total: dict[str, Histograma] = {}
+    for ruta in argumentos.archivos:
+        cantidad, histogramas = leer_sesiones(ruta)
+        sesiones += cantidad
+        for nombre, histograma in histogramas.items():
+            total.setdefault(nombre, Histograma()).sumar(histograma)
+    resumenes = {nombre: histograma.resumen() for nombre, histograma in sorted(total.items(), key=lambda par: -par[1].total_ns)}
+    if argumentos.json:
+        print(json.dumps({"sesiones": sesiones, "puntos": resumenes}, indent=2, ensure_ascii=False))
+        return
+    print(f"{sesiones} sesiones")
+    print(f"{'punto':<45} {'llamadas':>9} {'media ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'máx ms':>9}")
+    for nombre, resumen in resumenes.items():
+        print(
+            f"{nombre:<45} {resumen['llamadas']:>9} {resumen['media_ms']:>9.3f} "
+            f"{resumen['p50_ms']:>8.3f} {resumen['p95_ms']:>8.3f} {resumen['maximo_ms']:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
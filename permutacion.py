@@ -0,0 +1,53 @@
+"""Orden al azar de ``range(total)`` sin guardar la lista.
+
+``Permutacion(total, semilla)[i]`` devuelve el elemento ``i`` de una
+permutación pseudoaleatoria de ``0 .. total - 1`` fijada por la semilla. Es
+una red de Feistel de cuatro rondas sobre el menor dominio de ``2^(2k)``
+valores que contiene a ``total``: la red es biyectiva sobre ese dominio
+cualquiera sea la función de ronda, y los valores que caen fuera de
+``range(total)`` se vuelven a cifrar hasta caer dentro ("cycle walking").
+Como el dominio es menos de cuatro veces ``total``, cada consulta hace en
+promedio menos de cuatro cifrados: ``O(1)`` en tiempo y memoria, sin importar
+el tamaño de la categoría.
+"""
+
+from __future__ import annotations
+
+import random
+
+RONDAS = 4
+
+
+class Permutacion:
+    def __init__(self, total: int, semilla: int) -> None:
+        self.total = total
+        self.semilla = semilla
+        bits = max(2, (total - 1).bit_length())
+        self._mitad = (bits + 1) // 2
+        self._mascara = (1 << self._mitad) - 1
+        azar = random.Random(semilla)
+        self._claves = [azar.getrandbits(32) for _ in range(RONDAS)]
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _ronda(self, valor: int, clave: int) -> int:
+        # Mezcla de enteros al estilo de los hash de 32 bits; no necesita ser
+        # invertible porque la red de Feistel ya lo es.
+        valor = ((valor ^ clave) * 0x45D9F3B) & 0xFFFFFFFF
+        valor = ((valor ^ (valor >> 16)) * 0x45D9F3B) & 0xFFFFFFFF
+        return (valor ^ (valor >> 16)) & self._mascara
+
+    def _cifrar(self, valor: int) -> int:
+        izquierda, derecha = valor >> self._mitad, valor & self._mascara
+        for clave in self._claves:
+            izquierda, derecha = derecha, izquierda ^ self._ronda(derecha, clave)
+        return (izquierda << self._mitad) | derecha
+
+    def __getitem__(self, indice: int) -> int:
+        if not 0 <= indice < self.total:
+            raise IndexError(indice)
+        valor = self._cifrar(indice)
+        while valor >= self.total:
+            valor = self._cifrar(valor)
+        return valor
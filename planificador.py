@@ -0,0 +1,98 @@
+"""Planificador de llamadas diferidas para la interfaz gráfica.
+
+Todas las esperas de la ventana (temporizadores, animaciones, comprobaciones)
+pasan por aquí con un nombre. Programar de nuevo un nombre cancela la llamada
+anterior, y ``cancelar_todo`` limpia lo pendiente al cerrar.
+
+Las cuentas regresivas se miden contra un límite absoluto de
+``time.monotonic()``: cada aviso se agenda para el próximo segundo entero
+antes del límite, así el retraso de una llamada no se suma a la siguiente y
+una pregunta de 30 segundos dura 30 segundos aunque el bucle de eventos esté
+ocupado.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+import tkinter as tk
+from collections.abc import Callable
+
+
+class Planificador:
+    def __init__(self, raiz: tk.Misc) -> None:
+        self.raiz = raiz
+        self._pendientes: dict[str, str] = {}
+        self._limites: dict[str, float] = {}
+
+    def despues(self, nombre: str, segundos: float, funcion: Callable[[], None]) -> None:
+        """Ejecuta ``funcion`` dentro de ``segundos``, reemplazando la anterior con ese nombre."""
+        self.cancelar(nombre)
+        self._agendar(nombre, max(0, math.ceil(segundos * 1000)), funcion)
+
+    def en_reposo(self, nombre: str, funcion: Callable[[], None]) -> None:
+        """Ejecuta ``funcion`` cuando la ventana quede ociosa, si no estaba ya pendiente."""
+        if nombre in self._pendientes:
+            return
+
+        def ejecutar() -> None:
+            self._pendientes.pop(nombre, None)
+            funcion()
+
+        self._pendientes[nombre] = self.raiz.after_idle(ejecutar)
+
+    def cuenta_regresiva(
+        self,
+        nombre: str,
+        segundos: int,
+        al_cambiar: Callable[[int], None],
+        al_terminar: Callable[[], None],
+    ) -> None:
+        """Avisa cada segundo restante con ``al_cambiar`` y llama ``al_terminar`` al llegar a cero."""
+        self.cancelar(nombre)
+        limite = time.monotonic() + segundos
+        self._limites[nombre] = limite
+        ultimo = segundos
+
+        def avanzar() -> None:
+            nonlocal ultimo
+            faltan = limite - time.monotonic()
+            restante = math.ceil(faltan)
+            if restante <= 0:
+                self._limites.pop(nombre, None)
+                al_cambiar(0)
+                al_terminar()
+                return
+            if restante != ultimo:
+                ultimo = restante
+                al_cambiar(restante)
+            # Próximo cambio de segundo, medido desde el límite y no desde este aviso.
+            self._agendar(nombre, max(1, math.ceil((faltan - (restante - 1)) * 1000)), avanzar)
+
+        al_cambiar(segundos)
+        self._agendar(nombre, 1000 if segundos > 0 else 0, avanzar)
+
+    def restante(self, nombre: str) -> float:
+        """Segundos que faltan para el límite de una cuenta regresiva (0 si no hay)."""
+        limite = self._limites.get(nombre)
+        return max(0.0, limite - time.monotonic()) if limite is not None else 0.0
+
+    def pendiente(self, nombre: str) -> bool:
+        return nombre in self._pendientes
+
+    def _agendar(self, nombre: str, milisegundos: int, funcion: Callable[[], None]) -> None:
+        def ejecutar() -> None:
+            self._pendientes.pop(nombre, None)
+            funcion()
+
+        self._pendientes[nombre] = self.raiz.after(milisegundos, ejecutar)
+
+    def cancelar(self, nombre: str) -> None:
+        identificador = self._pendientes.pop(nombre, None)
+        self._limites.pop(nombre, None)
+        if identificador is not None:
+            self.raiz.after_cancel(identificador)
+
+    def cancelar_todo(self) -> None:
+        for nombre in list(self._pendientes):
+            self.cancelar(nombre)
@@ -0,0 +1,231 @@
+"""Prueba de carga del servidor del juego (``servidor.py``).
+
+Uso::
+
+    python servidor.py --puerto 8000 &
+    python prueba_carga.py --puerto 8000 --clientes 50,200,500 --partidas 3
+
+Cada cliente simula un navegador: abre una conexión persistente, inicia una
+partida, pide preguntas, responde al azar, usa algún comodín y guarda al
+terminar. Por cada cantidad de clientes simultáneos se informa el total de
+solicitudes, solicitudes por segundo, errores y la latencia por solicitud en
+milisegundos, en JSON, para ver hasta dónde escala el servidor.
+
+Con ``--sala 300`` se mide en cambio una sala de clase: 300 jugadores
+esperan con espera larga, el anfitrión muestra ``--preguntas`` preguntas y
+se informa cuánto tarda cada pregunta en llegar a todos (difusión) y en
+reunir todas las respuestas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+
+class ClienteHttp:
+    """Cliente HTTP/1.1 mínimo sobre una sola conexión keep-alive."""
+
+    def __init__(self, host: str, puerto: int) -> None:
+        self.host = host
+        self.puerto = puerto
+        self.lector: asyncio.StreamReader | None = None
+        self.escritor: asyncio.StreamWriter | None = None
+        self.latencias: list[float] = []
+        self.errores = 0
+
+    async def abrir(self) -> None:
+        self.lector, self.escritor = await asyncio.open_connection(self.host, self.puerto)
+
+    async def solicitar(
+        self, metodo: str, ruta: str, cuerpo: dict | None = None, permitido: int | None = None
+    ) -> tuple[int, dict]:
+        """Envía una solicitud; los estados de error cuentan como errores salvo ``permitido``."""
+        contenido = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else b""
+        inicio = time.perf_counter()
+        self.escritor.write(
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(contenido)}\r\n\r\n".encode("latin-1")
+            + contenido
+        )
+        await self.escritor.drain()
+        estado = int((await self.lector.readline()).split()[1])
+        largo = 0
+        while (linea := await self.lector.readline()) not in (b"\r\n", b""):
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            if nombre.lower() == "content-length":
+                largo = int(valor)
+        datos = json.loads(await self.lector.readexactly(largo)) if largo else {}
+        self.latencias.append(time.perf_counter() - inicio)
+        if estado >= 400 and estado != permitido:
+            self.errores += 1
+        return estado, datos
+
+    async def cerrar(self) -> None:
+        if self.escritor is not None:
+            self.escritor.close()
+            await self.escritor.wait_closed()
+
+
+async def jugar(cliente: ClienteHttp, partidas: int, azar: random.Random, numero: int) -> None:
+    await cliente.abrir()
+    try:
+        for _ in range(partidas):
+            _, datos = await cliente.solicitar("POST", "/api/partidas", {"categoria": azar.randrange(5)})
+            sesion = datos["sesion"]
+            while True:
+                _, datos = await cliente.solicitar("GET", f"/api/partidas/{sesion}/pregunta")
+                if datos.get("terminada", True):
+                    break
+                if datos["partida"]["comodines"].get("eliminar") and azar.random() < 0.2:
+                    await cliente.solicitar("POST", f"/api/partidas/{sesion}/comodin", {"tipo": "eliminar"})
+                opciones = len(datos["pregunta"]["opciones"])
+                _, datos = await cliente.solicitar(
+                    "POST", f"/api/partidas/{sesion}/respuesta", {"indice": azar.randrange(opciones)}
+                )
+                if datos.get("partida_perdida"):
+                    break
+            await cliente.solicitar("POST", f"/api/partidas/{sesion}/guardar", {"nombre": f"carga{numero:05d}"})
+            await cliente.solicitar("DELETE", f"/api/partidas/{sesion}")
+    finally:
+        await cliente.cerrar()
+
+
+def _resumir(segundos: list[float]) -> dict:
+    muestras = sorted(valor * 1000 for valor in segundos)
+    if not muestras:
+        return {"muestras": 0}
+    return {
+        "muestras": len(muestras),
+        "mediana_ms": round(statistics.median(muestras), 3),
+        "p95_ms": round(muestras[min(len(muestras) - 1, int(len(muestras) * 0.95))], 3),
+        "p99_ms": round(muestras[min(len(muestras) - 1, int(len(muestras) * 0.99))], 3),
+        "maximo_ms": round(muestras[-1], 3),
+    }
+
+
+async def medir(host: str, puerto: int, clientes: int, partidas: int, semilla: int) -> dict:
+    azar = random.Random(semilla)
+    conjunto = [ClienteHttp(host, puerto) for _ in range(clientes)]
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(
+        *(jugar(cliente, partidas, random.Random(azar.random()), numero) for numero, cliente in enumerate(conjunto)),
+        return_exceptions=True,
+    )
+    duracion = time.perf_counter() - inicio
+    latencias = [latencia for cliente in conjunto for latencia in cliente.latencias]
+    return {
+        "clientes": clientes,
+        "partidas_por_cliente": partidas,
+        "duracion_s": round(duracion, 3),
+        "solicitudes": len(latencias),
+        "solicitudes_por_segundo": round(len(latencias) / duracion, 1),
+        "errores_http": sum(cliente.errores for cliente in conjunto),
+        "clientes_fallidos": sum(isinstance(resultado, Exception) for resultado in resultados),
+        "latencia": _resumir(latencias),
+    }
+
+
+async def jugador_de_sala(
+    cliente: ClienteHttp, codigo: str, numero: int, azar: random.Random, mostradas: dict[int, float], llegadas: list[float]
+) -> None:
+    await cliente.abrir()
+    try:
+        _, datos = await cliente.solicitar("POST", f"/api/salas/{codigo}/jugadores", {"nombre": f"jugador{numero:05d}"})
+        clave, version, vista = datos["jugador"], datos["version"], 0
+        while True:
+            estado, datos = await cliente.solicitar(
+                "GET", f"/api/salas/{codigo}/eventos?jugador={clave}&desde={version}", permitido=404
+            )
+            if estado == 404 or datos["sala"]["fase"] == "terminada":
+                # El anfitrión cerró la sala.
+                return
+            version, sala = datos["version"], datos["sala"]
+            if sala["fase"] == "pregunta" and sala["numero"] != vista:
+                vista = sala["numero"]
+                llegadas.append(time.perf_counter() - mostradas[vista])
+                opciones = len(sala["pregunta"]["opciones"])
+                await cliente.solicitar(
+                    "POST", f"/api/salas/{codigo}/respuesta", {"jugador": clave, "indice": azar.randrange(opciones)}
+                )
+    finally:
+        await cliente.cerrar()
+
+
+async def medir_sala(host: str, puerto: int, jugadores: int, preguntas: int, semilla: int) -> dict:
+    azar = random.Random(semilla)
+    anfitrion = ClienteHttp(host, puerto)
+    await anfitrion.abrir()
+    _, datos = await anfitrion.solicitar("POST", "/api/salas", {"dificultad": "principiante"})
+    codigo, clave = datos["codigo"], datos["anfitrion"]
+    mostradas: dict[int, float] = {}
+    llegadas: list[float] = []
+    conjunto = [ClienteHttp(host, puerto) for _ in range(jugadores)]
+    tareas = [
+        asyncio.create_task(jugador_de_sala(cliente, codigo, numero, random.Random(azar.random()), mostradas, llegadas))
+        for numero, cliente in enumerate(conjunto)
+    ]
+    _, datos = await anfitrion.solicitar("GET", f"/api/salas/{codigo}/panel?anfitrion={clave}")
+    version = datos["version"]
+    while datos["sala"]["jugadores"] < jugadores:
+        _, datos = await anfitrion.solicitar("GET", f"/api/salas/{codigo}/panel?anfitrion={clave}&desde={version}")
+        version = datos["version"]
+
+    recoleccion = []
+    despertares = 0
+    for numero in range(1, preguntas + 1):
+        mostradas[numero] = inicio = time.perf_counter()
+        _, datos = await anfitrion.solicitar("POST", f"/api/salas/{codigo}/siguiente", {"anfitrion": clave})
+        version = datos["version"]
+        while datos["sala"].get("respuestas", {}).get("respondidas", 0) < jugadores:
+            _, datos = await anfitrion.solicitar("GET", f"/api/salas/{codigo}/panel?anfitrion={clave}&desde={version}")
+            version = datos["version"]
+            despertares += 1
+        recoleccion.append(time.perf_counter() - inicio)
+        await anfitrion.solicitar("POST", f"/api/salas/{codigo}/cerrar", {"anfitrion": clave})
+    await anfitrion.solicitar("DELETE", f"/api/salas/{codigo}?anfitrion={clave}")
+    resultados = await asyncio.gather(*tareas, return_exceptions=True)
+    await anfitrion.cerrar()
+    return {
+        "jugadores": jugadores,
+        "preguntas": preguntas,
+        "difusion": _resumir(llegadas),
+        "todas_las_respuestas": _resumir(recoleccion),
+        "despertares_del_panel": despertares,
+        "errores_http": sum(cliente.errores for cliente in conjunto) + anfitrion.errores,
+        "clientes_fallidos": sum(isinstance(resultado, Exception) for resultado in resultados),
+    }
+
+
+async def ejecutar(host: str, puerto: int, niveles: list[int], partidas: int, semilla: int) -> list[dict]:
+    return [await medir(host, puerto, clientes, partidas, semilla) for clientes in niveles]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor del juego.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--clientes", default="10,50,200", help="clientes simultáneos por ronda, separados por comas")
+    parser.add_argument("--partidas", type=int, default=3, help="partidas que juega cada cliente")
+    parser.add_argument("--semilla", type=int, default=1234)
+    parser.add_argument("--sala", type=int, default=0, help="jugadores de una sala de clase (0: partidas individuales)")
+    parser.add_argument("--preguntas", type=int, default=5, help="preguntas que muestra el anfitrión de la sala")
+    argumentos = parser.parse_args()
+
+    if argumentos.sala:
+        informe = asyncio.run(
+            medir_sala(argumentos.host, argumentos.puerto, argumentos.sala, argumentos.preguntas, argumentos.semilla)
+        )
+        print(json.dumps(informe, indent=2, ensure_ascii=False))
+        return
+    niveles = [int(valor) for valor in argumentos.clientes.split(",") if valor]
+    informe = asyncio.run(ejecutar(argumentos.host, argumentos.puerto, niveles, argumentos.partidas, argumentos.semilla))
+    print(json.dumps(informe, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
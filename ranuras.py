@@ -0,0 +1,164 @@
+"""Partidas de la consola en ranuras con nombre dentro de un solo archivo.
+
+El archivo es JSON por líneas. La primera línea es el índice: por ranura, su
+resumen (fecha y lo que quiera mostrar quien guarda) y dónde está su
+contenido, como inicio y largo en bytes contados desde el final del índice.
+Cada línea siguiente es el contenido de una ranura::
+
+    {"formato":"ranuras","version":1,"ranuras":{"ana":{"inicio":0,"largo":52,"fecha":"...","puntaje":30}}}
+    {"period_index":0,"level_index":1,"score":30}
+
+Listar las ranuras lee solo la primera línea y abrir una lee solo sus bytes.
+Los cambios quedan pendientes hasta ``descargar``, que reescribe el archivo
+una sola vez para todos con ``guardados.escribir_atomico_bytes``: así un
+corte a mitad de camino deja el archivo viejo entero. Los contenidos que no cambiaron se copian como bytes, sin
+interpretarlos.
+
+Un archivo que no se puede leer (vacío, cortado o de otra cosa) se trata como
+si no tuviera ranuras y se avisa en ``aviso``; la primera ``descargar`` lo
+copia a ``<nombre>.danado`` antes de pisarlo.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+from guardados import escribir_atomico_bytes
+
+FORMATO = "ranuras"
+VERSION = 1
+
+
+def _serializar(datos: dict) -> bytes:
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class ArchivoRanuras:
+    def __init__(self, ruta: Path) -> None:
+        self.ruta = ruta
+        # Nombre -> resumen con "inicio" y "largo" del contenido en el archivo.
+        self._indice: dict[str, dict] = {}
+        self._inicio_datos = 0
+        # Nombre -> (resumen, contenido) por escribir, o None si hay que borrarla.
+        self._pendientes: dict[str, tuple[dict, dict] | None] = {}
+        # Contenido de un archivo de una sola partida de versiones anteriores;
+        # quien abre el archivo decide en qué ranura guardarlo.
+        self.anterior: dict | None = None
+        # Por qué no se pudo leer el archivo, o None si se leyó bien.
+        self.aviso: str | None = None
+        self._leer_indice()
+
+    @property
+    def ruta_danado(self) -> Path:
+        return self.ruta.with_name(self.ruta.name + ".danado")
+
+    def _leer_indice(self) -> None:
+        if not self.ruta.exists():
+            return
+        with self.ruta.open("rb") as archivo:
+            primera = archivo.readline()
+            try:
+                indice = json.loads(primera)
+            except ValueError:
+                indice = None
+            if not isinstance(indice, dict) or indice.get("formato") != FORMATO:
+                # Un ``savegame.json`` de antes: una sola partida en JSON con sangría.
+                archivo.seek(0)
+                try:
+                    anterior = json.load(archivo)
+                except ValueError:
+                    anterior = None
+                if isinstance(anterior, dict):
+                    self.anterior = anterior
+                else:
+                    self.aviso = f"{self.ruta} está vacío o dañado; al guardar se aparta como {self.ruta_danado.name}."
+                return
+            if indice.get("version", 0) > VERSION:
+                raise ValueError(f"Versión de ranuras no soportada: {indice['version']}")
+            if not isinstance(indice.get("ranuras"), dict):
+                self.aviso = f"El índice de {self.ruta} está dañado; al guardar se aparta como {self.ruta_danado.name}."
+                return
+            self._indice = indice["ranuras"]
+            self._inicio_datos = len(primera)
+
+    def nombres(self) -> list[str]:
+        vigentes = [nombre for nombre in self._indice if nombre not in self._pendientes]
+        vigentes.extend(nombre for nombre, cambio in self._pendientes.items() if cambio is not None)
+        return vigentes
+
+    def resumen(self, nombre: str) -> dict | None:
+        if nombre in self._pendientes:
+            cambio = self._pendientes[nombre]
+            return None if cambio is None else cambio[0]
+        entrada = self._indice.get(nombre)
+        if entrada is None:
+            return None
+        return {clave: valor for clave, valor in entrada.items() if clave not in ("inicio", "largo")}
+
+    def listar(self) -> list[tuple[str, dict]]:
+        """Nombre y resumen de cada ranura, la más reciente primero, sin leer su contenido."""
+        ranuras = [(nombre, self.resumen(nombre)) for nombre in self.nombres()]
+        ranuras.sort(key=lambda par: par[1].get("fecha", ""), reverse=True)
+        return ranuras
+
+    def _crudo(self, entrada: dict) -> bytes:
+        with self.ruta.open("rb") as archivo:
+            archivo.seek(self._inicio_datos + entrada["inicio"])
+            return archivo.read(entrada["largo"])
+
+    def obtener(self, nombre: str) -> dict | None:
+        """Contenido de la ranura: un acceso al índice y una lectura de sus bytes."""
+        if nombre in self._pendientes:
+            cambio = self._pendientes[nombre]
+            return None if cambio is None else cambio[1]
+        entrada = self._indice.get(nombre)
+        if entrada is None:
+            return None
+        return json.loads(self._crudo(entrada))
+
+    def guardar(self, nombre: str, contenido: dict, resumen: dict | None = None) -> None:
+        """Deja la ranura pendiente de escribir; ``descargar`` la pasa al disco."""
+        resumen = {"fecha": datetime.now().isoformat(timespec="seconds"), **(resumen or {})}
+        self._pendientes[nombre] = (resumen, contenido)
+
+    def eliminar(self, nombre: str) -> None:
+        self._pendientes[nombre] = None
+
+    def descargar(self) -> None:
+        """Escribe todos los cambios pendientes de una vez, de forma atómica."""
+        if not self._pendientes:
+            return
+        indice: dict[str, dict] = {}
+        contenidos: list[bytes] = []
+        posicion = 0
+        previos = b""
+        if self._indice:
+            # Los contenidos que siguen igual se copian de una sola lectura.
+            with self.ruta.open("rb") as archivo:
+                archivo.seek(self._inicio_datos)
+                previos = archivo.read()
+        for nombre in self.nombres():
+            cambio = self._pendientes.get(nombre)
+            if cambio is None:
+                entrada = self._indice[nombre]
+                resumen = self.resumen(nombre)
+                crudo = previos[entrada["inicio"] : entrada["inicio"] + entrada["largo"]]
+            else:
+                resumen, contenido = cambio
+                crudo = _serializar(contenido)
+            indice[nombre] = {"inicio": posicion, "largo": len(crudo), **resumen}
+            contenidos.append(crudo)
+            posicion += len(crudo)
+        cabecera = _serializar({"formato": FORMATO, "version": VERSION, "ranuras": indice})
+        if self.aviso is not None and self.ruta.exists():
+            # Lo que no se pudo leer se conserva por si se puede recuperar a mano.
+            shutil.copyfile(self.ruta, self.ruta_danado)
+        escribir_atomico_bytes(self.ruta, [cabecera, *contenidos])
+        self._indice = indice
+        self._inicio_datos = len(cabecera)
+        self._pendientes.clear()
+        self.anterior = None
+        self.aviso = None
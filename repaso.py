@@ -0,0 +1,154 @@
+"""Repaso espaciado de las preguntas de una categoría para un jugador.
+
+Cada pregunta que el jugador ya vio tiene una ficha al estilo SM-2:
+repeticiones seguidas acertadas, intervalo hasta el próximo repaso, facilidad
+y minuto en que vence. Acertar alarga el intervalo (1 día, 6 días y después
+el intervalo anterior por la facilidad); fallar la devuelve a los pocos
+minutos y baja su facilidad.
+
+``siguiente`` elige la pregunta en este orden:
+
+1. la ficha vencida más antigua;
+2. una pregunta que el jugador nunca vio, en el orden de una ``Permutacion``
+   fijada por la semilla (las nuevas se presentan en ese orden, así que basta
+   un cursor para saber cuáles ya salieron);
+3. la ficha que vence antes, aunque todavía no venza.
+
+Las fichas están en un montículo ordenado por vencimiento, así que elegir y
+registrar cuestan ``O(log n)`` aunque la categoría tenga 100 000 preguntas.
+El montículo no se guarda: ``reiniciar`` lo arma de nuevo al empezar cada
+ronda en tiempo proporcional a las preguntas vistas, no al total. Lo que se
+guarda (``estado``) es la semilla, el cursor y una lista plana de enteros,
+cinco por pregunta vista (índice y ficha).
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+
+from permutacion import Permutacion
+
+MINUTOS_DIA = 24 * 60
+# Una pregunta fallada vuelve a salir a los 10 minutos.
+PASO_REAPRENDER = 10
+# Facilidad en centésimas, como el factor de SM-2 (2,5 inicial, 1,3 mínimo).
+FACILIDAD_INICIAL = 250
+FACILIDAD_MINIMA = 130
+CALIDAD_ACIERTO = 4
+CALIDAD_FALLO = 2
+
+
+def _ajustar_facilidad(facilidad: int, calidad: int) -> int:
+    """Fórmula de SM-2 en centésimas: EF + 0,1 - (5 - q)(0,08 + (5 - q)0,02)."""
+    error = 5 - calidad
+    return max(FACILIDAD_MINIMA, facilidad + 10 - error * (8 + error * 2))
+
+
+@dataclass
+class Repaso:
+    semilla: int
+    # indice -> [repeticiones, intervalo (min), facilidad, vence (min desde 1970)]
+    fichas: dict[int, list[int]] = field(default_factory=dict)
+    total: int = 0
+    # Posición en la permutación de la próxima pregunta nueva.
+    cursor: int = 0
+    _monticulo: list[tuple[int, int]] = field(default_factory=list, repr=False)
+    _nuevas: Permutacion | None = field(default=None, repr=False)
+    # Nuevas que ya salieron y aún no se respondieron: índice -> posición.
+    _en_vuelo: dict[int, int] = field(default_factory=dict, repr=False)
+
+    def reiniciar(self, total: int) -> None:
+        """Prepara una ronda sobre una categoría de ``total`` preguntas."""
+        if total != self.total:
+            # Con otro total la permutación cambia: se recorre desde el principio.
+            self.cursor = 0
+        self.cursor = min([self.cursor, *self._en_vuelo.values()])
+        self._en_vuelo.clear()
+        self.total = total
+        self._nuevas = Permutacion(total, self.semilla)
+        self._monticulo = [(ficha[3], indice) for indice, ficha in self.fichas.items() if indice < total]
+        heapq.heapify(self._monticulo)
+
+    def _vigente(self, vence: int, indice: int) -> bool:
+        # Al registrar una respuesta la entrada vieja queda en el montículo;
+        # se reconoce porque su vencimiento ya no coincide con el de la ficha.
+        ficha = self.fichas.get(indice)
+        return ficha is not None and ficha[3] == vence
+
+    def siguiente(self, ahora: float) -> int:
+        """Índice de la próxima pregunta; sale del montículo hasta que se registre."""
+        minuto = int(ahora // 60)
+        monticulo = self._monticulo
+        while monticulo and not self._vigente(*monticulo[0]):
+            heapq.heappop(monticulo)
+        if monticulo and monticulo[0][0] <= minuto:
+            return heapq.heappop(monticulo)[1]
+        while self.cursor < self.total:
+            posicion = self.cursor
+            self.cursor += 1
+            indice = self._nuevas[posicion]
+            if indice not in self.fichas and indice not in self._en_vuelo:
+                self._en_vuelo[indice] = posicion
+                return indice
+        if monticulo:
+            return heapq.heappop(monticulo)[1]
+        # Todas las preguntas salieron y ninguna se respondió: otra vuelta.
+        if not self.total:
+            raise IndexError("La categoría no tiene preguntas.")
+        self.reiniciar(self.total)
+        return self.siguiente(ahora)
+
+    def registrar(self, indice: int, correcta: bool, ahora: float) -> None:
+        """Actualiza la ficha según la respuesta y la devuelve al montículo."""
+        minuto = int(ahora // 60)
+        self._en_vuelo.pop(indice, None)
+        repeticiones, intervalo, facilidad, _ = self.fichas.get(indice, (0, 0, FACILIDAD_INICIAL, 0))
+        if correcta:
+            repeticiones += 1
+            if repeticiones == 1:
+                intervalo = MINUTOS_DIA
+            elif repeticiones == 2:
+                intervalo = 6 * MINUTOS_DIA
+            else:
+                intervalo = intervalo * facilidad // 100
+            facilidad = _ajustar_facilidad(facilidad, CALIDAD_ACIERTO)
+        else:
+            repeticiones = 0
+            intervalo = PASO_REAPRENDER
+            facilidad = _ajustar_facilidad(facilidad, CALIDAD_FALLO)
+        vence = minuto + intervalo
+        self.fichas[indice] = [repeticiones, intervalo, facilidad, vence]
+        heapq.heappush(self._monticulo, (vence, indice))
+
+    def devolver(self, indice: int) -> None:
+        """La pregunta salió pero no se respondió (se saltó): vuelve tal como estaba."""
+        ficha = self.fichas.get(indice)
+        if ficha is not None:
+            heapq.heappush(self._monticulo, (ficha[3], indice))
+        elif indice in self._en_vuelo:
+            # Sigue siendo nueva: el cursor vuelve a su posición.
+            self.cursor = min(self.cursor, self._en_vuelo.pop(indice))
+
+    def estado(self) -> dict:
+        fichas = []
+        for indice, ficha in self.fichas.items():
+            fichas.append(indice)
+            fichas.extend(ficha)
+        return {
+            "semilla": self.semilla,
+            "total": self.total,
+            "cursor": min([self.cursor, *self._en_vuelo.values()]),
+            "fichas": fichas,
+        }
+
+    @classmethod
+    def desde_estado(cls, datos: dict) -> Repaso:
+        plano = datos.get("fichas", [])
+        fichas = {plano[posicion]: plano[posicion + 1 : posicion + 5] for posicion in range(0, len(plano), 5)}
+        return cls(
+            semilla=datos["semilla"],
+            fichas=fichas,
+            total=datos.get("total", 0),
+            cursor=datos.get("cursor", 0),
+        )
@@ -0,0 +1,225 @@
+"""Salas de clase: todos los jugadores responden la misma pregunta a la vez.
+
+Un anfitrión (el docente) avanza las preguntas de una categoría y cada
+jugador tiene ``tiempo_pregunta`` segundos para responder, con el perfil de
+dificultad de ``motor.obtener_configuracion``: vidas iniciales, tiempo por
+pregunta y si un fallo elimina al jugador.
+
+Cada respuesta busca en ``log n`` pasos: el conteo por opción es un contador
+por índice y la clasificación es una lista ordenada de claves
+``(-puntaje, tiempo_ms, nombre)`` donde la respuesta ubica con ``bisect`` la
+clave vieja del jugador y el lugar de la nueva. Sacar y meter la clave sí
+corre la lista (``O(n)``), pero es una sola copia de memoria contigua, sin
+comparar claves, y con las salas de una clase sigue siendo despreciable.
+El panel del anfitrión nunca recorre a todos los jugadores; solo cerrar una
+pregunta lo hace, una vez, para descontar a quien no respondió. Quien entra
+con una pregunta abierta espera a la siguiente: esa no le cuenta.
+
+Como ``MotorJuego``, este módulo no sabe nada de red: el servidor lo maneja
+y difunde los cambios.
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+
+from banco import Pregunta
+from motor import PUNTOS_POR_ACIERTO, GrupoPreguntas, obtener_configuracion
+from permutacion import Permutacion
+
+TAMANO_PODIO = 10
+
+
+@dataclass
+class JugadorSala:
+    nombre: str
+    vidas: int
+    puntaje: int = 0
+    aciertos: int = 0
+    # Suma de los tiempos de respuesta; desempata la clasificación.
+    tiempo_ms: int = 0
+    # Índice elegido en la pregunta actual (None si aún no responde).
+    respuesta: int | None = None
+    ultima_correcta: bool | None = None
+    eliminado: bool = False
+    # Entró con una pregunta abierta: juega desde la siguiente y esa no le cuenta.
+    en_espera: bool = False
+
+    @property
+    def clave(self) -> tuple[int, int, str]:
+        return (-self.puntaje, self.tiempo_ms, self.nombre)
+
+
+@dataclass
+class Sala:
+    codigo: str
+    categoria: GrupoPreguntas
+    dificultad: str = "normal"
+    # Segundos de gracia tras el límite para cubrir la latencia de la red.
+    margen: float = 0.0
+    azar: random.Random = field(default_factory=random.Random)
+    configuracion: dict = field(default_factory=dict)
+    jugadores: dict[str, JugadorSala] = field(default_factory=dict)
+    clasificacion: list[tuple[int, int, str]] = field(default_factory=list)
+    orden: Permutacion | None = None
+    # "espera", "pregunta", "resultado" o "terminada".
+    fase: str = "espera"
+    indice: int = -1
+    pregunta: Pregunta | None = None
+    abierta_desde: float = 0.0
+    limite: float = 0.0
+    conteo: list[int] = field(default_factory=list)
+    respondidas: int = 0
+    _nombres: set[str] = field(default_factory=set, repr=False)
+
+    def __post_init__(self) -> None:
+        self.configuracion = obtener_configuracion(self.dificultad)
+        self.orden = Permutacion(len(self.categoria.preguntas), self.azar.getrandbits(32))
+
+    @property
+    def tiempo_pregunta(self) -> int:
+        return self.configuracion["tiempo_pregunta"]
+
+    @property
+    def con_vidas(self) -> bool:
+        return self.configuracion["vidas_iniciales"] > 0
+
+    def unir(self, clave: str, nombre: str) -> JugadorSala:
+        nombre = nombre.strip()
+        if not nombre:
+            raise ValueError("Escribe un nombre para entrar a la sala.")
+        if nombre in self._nombres:
+            raise ValueError("Ya hay un jugador con ese nombre en la sala.")
+        if self.fase == "terminada":
+            raise ValueError("La sala ya terminó.")
+        jugador = JugadorSala(
+            nombre=nombre, vidas=self.configuracion["vidas_iniciales"], en_espera=self.fase == "pregunta"
+        )
+        self.jugadores[clave] = jugador
+        self._nombres.add(nombre)
+        insort(self.clasificacion, jugador.clave)
+        return jugador
+
+    def siguiente(self, ahora: float) -> Pregunta | None:
+        """Muestra la pregunta siguiente a todos, o termina la sala si no quedan."""
+        if self.fase == "pregunta":
+            self.cerrar(ahora)
+        for jugador in self.jugadores.values():
+            jugador.respuesta = None
+            jugador.en_espera = False
+        self.indice += 1
+        if self.indice >= len(self.orden):
+            self.fase = "terminada"
+            self.pregunta = None
+            return None
+        self.pregunta = self.categoria.preguntas[self.orden[self.indice]]
+        self.fase = "pregunta"
+        self.abierta_desde = ahora
+        self.limite = ahora + self.tiempo_pregunta
+        self.conteo = [0] * len(self.pregunta.opciones)
+        self.respondidas = 0
+        return self.pregunta
+
+    def responder(self, clave: str, indice: int, ahora: float) -> JugadorSala:
+        jugador = self.jugadores.get(clave)
+        if jugador is None:
+            raise ValueError("No estás en esta sala.")
+        if self.fase != "pregunta" or ahora > self.limite + self.margen:
+            raise ValueError("La pregunta ya está cerrada.")
+        if jugador.eliminado:
+            raise ValueError("Ya no te quedan vidas en esta sala.")
+        if jugador.en_espera:
+            raise ValueError("Entraste con la pregunta abierta; juegas desde la siguiente.")
+        if jugador.respuesta is not None:
+            raise ValueError("Ya respondiste esta pregunta.")
+        if not 0 <= indice < len(self.conteo):
+            raise ValueError("Opción inválida.")
+
+        posicion = bisect_left(self.clasificacion, jugador.clave)
+        del self.clasificacion[posicion]
+        jugador.respuesta = indice
+        jugador.tiempo_ms += int((min(ahora, self.limite) - self.abierta_desde) * 1000)
+        correcta = indice == self.pregunta.indice_respuesta
+        jugador.ultima_correcta = correcta
+        if correcta:
+            jugador.puntaje += PUNTOS_POR_ACIERTO
+            jugador.aciertos += 1
+        else:
+            self._fallar(jugador)
+        insort(self.clasificacion, jugador.clave)
+        self.conteo[indice] += 1
+        self.respondidas += 1
+        return jugador
+
+    def _fallar(self, jugador: JugadorSala) -> None:
+        if self.con_vidas:
+            jugador.vidas = max(0, jugador.vidas - 1)
+        if self.configuracion["reinicia_al_fallar"] or (self.con_vidas and jugador.vidas == 0):
+            jugador.eliminado = True
+
+    def cerrar(self, ahora: float) -> None:
+        """Cierra la pregunta; quien la vio y no respondió la pierde como al agotarse el tiempo."""
+        if self.fase != "pregunta":
+            return
+        self.fase = "resultado"
+        self.limite = min(self.limite, ahora)
+        for jugador in self.jugadores.values():
+            if jugador.respuesta is None and not jugador.eliminado and not jugador.en_espera:
+                jugador.ultima_correcta = False
+                self._fallar(jugador)
+
+    def posicion(self, jugador: JugadorSala) -> int:
+        return bisect_left(self.clasificacion, jugador.clave) + 1
+
+    def podio(self, limite: int = TAMANO_PODIO) -> list[dict]:
+        return [
+            {"posicion": posicion, "nombre": nombre, "puntaje": -puntaje}
+            for posicion, (puntaje, _tiempo, nombre) in enumerate(self.clasificacion[:limite], start=1)
+        ]
+
+    def resumen(self, ahora: float) -> dict:
+        """Lo que ven todos los jugadores: fase, pregunta (sin respuesta) y podio."""
+        datos = {
+            "codigo": self.codigo,
+            "categoria": self.categoria.nombre,
+            "dificultad": self.dificultad,
+            "fase": self.fase,
+            "numero": self.indice + 1,
+            "total": len(self.orden),
+            "jugadores": len(self.jugadores),
+            "podio": self.podio(),
+        }
+        if self.pregunta is not None:
+            datos["pregunta"] = {
+                "enunciado": self.pregunta.enunciado,
+                "opciones": self.pregunta.opciones,
+                "tiempo_pregunta": self.tiempo_pregunta,
+                "tiempo_restante": round(max(0.0, self.limite - ahora), 1) if self.fase == "pregunta" else 0,
+            }
+        if self.fase == "resultado":
+            datos["resultado"] = {
+                "respuesta": self.pregunta.indice_respuesta,
+                "retroalimentacion": self.pregunta.retroalimentacion,
+                "conteo": self.conteo,
+            }
+        return datos
+
+    def estado_jugador(self, jugador: JugadorSala) -> dict:
+        return {
+            "nombre": jugador.nombre,
+            "puntaje": jugador.puntaje,
+            "vidas": jugador.vidas,
+            "posicion": self.posicion(jugador),
+            "respondio": jugador.respuesta is not None,
+            "ultima_correcta": jugador.ultima_correcta,
+            "eliminado": jugador.eliminado,
+            "en_espera": jugador.en_espera,
+        }
+
+    def panel(self, ahora: float) -> dict:
+        """Vista del anfitrión: el resumen más las respuestas que van llegando."""
+        datos = self.resumen(ahora)
+        datos["respuestas"] = {"respondidas": self.respondidas, "conteo": self.conteo}
+        return datos
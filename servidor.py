@@ -0,0 +1,614 @@
+"""Servidor HTTP/JSON local que ofrece el motor del juego a los navegadores.
+
+Uso::
+
+    python servidor.py --puerto 8000
+
+Todo corre en un solo hilo con ``asyncio``: cada conexión es una corrutina y
+las partidas viven en una tabla de sesiones en memoria, así que un equipo
+modesto atiende un laboratorio completo sin un hilo por navegador. Las
+conexiones se mantienen abiertas entre solicitudes (HTTP/1.1 keep-alive). Los
+guardados pasan por ``EscrituraDiferida``: la solicitud solo toca la copia en
+memoria y el disco se actualiza en segundo plano.
+
+API (cuerpos y respuestas en JSON):
+
+- ``GET  /api/categorias``: categorías y dificultades disponibles.
+- ``POST /api/partidas``: ``{"dificultad", "categoria", "cargar"}`` (todo
+  opcional; ``cargar`` es el nombre de una partida guardada). Devuelve la
+  ``sesion``.
+- ``GET  /api/partidas/<sesion>``: estado de la partida.
+- ``GET  /api/partidas/<sesion>/pregunta``: pregunta actual sin la respuesta.
+- ``POST /api/partidas/<sesion>/respuesta``: ``{"opcion"}`` o ``{"indice"}``.
+- ``POST /api/partidas/<sesion>/comodin``: ``{"tipo"}`` (``pista``,
+  ``saltar``, ``investigar`` o ``eliminar``).
+- ``POST /api/partidas/<sesion>/guardar``: ``{"nombre"}``.
+- ``DELETE /api/partidas/<sesion>``: termina la sesión.
+
+Salas de clase (ver ``sala.py``); ``anfitrion`` y ``jugador`` son las claves
+que devuelven la creación de la sala y la entrada del jugador, y en los
+``GET`` van en la consulta (``?jugador=...&desde=3``):
+
+- ``POST /api/salas``: ``{"dificultad", "categoria"}``. Devuelve el
+  ``codigo`` de la sala y la clave del ``anfitrion``.
+- ``POST /api/salas/<codigo>/jugadores``: ``{"nombre"}``.
+- ``POST /api/salas/<codigo>/siguiente``: el anfitrión muestra la pregunta
+  siguiente a todos; se cierra sola a los ``tiempo_pregunta`` segundos.
+- ``POST /api/salas/<codigo>/cerrar``: el anfitrión la cierra antes.
+- ``POST /api/salas/<codigo>/respuesta``: ``{"jugador", "indice"}``.
+- ``GET  /api/salas/<codigo>/eventos``: espera larga del jugador; responde
+  en cuanto la versión de la sala pasa de ``desde`` (o a los 25 segundos).
+- ``GET  /api/salas/<codigo>/panel``: espera larga del anfitrión; despierta
+  con cada respuesta, con el conteo por opción y la clasificación al día.
+- ``DELETE /api/salas/<codigo>``: el anfitrión cierra la sala.
+
+Las esperas largas no ocupan un hilo: todos los que esperan una sala
+comparten un único futuro que se resuelve al publicar el cambio.
+
+``/``, ``/app.js`` y ``/styles.css`` sirven la versión web del juego.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import secrets
+import time
+import traceback
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+from banco import Categoria, leer_manifiesto_categorias
+from guardados import EscrituraDiferida, crear_almacen, crear_registro
+from motor import DIFICULTADES, MotorJuego, Resultado
+from sala import Sala
+
+DIRECTORIO = Path(__file__).resolve().parent
+ARCHIVO_GUARDADO = Path("partidas_servidor.json")
+ESTATICOS = {
+    "/": ("index.html", "text/html; charset=utf-8"),
+    "/index.html": ("index.html", "text/html; charset=utf-8"),
+    "/app.js": ("app.js", "text/javascript; charset=utf-8"),
+    "/styles.css": ("styles.css", "text/css; charset=utf-8"),
+}
+MAXIMO_CUERPO = 64 * 1024
+MAXIMO_ENCABEZADOS = 100
+MAXIMO_SESIONES = 10_000
+DURACION_SESION = 2 * 60 * 60
+INTERVALO_LIMPIEZA = 60
+TIEMPO_INACTIVO = 30
+# Margen para la latencia de la red al comparar con el tiempo de la pregunta.
+MARGEN_RESPUESTA = 1.0
+ESPERA_MAXIMA = 25
+LETRAS_CODIGO = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+LARGO_CODIGO = 5
+
+
+class ErrorApi(Exception):
+    def __init__(self, estado: HTTPStatus, mensaje: str) -> None:
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+@dataclass
+class Sesion:
+    motor: MotorJuego
+    ultimo_uso: float = field(default_factory=time.monotonic)
+    # Límite (monotónico) para responder la pregunta entregada, o None si no hay ninguna.
+    limite: float | None = None
+
+
+class Aviso:
+    """Versión de un estado compartido a la que muchos pueden esperar a la vez."""
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._futuro: asyncio.Future | None = None
+
+    def avisar(self) -> None:
+        self.version += 1
+        if self._futuro is not None and not self._futuro.done():
+            self._futuro.set_result(self.version)
+        self._futuro = None
+
+    async def esperar(self, desde: int, segundos: float) -> int:
+        """Vuelve en cuanto la versión difiere de ``desde`` o al vencer el plazo."""
+        if self.version != desde:
+            return self.version
+        if self._futuro is None:
+            self._futuro = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._futuro), segundos)
+        except asyncio.TimeoutError:
+            pass
+        return self.version
+
+
+@dataclass
+class SalaEnVivo:
+    sala: Sala
+    anfitrion: str
+    # Los jugadores despiertan con cada cambio de fase; el anfitrión, también con cada respuesta.
+    aviso_jugadores: Aviso = field(default_factory=Aviso)
+    aviso_panel: Aviso = field(default_factory=Aviso)
+    cierre: asyncio.TimerHandle | None = None
+    ultimo_uso: float = field(default_factory=time.monotonic)
+
+    def avisar(self, jugadores: bool = True) -> None:
+        if jugadores:
+            self.aviso_jugadores.avisar()
+        self.aviso_panel.avisar()
+
+
+def _analizar_cabecera(cabecera: bytes) -> tuple[str, str, str, dict[str, str]]:
+    """Separa la línea de solicitud y los encabezados (en minúsculas)."""
+    lineas = cabecera.decode("latin-1").split("\r\n")
+    if len(lineas) > MAXIMO_ENCABEZADOS:
+        raise ValueError("demasiados encabezados")
+    metodo, ruta, version = lineas[0].split()
+    encabezados = {}
+    for linea in lineas[1:]:
+        if linea:
+            nombre, _, valor = linea.partition(":")
+            encabezados[nombre.strip().lower()] = valor.strip()
+    return metodo, ruta, version, encabezados
+
+
+def _pregunta_publica(sesion: Sesion) -> dict:
+    motor = sesion.motor
+    pregunta = motor.pregunta_actual
+    restante = None
+    if sesion.limite is not None and motor.tiempo_limite:
+        restante = max(0, round(sesion.limite - time.monotonic(), 1))
+    return {
+        "enunciado": pregunta.enunciado,
+        "opciones": pregunta.opciones,
+        "especial": motor.pregunta_especial,
+        "tiempo_limite": motor.tiempo_limite,
+        "tiempo_restante": restante,
+        "eliminadas": sorted(motor.eliminadas),
+    }
+
+
+def _resumen(motor: MotorJuego) -> dict:
+    return {
+        "categoria": motor.categoria.nombre,
+        "dificultad": motor.dificultad,
+        "indice_pregunta": motor.indice_pregunta,
+        "total_preguntas": len(motor.categoria.preguntas),
+        "vidas": motor.vidas,
+        "puntaje": motor.puntaje,
+        "comodines": motor.comodines,
+    }
+
+
+class ServidorJuego:
+    def __init__(self, categorias: list[Categoria], almacen: EscrituraDiferida) -> None:
+        self.categorias = categorias
+        self.almacen = almacen
+        self.sesiones: dict[str, Sesion] = {}
+        self.salas: dict[str, SalaEnVivo] = {}
+        self._estaticos: dict[str, bytes] = {}
+        self.solicitudes = 0
+
+    # Sesiones
+
+    def _sesion(self, identificador: str) -> Sesion:
+        sesion = self.sesiones.get(identificador)
+        if sesion is None:
+            raise ErrorApi(HTTPStatus.NOT_FOUND, "La sesión no existe o expiró.")
+        sesion.ultimo_uso = time.monotonic()
+        return sesion
+
+    def limpiar_sesiones(self) -> int:
+        """Descarta las sesiones y salas sin uso durante ``DURACION_SESION``."""
+        limite = time.monotonic() - DURACION_SESION
+        vencidas = [clave for clave, sesion in self.sesiones.items() if sesion.ultimo_uso < limite]
+        for clave in vencidas:
+            del self.sesiones[clave]
+        for codigo in [codigo for codigo, vivo in self.salas.items() if vivo.ultimo_uso < limite]:
+            self._quitar_sala(codigo)
+        return len(vencidas)
+
+    async def _limpiar_periodicamente(self) -> None:
+        while True:
+            await asyncio.sleep(INTERVALO_LIMPIEZA)
+            self.limpiar_sesiones()
+
+    # Operaciones de la API
+
+    def listar_categorias(self, _cuerpo: dict) -> dict:
+        return {
+            "categorias": [
+                {"nombre": categoria.nombre, "descripcion": categoria.descripcion, "total": categoria.total}
+                for categoria in self.categorias
+            ],
+            "dificultades": DIFICULTADES,
+        }
+
+    def crear_partida(self, cuerpo: dict) -> dict:
+        if len(self.sesiones) >= MAXIMO_SESIONES and not self.limpiar_sesiones():
+            raise ErrorApi(HTTPStatus.SERVICE_UNAVAILABLE, "Hay demasiadas partidas abiertas.")
+        dificultad = cuerpo.get("dificultad", "normal")
+        if dificultad not in DIFICULTADES:
+            raise ErrorApi(HTTPStatus.BAD_REQUEST, f"Dificultad desconocida: {dificultad}.")
+        motor = MotorJuego(self.categorias, dificultad=dificultad)
+        nombre = cuerpo.get("cargar")
+        if nombre:
+            if not isinstance(nombre, str):
+                raise ErrorApi(HTTPStatus.BAD_REQUEST, "El nombre de la partida debe ser texto.")
+            registro = self.almacen.obtener(nombre) if self.almacen.resumen(nombre) else None
+            if registro is None:
+                raise ErrorApi(HTTPStatus.NOT_FOUND, "No hay una partida guardada con ese nombre.")
+            motor.cargar_estado(registro["estado"])
+        else:
+            indice = cuerpo.get("categoria", 0)
+            if not isinstance(indice, int) or not 0 <= indice < len(self.categorias):
+                raise ErrorApi(HTTPStatus.BAD_REQUEST, "Categoría inválida.")
+            motor.iniciar_categoria(indice)
+        identificador = secrets.token_urlsafe(12)
+        self.sesiones[identificador] = Sesion(motor)
+        return {"sesion": identificador, "partida": _resumen(motor)}
+
+    def ver_partida(self, sesion: Sesion, _cuerpo: dict) -> dict:
+        return {"partida": _resumen(sesion.motor)}
+
+    def terminar_partida(self, identificador: str) -> dict:
+        if self.sesiones.pop(identificador, None) is None:
+            raise ErrorApi(HTTPStatus.NOT_FOUND, "La sesión no existe o expiró.")
+        return {"terminada": True}
+
+    def obtener_pregunta(self, sesion: Sesion, _cuerpo: dict) -> dict:
+        motor = sesion.motor
+        # Pedir la pregunta otra vez devuelve la misma hasta que se responda.
+        if sesion.limite is None:
+            if motor.siguiente_pregunta() is None:
+                return {"terminada": True, "partida": _resumen(motor)}
+            sesion.limite = time.monotonic() + motor.tiempo_limite
+        return {"terminada": False, "pregunta": _pregunta_publica(sesion), "partida": _resumen(motor)}
+
+    def responder(self, sesion: Sesion, cuerpo: dict) -> dict:
+        motor = sesion.motor
+        pregunta = motor.pregunta_actual
+        if sesion.limite is None or pregunta is None:
+            raise ErrorApi(HTTPStatus.CONFLICT, "Primero pide una pregunta.")
+        if "indice" in cuerpo:
+            indice = cuerpo["indice"]
+            if not isinstance(indice, int) or not 0 <= indice < len(pregunta.opciones):
+                raise ErrorApi(HTTPStatus.BAD_REQUEST, "Índice de opción inválido.")
+        else:
+            opcion = cuerpo.get("opcion")
+            if not isinstance(opcion, str):
+                raise ErrorApi(HTTPStatus.BAD_REQUEST, "Falta la opción elegida.")
+            # Un texto que no es ninguna opción cuenta como respuesta incorrecta.
+            indice = pregunta.opciones.index(opcion) if opcion in pregunta.opciones else -1
+        agotado = bool(motor.tiempo_limite) and time.monotonic() > sesion.limite + MARGEN_RESPUESTA
+        resultado = motor.tiempo_agotado() if agotado else motor.responder(indice)
+        sesion.limite = None
+        return self._con_resultado(motor, resultado, tiempo_agotado=agotado)
+
+    def _con_resultado(self, motor: MotorJuego, resultado: Resultado, tiempo_agotado: bool = False) -> dict:
+        respuesta = {
+            "correcta": resultado.correcta,
+            "retroalimentacion": resultado.retroalimentacion,
+            "vida_extra": resultado.vida_extra,
+            "tiempo_agotado": tiempo_agotado,
+            "partida_perdida": resultado.partida_perdida,
+            "mensaje": resultado.mensaje,
+        }
+        if resultado.partida_perdida:
+            # Igual que en la interfaz de escritorio: se vuelve a empezar la categoría.
+            motor.reiniciar_ronda()
+        respuesta["partida"] = _resumen(motor)
+        return respuesta
+
+    def usar_comodin(self, sesion: Sesion, cuerpo: dict) -> dict:
+        motor = sesion.motor
+        tipo = cuerpo.get("tipo")
+        if sesion.limite is None and tipo != "investigar":
+            raise ErrorApi(HTTPStatus.CONFLICT, "Primero pide una pregunta.")
+        if tipo == "pista":
+            pista = motor.usar_pista()
+            respuesta = {"pista": pista} if pista else None
+        elif tipo == "saltar":
+            respuesta = {"saltada": True} if motor.usar_saltar() else None
+            if respuesta:
+                sesion.limite = None
+        elif tipo == "investigar":
+            respuesta = {"segundos": 10} if motor.usar_investigar() else None
+        elif tipo == "eliminar":
+            eliminadas = motor.usar_eliminar()
+            respuesta = {"eliminadas": eliminadas} if eliminadas else None
+        else:
+            raise ErrorApi(HTTPStatus.BAD_REQUEST, "Comodín desconocido.")
+        if respuesta is None:
+            raise ErrorApi(HTTPStatus.CONFLICT, "No te quedan comodines de ese tipo.")
+        respuesta["partida"] = _resumen(motor)
+        return respuesta
+
+    def guardar(self, sesion: Sesion, cuerpo: dict) -> dict:
+        motor = sesion.motor
+        if not motor.configuracion["puede_guardar"]:
+            raise ErrorApi(HTTPStatus.FORBIDDEN, f"En modo {motor.dificultad} no se guardan partidas.")
+        nombre = str(cuerpo.get("nombre", "")).strip()
+        if not nombre:
+            raise ErrorApi(HTTPStatus.BAD_REQUEST, "Escribe un nombre para guardar la partida.")
+        registro = crear_registro(nombre, motor.estado(), self.almacen.resumen(nombre))
+        self.almacen.guardar(registro)
+        return {"guardada": True, "maximo_puntaje": registro["maximo_puntaje"]}
+
+    # Salas de clase
+
+    def _sala(self, codigo: str) -> SalaEnVivo:
+        vivo = self.salas.get(codigo.upper())
+        if vivo is None:
+            raise ErrorApi(HTTPStatus.NOT_FOUND, "La sala no existe o ya se cerró.")
+        vivo.ultimo_uso = time.monotonic()
+        return vivo
+
+    @staticmethod
+    def _exigir_anfitrion(vivo: SalaEnVivo, cuerpo: dict) -> None:
+        if not secrets.compare_digest(str(cuerpo.get("anfitrion", "")), vivo.anfitrion):
+            raise ErrorApi(HTTPStatus.FORBIDDEN, "Solo el anfitrión puede hacer esto.")
+
+    def crear_sala(self, cuerpo: dict) -> dict:
+        dificultad = cuerpo.get("dificultad", "normal")
+        if dificultad not in DIFICULTADES:
+            raise ErrorApi(HTTPStatus.BAD_REQUEST, f"Dificultad desconocida: {dificultad}.")
+        indice = cuerpo.get("categoria", 0)
+        if not isinstance(indice, int) or not 0 <= indice < len(self.categorias):
+            raise ErrorApi(HTTPStatus.BAD_REQUEST, "Categoría inválida.")
+        codigo = "".join(secrets.choice(LETRAS_CODIGO) for _ in range(LARGO_CODIGO))
+        while codigo in self.salas:
+            codigo = "".join(secrets.choice(LETRAS_CODIGO) for _ in range(LARGO_CODIGO))
+        sala = Sala(codigo, self.categorias[indice], dificultad, margen=MARGEN_RESPUESTA)
+        vivo = SalaEnVivo(sala, secrets.token_urlsafe(12))
+        self.salas[codigo] = vivo
+        return {"codigo": codigo, "anfitrion": vivo.anfitrion, "sala": sala.resumen(time.monotonic())}
+
+    def _quitar_sala(self, codigo: str) -> None:
+        vivo = self.salas.pop(codigo)
+        if vivo.cierre is not None:
+            vivo.cierre.cancel()
+        vivo.sala.fase = "terminada"
+        vivo.avisar()
+
+    def terminar_sala(self, vivo: SalaEnVivo, cuerpo: dict) -> dict:
+        self._exigir_anfitrion(vivo, cuerpo)
+        self._quitar_sala(vivo.sala.codigo)
+        return {"terminada": True}
+
+    def ver_sala(self, vivo: SalaEnVivo, _cuerpo: dict) -> dict:
+        return {"version": vivo.aviso_jugadores.version, "sala": vivo.sala.resumen(time.monotonic())}
+
+    def unir_a_sala(self, vivo: SalaEnVivo, cuerpo: dict) -> dict:
+        clave = secrets.token_urlsafe(12)
+        try:
+            jugador = vivo.sala.unir(clave, str(cuerpo.get("nombre", "")))
+        except ValueError as error:
+            raise ErrorApi(HTTPStatus.CONFLICT, str(error)) from None
+        vivo.avisar(jugadores=False)
+        return {
+            "jugador": clave,
+            "version": vivo.aviso_jugadores.version,
+            "sala": vivo.sala.resumen(time.monotonic()),
+            "estado": vivo.sala.estado_jugador(jugador),
+        }
+
+    def mostrar_siguiente(self, vivo: SalaEnVivo, cuerpo: dict) -> dict:
+        self._exigir_anfitrion(vivo, cuerpo)
+        if vivo.cierre is not None:
+            vivo.cierre.cancel()
+            vivo.cierre = None
+        sala = vivo.sala
+        if sala.siguiente(time.monotonic()) is not None:
+            vivo.cierre = asyncio.get_running_loop().call_later(
+                sala.tiempo_pregunta + MARGEN_RESPUESTA, self._cerrar_pregunta, vivo
+            )
+        vivo.avisar()
+        return {"version": vivo.aviso_panel.version, "sala": sala.panel(time.monotonic())}
+
+    def _cerrar_pregunta(self, vivo: SalaEnVivo) -> None:
+        vivo.cierre = None
+        vivo.sala.cerrar(time.monotonic())
+        vivo.avisar()
+
+    def cerrar_pregunta(self, vivo: SalaEnVivo, cuerpo: dict) -> dict:
+        self._exigir_anfitrion(vivo, cuerpo)
+        if vivo.cierre is not None:
+            vivo.cierre.cancel()
+        self._cerrar_pregunta(vivo)
+        return {"version": vivo.aviso_panel.version, "sala": vivo.sala.panel(time.monotonic())}
+
+    def responder_en_sala(self, vivo: SalaEnVivo, cuerpo: dict) -> dict:
+        indice = cuerpo.get("indice")
+        if not isinstance(indice, int):
+            raise ErrorApi(HTTPStatus.BAD_REQUEST, "Falta el índice de la opción elegida.")
+        try:
+            jugador = vivo.sala.responder(str(cuerpo.get("jugador", "")), indice, time.monotonic())
+        except ValueError as error:
+            raise ErrorApi(HTTPStatus.CONFLICT, str(error)) from None
+        # Solo el panel del anfitrión se entera de cada respuesta.
+        vivo.avisar(jugadores=False)
+        return {"recibida": True, "estado": vivo.sala.estado_jugador(jugador)}
+
+    @staticmethod
+    def _desde(cuerpo: dict) -> int:
+        try:
+            return int(cuerpo.get("desde", -1))
+        except (TypeError, ValueError):
+            raise ErrorApi(HTTPStatus.BAD_REQUEST, "«desde» debe ser un número.") from None
+
+    async def esperar_eventos(self, vivo: SalaEnVivo, cuerpo: dict) -> dict:
+        jugador = vivo.sala.jugadores.get(str(cuerpo.get("jugador", "")))
+        if jugador is None:
+            raise ErrorApi(HTTPStatus.NOT_FOUND, "No estás en esta sala.")
+        version = await vivo.aviso_jugadores.esperar(self._desde(cuerpo), ESPERA_MAXIMA)
+        return {
+            "version": version,
+            "sala": vivo.sala.resumen(time.monotonic()),
+            "estado": vivo.sala.estado_jugador(jugador),
+        }
+
+    async def esperar_panel(self, vivo: SalaEnVivo, cuerpo: dict) -> dict:
+        self._exigir_anfitrion(vivo, cuerpo)
+        version = await vivo.aviso_panel.esperar(self._desde(cuerpo), ESPERA_MAXIMA)
+        return {"version": version, "sala": vivo.sala.panel(time.monotonic())}
+
+    # HTTP
+
+    def _despachar_api(self, metodo: str, partes: list[str], cuerpo: dict) -> tuple[HTTPStatus, dict | Awaitable[dict]]:
+        if partes == ["api", "categorias"] and metodo == "GET":
+            return HTTPStatus.OK, self.listar_categorias(cuerpo)
+        if partes == ["api", "partidas"] and metodo == "POST":
+            return HTTPStatus.CREATED, self.crear_partida(cuerpo)
+        if partes == ["api", "salas"] and metodo == "POST":
+            return HTTPStatus.CREATED, self.crear_sala(cuerpo)
+        if len(partes) in (3, 4) and partes[:2] == ["api", "partidas"]:
+            accion = partes[3] if len(partes) == 4 else None
+            if (metodo, accion) == ("DELETE", None):
+                return HTTPStatus.OK, self.terminar_partida(partes[2])
+            operacion = {
+                ("GET", None): self.ver_partida,
+                ("GET", "pregunta"): self.obtener_pregunta,
+                ("POST", "respuesta"): self.responder,
+                ("POST", "comodin"): self.usar_comodin,
+                ("POST", "guardar"): self.guardar,
+            }.get((metodo, accion))
+            if operacion is not None:
+                return HTTPStatus.OK, operacion(self._sesion(partes[2]), cuerpo)
+        if len(partes) in (3, 4) and partes[:2] == ["api", "salas"]:
+            accion = partes[3] if len(partes) == 4 else None
+            operacion = {
+                ("GET", None): self.ver_sala,
+                ("DELETE", None): self.terminar_sala,
+                ("POST", "jugadores"): self.unir_a_sala,
+                ("POST", "siguiente"): self.mostrar_siguiente,
+                ("POST", "cerrar"): self.cerrar_pregunta,
+                ("POST", "respuesta"): self.responder_en_sala,
+                ("GET", "eventos"): self.esperar_eventos,
+                ("GET", "panel"): self.esperar_panel,
+            }.get((metodo, accion))
+            if operacion is not None:
+                return HTTPStatus.OK, operacion(self._sala(partes[2]), cuerpo)
+        raise ErrorApi(HTTPStatus.NOT_FOUND, "Ruta desconocida.")
+
+    async def despachar(self, metodo: str, ruta: str, cuerpo: bytes) -> tuple[HTTPStatus, bytes, str]:
+        """Atiende una solicitud ya leída; devuelve estado, contenido y tipo."""
+        self.solicitudes += 1
+        ruta, _, consulta = ruta.partition("?")
+        if metodo == "GET" and ruta in ESTATICOS:
+            archivo, tipo = ESTATICOS[ruta]
+            if archivo not in self._estaticos:
+                self._estaticos[archivo] = (DIRECTORIO / archivo).read_bytes()
+            return HTTPStatus.OK, self._estaticos[archivo], tipo
+        if metodo == "OPTIONS":
+            return HTTPStatus.NO_CONTENT, b"", "text/plain"
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+            if not isinstance(datos, dict):
+                raise ErrorApi(HTTPStatus.BAD_REQUEST, "El cuerpo debe ser un objeto JSON.")
+            if consulta:
+                datos = {**dict(parse_qsl(consulta)), **datos}
+            estado, respuesta = self._despachar_api(metodo, ruta.strip("/").split("/"), datos)
+            if inspect.isawaitable(respuesta):
+                respuesta = await respuesta
+        except ErrorApi as error:
+            estado, respuesta = error.estado, {"error": error.mensaje}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            estado, respuesta = HTTPStatus.BAD_REQUEST, {"error": "JSON inválido."}
+        except (ValueError, TypeError):
+            # Campos con tipos inesperados que llegaron hasta el motor o la sala.
+            estado, respuesta = HTTPStatus.BAD_REQUEST, {"error": "Solicitud inválida."}
+        except Exception:
+            # Un error del servidor no debe cortar la conexión sin respuesta.
+            traceback.print_exc()
+            estado, respuesta = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Error interno del servidor."}
+        contenido = json.dumps(respuesta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return estado, contenido, "application/json; charset=utf-8"
+
+    async def atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Atiende las solicitudes de una conexión hasta que el cliente la cierre."""
+        try:
+            while True:
+                try:
+                    cabecera = await asyncio.wait_for(lector.readuntil(b"\r\n\r\n"), TIEMPO_INACTIVO)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                try:
+                    metodo, ruta, version, encabezados = _analizar_cabecera(cabecera)
+                    largo = int(encabezados.get("content-length", "0"))
+                    if largo < 0:
+                        raise ValueError("largo negativo")
+                except ValueError:
+                    self._escribir(escritor, HTTPStatus.BAD_REQUEST, b"", "text/plain", mantener=False)
+                    break
+                if largo > MAXIMO_CUERPO:
+                    self._escribir(escritor, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, b"", "text/plain", mantener=False)
+                    break
+                cuerpo = await lector.readexactly(largo) if largo else b""
+                conexion = encabezados.get("connection", "").lower()
+                mantener = conexion == "keep-alive" or (version == "HTTP/1.1" and conexion != "close")
+                self._escribir(escritor, *await self.despachar(metodo, ruta, cuerpo), mantener=mantener)
+                await escritor.drain()
+                if not mantener:
+                    break
+        except asyncio.LimitOverrunError:
+            self._escribir(escritor, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, b"", "text/plain", mantener=False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    @staticmethod
+    def _escribir(
+        escritor: asyncio.StreamWriter, estado: HTTPStatus, contenido: bytes, tipo: str, mantener: bool
+    ) -> None:
+        cabecera = (
+            f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+            f"Content-Type: {tipo}\r\n"
+            f"Content-Length: {len(contenido)}\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Access-Control-Allow-Methods: GET, POST, DELETE, OPTIONS\r\n"
+            "Access-Control-Allow-Headers: Content-Type\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        escritor.write(cabecera.encode("latin-1") + contenido)
+
+    async def servir(self, host: str, puerto: int) -> None:
+        servidor = await asyncio.start_server(self.atender, host, puerto, backlog=1024)
+        limpieza = asyncio.create_task(self._limpiar_periodicamente())
+        direcciones = ", ".join(str(socket.getsockname()) for socket in servidor.sockets)
+        print(f"Servidor del juego escuchando en {direcciones}")
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            limpieza.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON del juego de Historia Universal.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--guardados", type=Path, default=ARCHIVO_GUARDADO, help="archivo de partidas guardadas")
+    argumentos = parser.parse_args()
+
+    almacen = EscrituraDiferida(crear_almacen(argumentos.guardados))
+    servidor = ServidorJuego(leer_manifiesto_categorias(), almacen)
+    try:
+        asyncio.run(servidor.servir(argumentos.host, argumentos.puerto))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        almacen.cerrar()
+
+
+if __name__ == "__main__":
+    main()
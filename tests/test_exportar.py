@@ -0,0 +1,41 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from exportar import Exportador
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def proyecto(tmp_path):
+    shutil.copytree(RAIZ / "datos", tmp_path / "datos", ignore=shutil.ignore_patterns(".exportacion", ".busqueda.db"))
+    for nombre in ("index.html", "app.js"):
+        shutil.copy(RAIZ / nombre, tmp_path / nombre)
+    return tmp_path
+
+
+def exportar(proyecto, comprobar=False, forzar=False):
+    return Exportador(proyecto / "datos", proyecto, forzar=forzar).ejecutar(comprobar=comprobar)
+
+
+def test_el_repositorio_esta_al_dia(proyecto):
+    assert exportar(proyecto, comprobar=True, forzar=True) == []
+
+
+def test_especiales_por_categoria(proyecto):
+    ruta = proyecto / "datos" / "categorias" / "especiales.json"
+    datos = json.loads(ruta.read_text(encoding="utf-8"))
+    nueva = {"enunciado": "¿Pregunta nueva?", "opciones": ["Sí", "No"], "respuesta": "Sí", "retroalimentacion": "Sí."}
+    datos["especiales"]["Edad Media"].append(nueva)
+    ruta.write_text(json.dumps(datos, ensure_ascii=False), encoding="utf-8")
+
+    assert exportar(proyecto, comprobar=True) == ["index.html"]
+    assert "¿Pregunta nueva?" not in (proyecto / "index.html").read_text(encoding="utf-8")
+    assert exportar(proyecto) == ["index.html"]
+    html = (proyecto / "index.html").read_text(encoding="utf-8")
+    bloque = html[html.index("const ESPECIALES") : html.index("// </banco-generado>")]
+    assert '"Edad Media": [' in bloque and "¿Pregunta nueva?" in bloque
+    assert exportar(proyecto, comprobar=True) == []
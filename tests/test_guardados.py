@@ -0,0 +1,156 @@
+import pytest
+
+from guardados import MAGIA, AlmacenDiario, AlmacenSQLite, EscrituraDiferida, crear_almacen, crear_registro
+
+
+def registro(nombre, puntaje):
+    return crear_registro(nombre, {"puntaje": puntaje})
+
+
+class AlmacenRoto(AlmacenDiario):
+    """Falla al guardar ciertas partidas, como un disco lleno."""
+
+    def guardar(self, registro):
+        if registro["nombre"].startswith("roto"):
+            raise OSError("disco lleno")
+        super().guardar(registro)
+
+
+def test_escritura_diferida_sobrevive_a_un_almacen_que_falla(tmp_path):
+    almacen = AlmacenRoto(tmp_path / "guardados.jsonl")
+    diferida = EscrituraDiferida(almacen, intervalo=0.01)
+    diferida.guardar(registro("roto", 1))
+    diferida.guardar(registro("ana", 2))
+    diferida.descargar()
+    estadisticas = diferida.estadisticas()
+    assert estadisticas["errores"] == 1
+    assert "disco lleno" in estadisticas["ultimo_error"]
+    assert estadisticas["profundidad_cola"] == 0
+    # El hilo sigue vivo: lo que se guarda después llega al almacén.
+    diferida.guardar(registro("beto", 3))
+    diferida.cerrar()
+    leido = AlmacenDiario(tmp_path / "guardados.jsonl")
+    assert {registro["nombre"] for registro in leido.leer_todos()} == {"ana", "beto"}
+    leido.cerrar()
+
+
+def test_resumen_no_lee_el_almacen(tmp_path, monkeypatch):
+    almacen = AlmacenDiario(tmp_path / "guardados.jsonl")
+    almacen.guardar(registro("ana", 40))
+    almacen.compactar(esperar=True)
+    almacen.cerrar()
+    almacen = AlmacenDiario(tmp_path / "guardados.jsonl")
+    diferida = EscrituraDiferida(almacen, intervalo=0.01)
+    diferida.descargar()
+    monkeypatch.setattr(almacen, "obtener", lambda nombre: pytest.fail("leyó el almacén"))
+    resumen = diferida.resumen("ana")
+    assert resumen["maximo_puntaje"] == 40
+    nuevo = crear_registro("ana", {"puntaje": 10}, resumen)
+    assert (nuevo["id"], nuevo["maximo_puntaje"]) == (resumen["id"], 40)
+    assert diferida.resumen("nadie") is None
+    monkeypatch.undo()
+    diferida.cerrar()
+
+
+@pytest.mark.parametrize("compresion", ["zlib", "lzma", "ninguna"])
+def test_instantanea_binaria_ida_y_vuelta(tmp_path, compresion):
+    ruta = tmp_path / "guardados.jsonl"
+    almacen = AlmacenDiario(ruta, compresion=compresion)
+    # Más de dos bloques de la instantánea.
+    for numero in range(150):
+        almacen.guardar(registro(f"jugador{numero:03d}", numero))
+    almacen.compactar(esperar=True)
+    almacen.cerrar()
+    assert ruta.read_bytes()[: len(MAGIA)] == MAGIA
+
+    almacen = AlmacenDiario(ruta, compresion=compresion)
+    # Solo se leyó el índice: las partidas son resúmenes hasta pedirlas.
+    assert almacen.total() == 150
+    assert almacen.obtener("jugador042")["estado"] == {"puntaje": 42}
+    todos = almacen.leer_todos()
+    assert [partida["nombre"] for partida in todos] == [f"jugador{numero:03d}" for numero in reversed(range(150))]
+    assert all(partida["estado"] == {"puntaje": partida["maximo_puntaje"]} for partida in todos)
+    almacen.cerrar()
+
+
+def test_compactar_mientras_se_guarda(tmp_path):
+    ruta = tmp_path / "guardados.jsonl"
+    almacen = AlmacenDiario(ruta)
+    for numero in range(300):
+        almacen.guardar(registro(f"jugador{numero}", 0))
+    almacen.compactar(esperar=True)
+    almacen.cerrar()
+
+    # Un diario corto fuerza varias compactaciones en segundo plano mientras
+    # se guarda y se leen resúmenes de la instantánea vieja.
+    almacen = AlmacenDiario(ruta, limite_diario=40)
+    esperado = {}
+    for paso in range(1200):
+        nombre = f"jugador{(paso * 7) % 300}"
+        almacen.guardar(registro(nombre, paso))
+        esperado[nombre] = paso
+        leido = almacen.obtener(f"jugador{(paso * 13) % 300}")
+        assert leido["estado"]["puntaje"] == esperado.get(leido["nombre"], 0)
+    almacen.cerrar()
+
+    almacen = AlmacenDiario(ruta)
+    for numero in range(300):
+        nombre = f"jugador{numero}"
+        assert almacen.obtener(nombre)["estado"] == {"puntaje": esperado.get(nombre, 0)}
+    almacen.cerrar()
+
+
+def test_diario_con_la_ultima_linea_cortada(tmp_path):
+    ruta = tmp_path / "guardados.jsonl"
+    almacen = AlmacenDiario(ruta)
+    for nombre, puntaje in [("ana", 10), ("beto", 20), ("carla", 30)]:
+        almacen.guardar(registro(nombre, puntaje))
+    almacen.cerrar()
+    diario = almacen._ruta_diario(0)
+    # Un cierre inesperado a mitad de una escritura deja la línea sin terminar.
+    with diario.open("a", encoding="utf-8") as archivo:
+        archivo.write('{"op":"guardar","registro":{"nombre":"da')
+
+    almacen = AlmacenDiario(ruta)
+    assert {partida["nombre"] for partida in almacen.leer_todos()} == {"ana", "beto", "carla"}
+    almacen.guardar(registro("dora", 40))
+    almacen.cerrar()
+
+    almacen = AlmacenDiario(ruta)
+    assert almacen.obtener("dora")["estado"] == {"puntaje": 40}
+    assert almacen.total() == 4
+    almacen.cerrar()
+
+
+def test_almacen_sqlite(tmp_path):
+    ruta = tmp_path / "guardados.db"
+    almacen = AlmacenSQLite(ruta)
+    for nombre, puntaje in [("ana", 10), ("beto", 50), ("carla", 30)]:
+        almacen.guardar(registro(nombre, puntaje))
+    # Volver a guardar una partida la pasa a ser la más reciente.
+    almacen.guardar(crear_registro("ana", {"puntaje": 5}, almacen.obtener("ana")))
+    almacen.eliminar("carla")
+    almacen.cerrar()
+
+    almacen = AlmacenSQLite(ruta)
+    assert [partida["nombre"] for partida in almacen.leer_todos()] == ["ana", "beto"]
+    assert [partida["nombre"] for bloque in almacen.iterar(1) for partida in bloque] == ["ana", "beto"]
+    assert [partida["nombre"] for partida in almacen.mejores(1)] == ["beto"]
+    assert almacen.obtener("ana")["maximo_puntaje"] == 10
+    assert almacen.obtener("carla") is None
+    almacen.cerrar()
+
+
+def test_sqlite_importa_el_diario_al_estrenarse(tmp_path):
+    ruta = tmp_path / "guardados.jsonl"
+    diario = AlmacenDiario(ruta)
+    for numero in range(5):
+        diario.guardar(registro(f"jugador{numero}", numero))
+    diario.compactar(esperar=True)
+    diario.cerrar()
+
+    almacen = crear_almacen(ruta, "sqlite")
+    assert almacen.total() == 5
+    assert almacen.obtener("jugador3")["estado"] == {"puntaje": 3}
+    assert [partida["nombre"] for partida in almacen.leer_todos()][0] == "jugador4"
+    almacen.cerrar()
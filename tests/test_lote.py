@@ -0,0 +1,51 @@
+import io
+import json
+
+import pytest
+
+import main
+from main import construir_periodos, jugar_lote
+from ranuras import ArchivoRanuras
+
+
+@pytest.fixture(scope="module")
+def periodos():
+    return construir_periodos()
+
+
+def test_lote_sin_ranuras_no_abre_el_archivo(periodos):
+    salida = io.StringIO()
+    jugadas = jugar_lote(periodos, ["1 2 1", ""], salida, ranuras=lambda: pytest.fail("abrió las ranuras"))
+    assert jugadas == 1
+    assert json.loads(salida.getvalue())["respondidas"] == 3
+
+
+def test_lote_guarda_las_ranuras_al_final(periodos, tmp_path):
+    archivo = ArchivoRanuras(tmp_path / "savegame.json")
+    guiones = [json.dumps({"respuestas": [1, 2], "ranura": "ana"}), "1"]
+    jugar_lote(periodos, guiones, io.StringIO(), ranuras=lambda: archivo)
+    assert ArchivoRanuras(tmp_path / "savegame.json").nombres() == ["ana"]
+
+
+@pytest.mark.parametrize(
+    "anterior",
+    [{"period_index": 9, "level_index": 0, "score": 5}, {"period_index": 0, "level_index": -1}, {"period_index": "1"}],
+)
+def test_partida_anterior_fuera_de_rango_se_aparta(periodos, tmp_path, monkeypatch, anterior):
+    ruta = tmp_path / "savegame.json"
+    ruta.write_text(json.dumps(anterior, indent=4), encoding="utf-8")
+    monkeypatch.setattr(main, "ARCHIVO_GUARDADO", ruta)
+    ranuras = main.abrir_ranuras(periodos)
+    assert ranuras.aviso is not None and ranuras.nombres() == []
+    main.guardar_partida(ranuras, "ana", periodos, 0, 0, 10)
+    assert json.loads(ranuras.ruta_danado.read_text(encoding="utf-8")) == anterior
+    assert ArchivoRanuras(ruta).nombres() == ["ana"]
+
+
+def test_partida_anterior_valida_pasa_a_la_ranura(periodos, tmp_path, monkeypatch):
+    ruta = tmp_path / "savegame.json"
+    ruta.write_text(json.dumps({"period_index": 1, "level_index": 0, "score": 40}), encoding="utf-8")
+    monkeypatch.setattr(main, "ARCHIVO_GUARDADO", ruta)
+    ranuras = main.abrir_ranuras(periodos)
+    assert ranuras.aviso is None
+    assert ranuras.obtener(main.RANURA_PREDETERMINADA) == {"period_index": 1, "level_index": 0, "score": 40}
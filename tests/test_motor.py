@@ -0,0 +1,61 @@
+from banco import Pregunta
+from busqueda import Tema
+from motor import PUNTOS_POR_ACIERTO, MotorJuego
+
+
+class Grupo:
+    def __init__(self, nombre, total):
+        self.nombre = nombre
+        self.preguntas = [Pregunta.crear(f"{nombre} {i}", ["a", "b", "c"], "a", "") for i in range(total)]
+
+
+def crear_motor(categorias, eventos=None):
+    return MotorJuego(categorias, dificultad="facil", especiales={}, eventos=eventos)
+
+
+def test_practica_por_tema_no_toca_los_repasos_y_nombra_la_pregunta_original():
+    categorias = [Grupo("Antigüedad", 5)]
+    eventos = []
+    motor = crear_motor(categorias, eventos.append)
+    motor.configuracion = {**motor.configuracion, "probabilidad_especial": 0}
+    motor.iniciar_categoria(0)
+    ubicaciones = [("Antigüedad", 3), ("Siglo XX (difíciles)", 1)]
+    tema = Tema("Tema: roma", [categorias[0].preguntas[3], categorias[0].preguntas[1]], ubicaciones)
+    motor.categorias = [*categorias, tema]
+    motor.iniciar_categoria(1, barajar=False)
+    while (pregunta := motor.siguiente_pregunta()) is not None:
+        motor.responder(pregunta.indice_respuesta)
+    motor.reiniciar_ronda(motor.con_repaso)
+    assert [(evento["grupo"], evento["indice"]) for evento in eventos] == ubicaciones
+    assert list(motor.repasos) == ["Antigüedad"]
+    assert "Tema: roma" not in motor.estado()["repasos"]
+
+
+def test_fallar_resta_vidas_hasta_perder():
+    motor = crear_motor([Grupo("Antigüedad", 20)])
+    motor.configuracion = {**motor.configuracion, "probabilidad_especial": 0}
+    motor.iniciar_categoria(0)
+    vidas = motor.vidas
+    for restantes in range(vidas - 1, -1, -1):
+        pregunta = motor.siguiente_pregunta()
+        resultado = motor.responder((pregunta.indice_respuesta + 1) % len(pregunta.opciones))
+        assert not resultado.correcta and motor.vidas == restantes
+    assert resultado.partida_perdida
+    motor.reiniciar_ronda()
+    assert (motor.vidas, motor.puntaje, motor.indice_pregunta) == (vidas, 0, 0)
+
+
+def test_acertar_suma_puntos_y_el_estado_retoma_la_misma_pregunta():
+    grupo = Grupo("Antigüedad", 12)
+    motor = crear_motor([grupo])
+    motor.configuracion = {**motor.configuracion, "probabilidad_especial": 0}
+    motor.iniciar_categoria(0)
+    for _ in range(4):
+        motor.responder(motor.siguiente_pregunta().indice_respuesta)
+    actual = motor.siguiente_pregunta()
+    assert motor.puntaje == 4 * PUNTOS_POR_ACIERTO
+
+    otro = crear_motor([grupo])
+    otro.cargar_estado(motor.estado())
+    assert (otro.puntaje, otro.vidas, otro.indice_pregunta) == (motor.puntaje, motor.vidas, motor.indice_pregunta)
+    assert otro.siguiente_pregunta() == actual
@@ -0,0 +1,23 @@
+import pytest
+
+from permutacion import Permutacion
+
+
+@pytest.mark.parametrize("total", [1, 2, 3, 5, 16, 17, 100, 1000, 4097])
+@pytest.mark.parametrize("semilla", [0, 1, 123456789])
+def test_es_biyectiva(total, semilla):
+    permutacion = Permutacion(total, semilla)
+    assert sorted(permutacion[indice] for indice in range(total)) == list(range(total))
+
+
+def test_la_semilla_fija_el_orden():
+    assert [Permutacion(500, 7)[indice] for indice in range(500)] == [Permutacion(500, 7)[indice] for indice in range(500)]
+    assert [Permutacion(500, 7)[indice] for indice in range(500)] != [Permutacion(500, 8)[indice] for indice in range(500)]
+
+
+def test_fuera_de_rango():
+    permutacion = Permutacion(10, 3)
+    with pytest.raises(IndexError):
+        permutacion[10]
+    with pytest.raises(IndexError):
+        permutacion[-1]
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from ranuras import ArchivoRanuras
+
+
+def test_ranuras_sobreviven_a_reabrir(tmp_path):
+    ruta = tmp_path / "savegame.json"
+    ranuras = ArchivoRanuras(ruta)
+    ranuras.guardar("ana", {"score": 10}, {"puntaje": 10})
+    ranuras.guardar("beto", {"score": 20})
+    ranuras.descargar()
+    ranuras.guardar("ana", {"score": 30})
+    ranuras.eliminar("beto")
+    ranuras.guardar("carla", {"score": 5})
+    ranuras.descargar()
+    reabiertas = ArchivoRanuras(ruta)
+    assert sorted(reabiertas.nombres()) == ["ana", "carla"]
+    assert reabiertas.obtener("ana") == {"score": 30}
+    assert reabiertas.obtener("beto") is None
+
+
+def test_corte_antes_de_reemplazar_deja_el_archivo_viejo(tmp_path, monkeypatch):
+    ruta = tmp_path / "savegame.json"
+    ranuras = ArchivoRanuras(ruta)
+    ranuras.guardar("ana", {"score": 10})
+    ranuras.descargar()
+    antes = ruta.read_bytes()
+
+    def cortar(*_argumentos):
+        raise OSError("corte de luz")
+
+    monkeypatch.setattr(os, "replace", cortar)
+    ranuras.guardar("ana", {"score": 99})
+    ranuras.guardar("beto", {"score": 1})
+    with pytest.raises(OSError):
+        ranuras.descargar()
+    monkeypatch.undo()
+    assert ruta.read_bytes() == antes
+    reabiertas = ArchivoRanuras(ruta)
+    assert reabiertas.nombres() == ["ana"]
+    assert reabiertas.obtener("ana") == {"score": 10}
+
+
+@pytest.mark.parametrize("contenido", [b"", b'{"formato":"ranuras","vers', b"[1, 2]\n"])
+def test_archivo_ilegible_se_trata_como_vacio_y_se_conserva(tmp_path, contenido):
+    ruta = tmp_path / "savegame.json"
+    ruta.write_bytes(contenido)
+    ranuras = ArchivoRanuras(ruta)
+    assert ranuras.aviso is not None
+    assert ranuras.nombres() == [] and ranuras.anterior is None
+    ranuras.guardar("ana", {"score": 10})
+    ranuras.descargar()
+    assert ranuras.ruta_danado.read_bytes() == contenido
+    assert ArchivoRanuras(ruta).obtener("ana") == {"score": 10}
+
+
+def test_partida_de_version_anterior(tmp_path):
+    ruta = tmp_path / "savegame.json"
+    ruta.write_text(json.dumps({"period_index": 1, "level_index": 0, "score": 40}, indent=4))
+    ranuras = ArchivoRanuras(ruta)
+    assert ranuras.anterior == {"period_index": 1, "level_index": 0, "score": 40}
+    assert ranuras.aviso is None
@@ -0,0 +1,68 @@
+from permutacion import Permutacion
+from repaso import MINUTOS_DIA, PASO_REAPRENDER, Repaso
+
+INICIO = 1_000_000 * 60.0
+
+
+def minutos(cantidad):
+    return INICIO + cantidad * 60
+
+
+def test_las_nuevas_salen_en_el_orden_de_la_permutacion():
+    repaso = Repaso(semilla=5)
+    repaso.reiniciar(20)
+    vistas = []
+    for _ in range(20):
+        indice = repaso.siguiente(INICIO)
+        repaso.registrar(indice, True, INICIO)
+        vistas.append(indice)
+    orden = Permutacion(20, 5)
+    assert vistas == [orden[posicion] for posicion in range(20)]
+
+
+def test_orden_por_vencimiento():
+    repaso = Repaso(semilla=1)
+    repaso.reiniciar(6)
+    primeras = [repaso.siguiente(INICIO) for _ in range(3)]
+    # Se falla la segunda antes que la primera: vence antes.
+    repaso.registrar(primeras[1], False, minutos(0))
+    repaso.registrar(primeras[0], False, minutos(1))
+    repaso.registrar(primeras[2], True, minutos(2))
+
+    # Antes de que venza nada, siguen las nuevas.
+    nueva = repaso.siguiente(minutos(3))
+    assert nueva not in primeras
+    repaso.devolver(nueva)
+
+    # Vencidas, salen de la más antigua a la más nueva y antes que las nuevas.
+    despues = minutos(PASO_REAPRENDER + 5)
+    assert repaso.siguiente(despues) == primeras[1]
+    assert repaso.siguiente(despues) == primeras[0]
+    assert repaso.siguiente(despues) not in primeras
+
+
+def test_sin_nuevas_sale_la_que_vence_antes():
+    repaso = Repaso(semilla=2)
+    repaso.reiniciar(3)
+    indices = [repaso.siguiente(INICIO) for _ in range(3)]
+    repaso.registrar(indices[0], True, minutos(0))
+    repaso.registrar(indices[1], True, minutos(0))
+    repaso.registrar(indices[1], True, minutos(1))
+    repaso.registrar(indices[2], False, minutos(0))
+    # Nada vence todavía y no quedan nuevas: la de vencimiento más cercano.
+    assert repaso.siguiente(minutos(2)) == indices[2]
+    assert repaso.siguiente(minutos(2)) == indices[0]
+    assert repaso.siguiente(minutos(2)) == indices[1]
+
+
+def test_el_estado_conserva_el_orden():
+    repaso = Repaso(semilla=9)
+    repaso.reiniciar(50)
+    for paso in range(30):
+        indice = repaso.siguiente(minutos(paso))
+        repaso.registrar(indice, paso % 3 != 0, minutos(paso))
+    copia = Repaso.desde_estado(repaso.estado())
+    copia.reiniciar(50)
+    repaso.reiniciar(50)
+    ahora = minutos(2 * MINUTOS_DIA)
+    assert [repaso.siguiente(ahora) for _ in range(40)] == [copia.siguiente(ahora) for _ in range(40)]
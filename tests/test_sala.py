@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from banco import Pregunta
+from motor import PUNTOS_POR_ACIERTO
+from sala import Sala
+
+
+class Grupo:
+    def __init__(self, nombre, total):
+        self.nombre = nombre
+        self.preguntas = [Pregunta.crear(f"{nombre} {i}", ["a", "b", "c"], "a", "") for i in range(total)]
+
+
+def crear_sala(dificultad="normal", total=5):
+    return Sala("ABCD", Grupo("Antigüedad", total), dificultad=dificultad, azar=random.Random(7))
+
+
+def acertar(sala, clave, ahora):
+    return sala.responder(clave, sala.pregunta.indice_respuesta, ahora)
+
+
+def fallar(sala, clave, ahora):
+    return sala.responder(clave, (sala.pregunta.indice_respuesta + 1) % 3, ahora)
+
+
+def test_la_clasificacion_ordena_por_puntaje_y_desempata_por_tiempo():
+    sala = crear_sala()
+    for clave, nombre in [("1", "ana"), ("2", "beto"), ("3", "carla")]:
+        sala.unir(clave, nombre)
+    sala.siguiente(0.0)
+    acertar(sala, "1", 4.0)
+    acertar(sala, "2", 1.5)
+    fallar(sala, "3", 0.5)
+    assert [fila["nombre"] for fila in sala.podio()] == ["beto", "ana", "carla"]
+    assert sala.jugadores["2"].tiempo_ms == 1500
+    assert sala.podio()[0] == {"posicion": 1, "nombre": "beto", "puntaje": PUNTOS_POR_ACIERTO}
+
+    sala.siguiente(10.0)
+    acertar(sala, "1", 11.0)
+    acertar(sala, "2", 14.0)
+    acertar(sala, "3", 10.5)
+    # Empatan ana y beto en puntaje; beto suma 5500 ms y ana 5000 ms.
+    assert [fila["nombre"] for fila in sala.podio()] == ["ana", "beto", "carla"]
+    assert sala.clasificacion == sorted(jugador.clave for jugador in sala.jugadores.values())
+
+
+def test_posicion_y_podio_siguen_a_las_respuestas():
+    sala = crear_sala()
+    jugadores = [sala.unir(str(numero), f"jugador{numero}") for numero in range(4)]
+    sala.siguiente(0.0)
+    fallar(sala, "0", 1.0)
+    acertar(sala, "3", 2.0)
+    assert sala.posicion(jugadores[3]) == 1
+    assert sala.estado_jugador(jugadores[3])["posicion"] == 1
+    assert sala.posicion(jugadores[0]) == 4
+    assert [fila["posicion"] for fila in sala.podio(limite=2)] == [1, 2]
+    assert sala.podio(limite=2)[0]["nombre"] == "jugador3"
+
+
+def test_sin_reinicio_se_elimina_al_quedarse_sin_vidas():
+    sala = crear_sala("dificil")
+    jugador = sala.unir("1", "ana")
+    for numero, vidas in enumerate([2, 1, 0]):
+        sala.siguiente(float(numero))
+        fallar(sala, "1", numero + 0.5)
+        assert jugador.vidas == vidas
+    assert jugador.eliminado
+    sala.siguiente(10.0)
+    with pytest.raises(ValueError):
+        acertar(sala, "1", 10.5)
+
+
+def test_con_reinicio_un_fallo_elimina():
+    sala = crear_sala("hardcore")
+    jugador = sala.unir("1", "ana")
+    otro = sala.unir("2", "beto")
+    sala.siguiente(0.0)
+    fallar(sala, "1", 0.5)
+    assert jugador.eliminado
+    # Quien no responde también falla al cerrar la pregunta.
+    sala.cerrar(1.0)
+    assert otro.eliminado and otro.ultima_correcta is False
+
+
+def test_quien_entra_con_la_pregunta_abierta_no_la_pierde():
+    sala = crear_sala("hardcore")
+    sala.unir("1", "ana")
+    sala.siguiente(0.0)
+    tarde = sala.unir("2", "beto")
+    with pytest.raises(ValueError):
+        acertar(sala, "2", 0.5)
+    sala.cerrar(1.0)
+    assert (tarde.vidas, tarde.eliminado, tarde.ultima_correcta) == (1, False, None)
+    assert sala.jugadores["1"].eliminado
+
+    sala.siguiente(2.0)
+    assert not tarde.en_espera
+    acertar(sala, "2", 2.5)
+    assert tarde.puntaje == PUNTOS_POR_ACIERTO
@@ -0,0 +1,71 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from banco import leer_manifiesto_categorias
+from guardados import EscrituraDiferida, crear_almacen
+from servidor import ServidorJuego
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    almacen = EscrituraDiferida(crear_almacen(tmp_path / "guardados.jsonl", "diario"), intervalo=0.01)
+    yield ServidorJuego(leer_manifiesto_categorias(), almacen)
+    almacen.cerrar()
+
+
+def despachar(servidor, metodo, ruta, cuerpo=b""):
+    estado, contenido, _ = asyncio.run(servidor.despachar(metodo, ruta, cuerpo))
+    return estado, json.loads(contenido)
+
+
+@pytest.mark.parametrize(
+    "cuerpo",
+    [
+        b"{no es json",
+        b"\xff\xfe\xfa",
+        b"[1, 2]",
+        json.dumps({"dificultad": []}).encode(),
+        json.dumps({"cargar": 5}).encode(),
+        json.dumps({"cargar": ["ana"]}).encode(),
+        json.dumps({"categoria": "uno"}).encode(),
+    ],
+)
+def test_cuerpo_malformado_da_400(servidor, cuerpo):
+    estado, respuesta = despachar(servidor, "POST", "/api/partidas", cuerpo)
+    assert estado == HTTPStatus.BAD_REQUEST
+    assert "error" in respuesta
+
+
+def test_error_inesperado_da_500(servidor, monkeypatch):
+    monkeypatch.setattr(servidor, "listar_categorias", lambda _cuerpo: 1 / 0)
+    estado, respuesta = despachar(servidor, "GET", "/api/categorias")
+    assert estado == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert "error" in respuesta
+
+
+def test_partida_valida_sigue_funcionando(servidor):
+    estado, respuesta = despachar(servidor, "POST", "/api/partidas", b'{"categoria": 0}')
+    assert estado == HTTPStatus.CREATED
+    assert respuesta["sesion"] in servidor.sesiones
+
+
+async def _solicitud_cruda(servidor, datos):
+    escucha = await asyncio.start_server(servidor.atender, "127.0.0.1", 0)
+    puerto = escucha.sockets[0].getsockname()[1]
+    async with escucha:
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        escritor.write(datos)
+        await escritor.drain()
+        respuesta = await asyncio.wait_for(lector.read(), 5)
+        escritor.close()
+    return respuesta
+
+
+@pytest.mark.parametrize("largo", [b"-5", b"abc"])
+def test_content_length_invalido_da_400(servidor, largo):
+    datos = b"POST /api/partidas HTTP/1.1\r\nContent-Length: " + largo + b"\r\n\r\n{}"
+    respuesta = asyncio.run(_solicitud_cruda(servidor, datos))
+    assert respuesta.startswith(b"HTTP/1.1 400 ")